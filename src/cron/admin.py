@@ -1,17 +1,270 @@
-from django.contrib import admin
+import copy
+import re
+import uuid
+from datetime import datetime, timedelta
 
-from cron.models import Job, JobSchedule
+from django import forms
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.utils import unquote
+from django.core.exceptions import PermissionDenied
+from django.db.models import Count, Q, Sum
+from django.forms import ValidationError
+from django.forms.models import construct_instance
+from django.http import HttpResponse, HttpResponseBadRequest
+from django.shortcuts import get_object_or_404
+from django.template.response import TemplateResponse
+from django.urls import path, reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from cron import bulk
+from cron.ics import calendar_url
+from cron.joblogs import current_size, read_current_range, read_tail, run_log_directory
+from cron.lint import DUPLICATE, NEVER_FIRES, OVERLAP, lint_schedules
+from cron.metrics import latest_snapshot
+from cron.models import (
+    ChangeRecord,
+    Job,
+    JobDependency,
+    JobRun,
+    JobSchedule,
+    OwnerRateLimit,
+    Worker,
+)
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Change records shown by each page of the history of an object.
+HISTORY_PAGE_SIZE = 50
+
+LINT_TITLES = {
+    NEVER_FIRES: "Horarios que nunca se ejecutan",
+    DUPLICATE: "Horarios que repiten otro de su Job",
+    OVERLAP: "Horarios que se solapan con otro de su Job",
+}
+
+
+class JobDependencyInline(admin.TabularInline):
+    model = JobDependency
+    fk_name = "downstream"
+    autocomplete_fields = ("upstream",)
+    extra = 0
+    verbose_name = "Se ejecuta después de"
+    verbose_name_plural = "Se ejecuta después de"
+
+
+class JobActionForm(ActionForm):
+    owner = forms.CharField(required=False, label="Nuevo responsable")
+
+
+class JobScheduleActionForm(ActionForm):
+    target_job = forms.ModelChoiceField(
+        queryset=Job.objects.all(),
+        to_field_name="name",
+        widget=forms.TextInput,
+        required=False,
+        label="Job destino",
+    )
+    minutes = forms.IntegerField(
+        min_value=-59, max_value=59, required=False, label="Minutos"
+    )
+
+
+class JobScheduleForm(forms.ModelForm):
+    """Form of a schedule that checks unique_schedule_per_job on the normalized expression.
+
+    expression_hash is not a field of the form, so the ModelForm leaves the
+    constraint out of its unique checks and the duplicate would only be found
+    by JobSchedule.save().
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+
+        schedule = construct_instance(self, copy.copy(self.instance))
+        try:
+            schedule.clean()
+        except ValidationError:
+            # Reported on the fields by the validation of the model.
+            return cleaned_data
+
+        for constraint in JobSchedule._meta.constraints:
+            if constraint.name == "unique_schedule_per_job":
+                constraint.validate(JobSchedule, schedule)
+
+        return cleaned_data
+
+
+class ChangeHistoryMixin:
+    """History of the objects built from their ChangeRecords.
+
+    The deletions of the changelist are recorded too, in a single batch.
+    """
+
+    def delete_queryset(self, request, queryset):
+        bulk.delete_recorded(queryset)
+
+    def history_view(self, request, object_id, extra_context=None):
+        """Shows the change records of an object, from the newest.
+
+        The pages are selected by the (changed_at, id) of the last record of
+        the previous page instead of an offset, so every page costs the same
+        index range scan however old it is.
+        """
+
+        obj = self.get_object(request, unquote(object_id))
+        if obj is None:
+            return self._get_obj_does_not_exist_redirect(
+                request, self.model._meta, object_id
+            )
+        if not self.has_view_or_change_permission(request, obj):
+            raise PermissionDenied
+
+        records = ChangeRecord.objects.filter(object_id=obj.pk)
+
+        before = request.GET.get("before")
+        if before:
+            try:
+                changed_at, record_id = before.rsplit("_", 1)
+                changed_at = datetime.fromisoformat(changed_at)
+                record_id = uuid.UUID(record_id)
+            except ValueError:
+                return HttpResponseBadRequest("Invalid before parameter")
+            records = records.filter(
+                Q(changed_at__lt=changed_at)
+                | Q(changed_at=changed_at, id__lt=record_id)
+            )
+
+        page = list(records.order_by("-changed_at", "-id")[: HISTORY_PAGE_SIZE + 1])
+        next_cursor = None
+        if len(page) > HISTORY_PAGE_SIZE:
+            page = page[:HISTORY_PAGE_SIZE]
+            next_cursor = f"{page[-1].changed_at.isoformat()}_{page[-1].id}"
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": f"Historial de cambios: {obj}",
+            "opts": self.model._meta,
+            "object": obj,
+            "records": page,
+            "next_cursor": next_cursor,
+            **(extra_context or {}),
+        }
+        return TemplateResponse(request, "admin/cron/change_history.html", context)
+
+
+class BulkActionsMixin:
+    """Admin actions that change every selected row with set-based queries."""
+
+    def get_action_value(self, request, field_name):
+        """Returns the cleaned value of a field of the action form, None if invalid."""
+
+        form = self.action_form(request.POST)
+        form.fields["action"].choices = self.get_action_choices(request)
+        if not form.is_valid():
+            return None
+
+        return form.cleaned_data[field_name]
+
+    def run_bulk_action(self, request, change, *args):
+        try:
+            updated = change(*args)
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)
+            return
+
+        self.message_user(request, f"{updated} registros modificados.")
+
+    @admin.action(description="Activar seleccionados")
+    def enable(self, request, queryset):
+        self.run_bulk_action(request, bulk.set_enabled, queryset, True)
+
+    @admin.action(description="Desactivar seleccionados")
+    def disable(self, request, queryset):
+        self.run_bulk_action(request, bulk.set_enabled, queryset, False)
 
 
 @admin.register(Job)
-class JobAdmin(admin.ModelAdmin):
-    list_display = ("name", "owner", "script")
-    list_filter = ("owner",)
+class JobAdmin(ChangeHistoryMixin, BulkActionsMixin, admin.ModelAdmin):
+    inlines = (JobDependencyInline,)
+    list_display = (
+        "name",
+        "owner",
+        "script",
+        "script_status",
+        "max_instances",
+        "enabled",
+        "paused_until",
+        "get_drift_p95",
+        "get_duration_p95",
+        "get_metrics_worker",
+    )
+    list_filter = ("enabled", "script_status", "owner")
     search_fields = ("name", "owner", "script")
+    readonly_fields = (
+        "script_status",
+        "script_hash",
+        "script_error",
+        "script_changed_at",
+        "get_calendar_url",
+    )
+    action_form = JobActionForm
+    actions = ("enable", "disable", "reassign_owner")
+
+    @admin.display(description="Calendario del responsable")
+    def get_calendar_url(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = calendar_url(obj.owner)
+        return format_html('<a href="{}">{}</a>', url, url)
+
+    def save_model(self, request, obj, form, change):
+        # The scripts are only checked by the runners, which have SCRIPTS_DIR.
+        # A new script shows as unchecked until the next check of one of them.
+        if "script" in form.changed_data:
+            obj.script_status = Job.ScriptStatus.UNCHECKED
+            obj.script_hash = obj.script_error = ""
+            obj.script_changed_at = timezone.now()
+        super().save_model(request, obj, form, change)
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                drift_p95=latest_snapshot("drift_p95"),
+                duration_p95=latest_snapshot("duration_p95"),
+                metrics_worker=latest_snapshot("worker"),
+            )
+        )
+
+    @admin.display(description="Retraso p95 (s)", ordering="drift_p95")
+    def get_drift_p95(self, obj):
+        return None if obj.drift_p95 is None else round(obj.drift_p95, 2)
+
+    @admin.display(description="Duración p95 (s)", ordering="duration_p95")
+    def get_duration_p95(self, obj):
+        return None if obj.duration_p95 is None else round(obj.duration_p95, 2)
+
+    # The percentiles only cover the runs of the runner that took the snapshot.
+    @admin.display(description="Runner de las métricas", ordering="metrics_worker")
+    def get_metrics_worker(self, obj):
+        return obj.metrics_worker
+
+    @admin.action(description="Asignar el nuevo responsable")
+    def reassign_owner(self, request, queryset):
+        owner = self.get_action_value(request, "owner")
+        if not owner:
+            self.message_user(request, "Indique el nuevo responsable.", messages.ERROR)
+            return
+
+        self.run_bulk_action(request, bulk.reassign_owner, queryset, owner)
 
 
 @admin.register(JobSchedule)
-class JobScheduleAdmin(admin.ModelAdmin):
+class JobScheduleAdmin(ChangeHistoryMixin, BulkActionsMixin, admin.ModelAdmin):
     list_display = (
         "get_job_name",
         "get_job_owner",
@@ -21,7 +274,16 @@ class JobScheduleAdmin(admin.ModelAdmin):
         "day_of_month",
         "month",
         "day_of_week",
+        "time_zone",
+        "enabled",
+        "paused_until",
     )
+    list_filter = ("enabled", "time_zone")
+    list_select_related = ("job",)
+    form = JobScheduleForm
+    action_form = JobScheduleActionForm
+    actions = ("enable", "disable", "clone_to_job", "shift_minutes")
+    change_list_template = "admin/cron/jobschedule/change_list.html"
 
     def get_job_name(self, obj):
         return obj.job.name
@@ -33,3 +295,210 @@ class JobScheduleAdmin(admin.ModelAdmin):
     get_job_owner.short_description = "Dueño del Job"
 
     search_fields = ("description", "get_job_name", "get_job_owner")
+
+    @admin.action(description="Copiar al Job destino")
+    def clone_to_job(self, request, queryset):
+        target_job = self.get_action_value(request, "target_job")
+        if target_job is None:
+            self.message_user(request, "Indique un Job destino válido.", messages.ERROR)
+            return
+
+        self.run_bulk_action(request, bulk.clone_schedules, queryset, target_job)
+
+    @admin.action(description="Desplazar los minutos")
+    def shift_minutes(self, request, queryset):
+        minutes = self.get_action_value(request, "minutes")
+        if not minutes:
+            self.message_user(
+                request, "Indique los minutos entre -59 y 59.", messages.ERROR
+            )
+            return
+
+        self.run_bulk_action(request, bulk.shift_minutes, queryset, minutes)
+
+    def get_urls(self):
+        return [
+            path(
+                "lint/",
+                self.admin_site.admin_view(self.lint_view),
+                name="cron_jobschedule_lint",
+            ),
+            *super().get_urls(),
+        ]
+
+    def changelist_view(self, request, extra_context=None):
+        return super().changelist_view(
+            request, {"calendar_url": calendar_url(), **(extra_context or {})}
+        )
+
+    def lint_view(self, request):
+        """Lists the schedules that never fire, duplicate or overlap another one of their job."""
+
+        if not self.has_view_or_change_permission(request):
+            raise PermissionDenied
+
+        findings = lint_schedules()
+        groups = [
+            (
+                title,
+                [finding for finding in findings if finding.kind == kind],
+            )
+            for kind, title in LINT_TITLES.items()
+        ]
+
+        context = {
+            **self.admin_site.each_context(request),
+            "title": "Revisión de horarios",
+            "opts": self.model._meta,
+            "groups": groups,
+        }
+        return TemplateResponse(request, "admin/cron/jobschedule/lint.html", context)
+
+
+@admin.register(OwnerRateLimit)
+class OwnerRateLimitAdmin(admin.ModelAdmin):
+    list_display = ("owner", "rate", "burst")
+    search_fields = ("owner",)
+
+
+@admin.register(Worker)
+class WorkerAdmin(admin.ModelAdmin):
+    """The fleet of runners, with the totals of the live ones above the list."""
+
+    change_list_template = "admin/cron/worker/change_list.html"
+    list_display = (
+        "name",
+        "hostname",
+        "capacity",
+        "running",
+        "get_load",
+        "started_at",
+        "last_heartbeat",
+        "is_live",
+    )
+    search_fields = ("name", "hostname")
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def stale_cutoff(self):
+        return timezone.now() - timedelta(seconds=settings.WORKER_STALE_SECONDS)
+
+    @admin.display(description="Carga")
+    def get_load(self, obj):
+        return f"{obj.running / obj.capacity:.0%}" if obj.capacity else "-"
+
+    @admin.display(description="Activo", boolean=True)
+    def is_live(self, obj):
+        return obj.last_heartbeat >= self.stale_cutoff()
+
+    def changelist_view(self, request, extra_context=None):
+        fleet = Worker.objects.filter(
+            last_heartbeat__gte=self.stale_cutoff()
+        ).aggregate(
+            workers=Count("id"), capacity=Sum("capacity"), running=Sum("running")
+        )
+        fleet["load"] = (
+            fleet["running"] / fleet["capacity"] if fleet["capacity"] else None
+        )
+        return super().changelist_view(
+            request, extra_context={**(extra_context or {}), "fleet": fleet}
+        )
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "job",
+        "scheduled_for",
+        "status",
+        "attempt",
+        "next_attempt_at",
+        "worker",
+        "started_at",
+        "finished_at",
+        "exit_code",
+        "get_output_link",
+    )
+    list_filter = ("status",)
+    list_select_related = ("job",)
+    search_fields = ("job__name", "worker")
+    date_hierarchy = "scheduled_for"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def get_output_link(self, obj):
+        url = reverse("admin:cron_jobrun_output", args=[obj.pk])
+        return format_html('<a href="{}">Ver salida</a>', url)
+
+    get_output_link.short_description = "Salida"
+
+    def get_urls(self):
+        return [
+            path(
+                "<uuid:run_id>/output/",
+                self.admin_site.admin_view(self.output_view),
+                name="cron_jobrun_output",
+            ),
+            *super().get_urls(),
+        ]
+
+    def output_view(self, request, run_id):
+        """Serves the output of a run without loading it whole in memory.
+
+        Without a Range header it returns the last ?kb= kilobytes (JOB_LOG_TAIL_KB
+        by default). With a Range header it returns those bytes of the segment
+        being written, so a client can follow the output as it grows.
+        """
+
+        run = get_object_or_404(JobRun, pk=run_id)
+        if not self.has_view_permission(request, run):
+            raise PermissionDenied
+
+        directory = run_log_directory(run)
+        size = current_size(directory)
+
+        range_header = request.headers.get("Range")
+        if range_header is None:
+            try:
+                kilobytes = int(request.GET.get("kb", settings.JOB_LOG_TAIL_KB))
+            except ValueError:
+                return HttpResponseBadRequest("Invalid kb parameter")
+            response = HttpResponse(
+                read_tail(directory, max(kilobytes, 1) * 1024),
+                content_type="text/plain; charset=utf-8",
+            )
+            response["Accept-Ranges"] = "bytes"
+            return response
+
+        match = RANGE_PATTERN.match(range_header.strip())
+        if match is None or match.groups() == ("", ""):
+            return HttpResponse(status=416)
+
+        first, last = match.groups()
+        if first == "":
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start = int(first)
+            end = min(int(last), size - 1) if last else size - 1
+
+        if start >= size or start > end:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        response = HttpResponse(
+            read_current_range(directory, start, end),
+            status=206,
+            content_type="text/plain; charset=utf-8",
+        )
+        response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        response["Accept-Ranges"] = "bytes"
+        return response
@@ -0,0 +1,349 @@
+"""Columnar archive of the finished runs moved out of the database.
+
+The runs are partitioned by the month of scheduled_for (UTC). Every partition
+is a runs-YYYY-MM.npz file with one array per column, so a partition is a
+single file replaced at once. The columns are compressed except the job ids and
+the scheduled times, which are stored as is.
+
+The reader selects the partitions of a time range by their names, memory-maps
+the stored columns at their offset in the file to find the rows of a job and
+time range without decompressing anything, and only decompresses the other
+columns it returns of the partitions with matching rows.
+
+Columns:
+
+* id, job_id, schedule_id, triggered_by_id: UUID bytes (void16), all zeros if null.
+* scheduled_for, started_at, finished_at: datetime64[us] in UTC, NaT if null.
+* status: index in the statuses array stored with the partition.
+* attempt: int32.
+* exit_code: float64, NaN if null.
+* worker: unicode.
+"""
+
+import os
+import struct
+import tempfile
+import uuid
+import zipfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from cron.models import JobRun
+
+UUID_DTYPE = np.dtype("V16")
+NULL_UUID = np.zeros((), dtype=UUID_DTYPE)
+
+UUID_COLUMNS = ("id", "job_id", "schedule_id", "triggered_by_id")
+DATETIME_COLUMNS = ("scheduled_for", "started_at", "finished_at")
+COLUMNS = (
+    *UUID_COLUMNS,
+    *DATETIME_COLUMNS,
+    "status",
+    "attempt",
+    "exit_code",
+    "worker",
+)
+
+# Statuses of the runs that are finished and can be archived.
+FINISHED_STATUSES = (
+    JobRun.Status.SUCCEEDED,
+    JobRun.Status.FAILED,
+    JobRun.Status.SKIPPED,
+    JobRun.Status.LOST,
+)
+
+# Columns stored without compression, memory-mapped to select the rows of a partition.
+STORED_COLUMNS = ("job_id", "scheduled_for")
+
+# Runs deleted from the database by each query.
+DELETE_BATCH_SIZE = 1000
+
+
+def archive_directory() -> Path:
+    return Path(settings.RUN_ARCHIVE_DIR)
+
+
+def partition_name(year, month) -> str:
+    return f"runs-{year:04d}-{month:02d}"
+
+
+def uuid_value(value) -> np.void:
+    """Returns a UUID as an element of a void16 column."""
+
+    return np.void(value.bytes) if value is not None else NULL_UUID
+
+
+def datetime64(value) -> np.datetime64:
+    """Returns an aware datetime as a UTC datetime64[us], NaT if None."""
+
+    if value is None:
+        return np.datetime64("NaT", "us")
+    return np.datetime64(value.astimezone(timezone.utc).replace(tzinfo=None), "us")
+
+
+def to_columns(runs) -> dict:
+    """Builds the columns of a partition from the values of its runs.
+
+    Args:
+        runs (list[dict]): The runs, with a key for each column.
+    """
+
+    statuses = np.array(JobRun.Status.values)
+    status_index = {status: index for index, status in enumerate(statuses)}
+
+    columns = {
+        name: np.array([uuid_value(run[name]) for run in runs], dtype=UUID_DTYPE)
+        for name in UUID_COLUMNS
+    }
+    for name in DATETIME_COLUMNS:
+        columns[name] = np.array(
+            [datetime64(run[name]) for run in runs], dtype="datetime64[us]"
+        )
+    columns["status"] = np.array(
+        [status_index[run["status"]] for run in runs], dtype=np.uint8
+    )
+    columns["statuses"] = statuses
+    columns["attempt"] = np.array([run["attempt"] for run in runs], dtype=np.int32)
+    columns["exit_code"] = np.array(
+        [np.nan if run["exit_code"] is None else run["exit_code"] for run in runs],
+        dtype=np.float64,
+    )
+    columns["worker"] = np.array([run["worker"] for run in runs], dtype=np.str_)
+
+    return columns
+
+
+def load_partition(path) -> dict:
+    """Loads every column of a partition."""
+
+    with np.load(path) as partition:
+        return {name: partition[name] for name in partition.files}
+
+
+def save_columns(file, columns):
+    """Writes columns to an npz file, compressed except the STORED_COLUMNS."""
+
+    with zipfile.ZipFile(file, "w", allowZip64=True) as partition:
+        for column, values in columns.items():
+            member = zipfile.ZipInfo(f"{column}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+            member.compress_type = (
+                zipfile.ZIP_STORED if column in STORED_COLUMNS else zipfile.ZIP_DEFLATED
+            )
+            with partition.open(member, "w", force_zip64=True) as array:
+                np.lib.format.write_array(array, values, allow_pickle=False)
+
+
+def map_column(path, column) -> np.ndarray:
+    """Memory-maps a column of a partition stored without compression.
+
+    The partitions written before the column was stored are read whole.
+    """
+
+    with zipfile.ZipFile(path) as partition:
+        member = partition.getinfo(f"{column}.npy")
+        if member.compress_type != zipfile.ZIP_STORED:
+            with partition.open(member) as array:
+                return np.lib.format.read_array(array)
+
+    with open(path, "rb") as file:
+        # The data of a member follows its local header, which repeats the name
+        # and has its own extra field.
+        file.seek(member.header_offset)
+        header = file.read(zipfile.sizeFileHeader)
+        name_size, extra_size = struct.unpack("<HH", header[26:30])
+        file.seek(
+            member.header_offset + zipfile.sizeFileHeader + name_size + extra_size
+        )
+        version = np.lib.format.read_magic(file)
+        read_header = (
+            np.lib.format.read_array_header_1_0
+            if version == (1, 0)
+            else np.lib.format.read_array_header_2_0
+        )
+        shape, fortran_order, dtype = read_header(file)
+        offset = file.tell()
+
+    if not np.prod(shape):
+        return np.empty(shape, dtype=dtype)
+
+    return np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran_order else "C",
+    )
+
+
+def write_partition(directory, name, columns):
+    """Writes a partition, replacing the previous version atomically."""
+
+    directory.mkdir(parents=True, exist_ok=True)
+    order = np.lexsort((columns["id"].view("S16"), columns["scheduled_for"]))
+    columns = {
+        column: values if column == "statuses" else values[order]
+        for column, values in columns.items()
+    }
+
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as file:
+        save_columns(file, columns)
+    os.replace(file.name, directory / f"{name}.npz")
+    # The job ids were kept in a sidecar before they were stored in the npz.
+    (directory / f"{name}.jobs.npy").unlink(missing_ok=True)
+
+
+def merge(existing, new) -> dict:
+    """Appends the columns of new runs to the columns of a partition.
+
+    The status indexes are remapped in case the statuses changed since the
+    partition was written, and the runs already in the partition are replaced.
+    """
+
+    statuses = list(new["statuses"])
+    remap = np.array(
+        [statuses.index(status) for status in existing["statuses"]], dtype=np.uint8
+    )
+    existing = {**existing, "status": remap[existing["status"]]}
+    # The runs written by an archival interrupted before deleting them.
+    keep = ~np.isin(existing["id"].view("S16"), new["id"].view("S16"))
+
+    return {
+        name: (
+            new["statuses"]
+            if name == "statuses"
+            else np.concatenate([existing[name][keep], new[name]])
+        )
+        for name in new
+    }
+
+
+def archive_runs(before, directory=None, dry_run=False) -> dict:
+    """Moves the finished runs scheduled before a datetime to the archive.
+
+    Every month is written and then deleted from the database, so an
+    interrupted archival only leaves runs of the months not written yet.
+
+    Args:
+        before (datetime): The aware cutoff.
+        directory (Path): Where the partitions are, RUN_ARCHIVE_DIR by default.
+        dry_run (bool): Only count the runs of every partition.
+
+    Returns:
+        dict[str, int]: The number of runs archived in every partition.
+    """
+
+    directory = directory or archive_directory()
+    runs = JobRun.objects.filter(scheduled_for__lt=before, status__in=FINISHED_STATUSES)
+    months = runs.datetimes("scheduled_for", "month", tzinfo=timezone.utc)
+
+    archived = {}
+    for month in months:
+        name = partition_name(month.year, month.month)
+        start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+        end = datetime(
+            month.year + month.month // 12, month.month % 12 + 1, 1, tzinfo=timezone.utc
+        )
+        month_runs = runs.filter(scheduled_for__gte=start, scheduled_for__lt=end)
+
+        if dry_run:
+            archived[name] = month_runs.count()
+            continue
+
+        values = list(month_runs.order_by().values(*COLUMNS))
+        columns = to_columns(values)
+        path = directory / f"{name}.npz"
+        if path.exists():
+            columns = merge(load_partition(path), columns)
+        write_partition(directory, name, columns)
+
+        ids = [run["id"] for run in values]
+        with transaction.atomic():
+            for first in range(0, len(ids), DELETE_BATCH_SIZE):
+                JobRun.objects.filter(
+                    pk__in=ids[first : first + DELETE_BATCH_SIZE]
+                ).delete()
+        archived[name] = len(ids)
+
+    return archived
+
+
+def partitions(start=None, end=None, directory=None) -> list:
+    """Returns the paths of the partitions that may hold runs between start and end."""
+
+    directory = directory or archive_directory()
+    first = last = None
+    if start is not None:
+        start = start.astimezone(timezone.utc)
+        first = partition_name(start.year, start.month)
+    if end is not None:
+        end = end.astimezone(timezone.utc)
+        last = partition_name(end.year, end.month)
+
+    return sorted(
+        path
+        for path in directory.glob("runs-*.npz")
+        if (first is None or path.stem >= first) and (last is None or path.stem <= last)
+    )
+
+
+def read_runs(job_id=None, start=None, end=None, columns=COLUMNS, directory=None):
+    """Reads the archived runs of a job and time range.
+
+    Args:
+        job_id (UUID): Only the runs of this job, every job by default.
+        start (datetime): Only the runs scheduled from this aware datetime on.
+        end (datetime): Only the runs scheduled before this aware datetime.
+        columns (Iterable[str]): The columns returned.
+        directory (Path): Where the partitions are, RUN_ARCHIVE_DIR by default.
+
+    Returns:
+        dict[str, np.ndarray]: The selected columns of the matching runs,
+            ordered by scheduled_for. The status column holds the status names.
+    """
+
+    columns = list(columns)
+    selected = {name: [] for name in columns}
+
+    for path in partitions(start, end, directory):
+        mask = None
+        if job_id is not None:
+            mask = np.asarray(map_column(path, "job_id") == uuid_value(job_id))
+            if not mask.any():
+                continue
+
+        if start is not None or end is not None:
+            scheduled_for = map_column(path, "scheduled_for")
+            in_range = np.ones(len(scheduled_for), dtype=bool)
+            if start is not None:
+                in_range &= scheduled_for >= datetime64(start)
+            if end is not None:
+                in_range &= scheduled_for < datetime64(end)
+            mask = in_range if mask is None else mask & in_range
+
+        with np.load(path) as partition:
+            for name in columns:
+                if name in STORED_COLUMNS:
+                    values = map_column(path, name)
+                else:
+                    values = partition[name]
+                if name == "status":
+                    values = partition["statuses"][values]
+                selected[name].append(
+                    np.asarray(values if mask is None else values[mask])
+                )
+
+    return {
+        name: np.concatenate(parts) if parts else np.array([])
+        for name, parts in selected.items()
+    }
+
+
+def as_uuid(value) -> uuid.UUID | None:
+    """Returns the UUID of an element of a void16 column, None if null."""
+
+    return None if value == NULL_UUID else uuid.UUID(bytes=value.tobytes())
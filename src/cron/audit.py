@@ -0,0 +1,43 @@
+"""Who changes the jobs and schedules, for their change records.
+
+The actor is a plain username string kept in a context variable, so the change
+records do not depend on the auth app and the processes without it (the
+runner, the API) can still record changes. AuditActorMiddleware sets it for
+every request of an authenticated user, and acting_as() sets it elsewhere, for
+example in a management command.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+current_actor = ContextVar("current_actor", default="")
+
+
+@contextmanager
+def acting_as(actor):
+    """Records the changes made inside the block as made by actor."""
+
+    token = current_actor.set(actor)
+    try:
+        yield
+    finally:
+        current_actor.reset(token)
+
+
+class AuditActorMiddleware:
+    """Sets the username of the user of the request as the actor of its changes.
+
+    It must come after django.contrib.auth.middleware.AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user = getattr(request, "user", None)
+        actor = (
+            user.get_username() if user is not None and user.is_authenticated else ""
+        )
+
+        with acting_as(actor):
+            return self.get_response(request)
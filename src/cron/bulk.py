@@ -0,0 +1,271 @@
+"""Changes applied to many jobs or schedules at once.
+
+Saving every object runs full_clean() and an UPDATE per row, which is too slow
+for thousands of rows. These helpers validate the new values once, in memory,
+and write them with a few set-based queries, in a single transaction. Every
+helper returns the number of affected rows.
+
+The changes are recorded as ChangeRecords inserted in batches in the same
+transaction, one per row that actually changed.
+"""
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, Value, When
+from django.forms import ValidationError
+from django.utils import timezone
+
+from cron.audit import current_actor
+from cron.models import ChangeRecord, Job, JobSchedule
+from cron.schedules import FIELD_NAMES, parse_field
+
+# Rows written by each INSERT of the cloned schedules and of the change records.
+BATCH_SIZE = 500
+
+
+def validate_in_batch(objects, exclude=("id", "job")):
+    """Validates unsaved objects without a query per object.
+
+    Runs the field validation and the clean() of every object, skipping the
+    uniqueness checks of full_clean() and the excluded fields, as foreign keys,
+    which query the database row by row.
+
+    Raises:
+        ValidationError: With the errors of every invalid object.
+    """
+
+    errors = []
+    for instance in objects:
+        try:
+            instance.clean_fields(exclude=exclude)
+            instance.clean()
+        except ValidationError as error:
+            errors.extend(error.messages)
+
+    if errors:
+        raise ValidationError(sorted(set(errors)))
+
+
+def record_changes(model, changes, action=ChangeRecord.Action.CHANGED):
+    """Inserts the change records of many objects in batches.
+
+    Args:
+        model: The model of the objects.
+        changes (Iterable[tuple]): Pairs of object id and changed fields,
+            field -> [old, new].
+        action (str): One of ChangeRecord.Action.
+    """
+
+    actor = current_actor.get()
+    ChangeRecord.objects.bulk_create(
+        (
+            ChangeRecord(
+                model=model._meta.model_name,
+                object_id=object_id,
+                action=action,
+                changes=fields,
+                actor=actor,
+            )
+            for object_id, fields in changes
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def changes_of(queryset, values) -> list:
+    """Returns the changes that updating a queryset with values would make.
+
+    Returns:
+        list[tuple]: Pairs of object id and changed fields, only for the rows
+            where some value is different.
+    """
+
+    changes = []
+    for object_id, *old_values in queryset.values_list("pk", *values).order_by():
+        fields = {
+            name: [old, values[name]]
+            for name, old in zip(values, old_values)
+            if old != values[name]
+        }
+        if fields:
+            changes.append((object_id, fields))
+
+    return changes
+
+
+def update_recorded(queryset, values) -> int:
+    """Updates a queryset with values with one UPDATE, recording the changes."""
+
+    with transaction.atomic():
+        changes = changes_of(queryset, values)
+        updated = queryset.update(**values, updated_at=timezone.now())
+        record_changes(queryset.model, changes)
+
+    return updated
+
+
+def set_enabled(queryset, enabled) -> int:
+    """Enables or disables the jobs or schedules of a queryset with one UPDATE.
+
+    Enabling them also ends their pause, if any.
+    """
+
+    values = {"enabled": enabled}
+    if enabled:
+        values["paused_until"] = None
+
+    return update_recorded(queryset, values)
+
+
+def reassign_owner(queryset, owner) -> int:
+    """Assigns a new owner to the jobs of a queryset with one UPDATE."""
+
+    validate_in_batch([Job(owner=owner)], exclude=("id", "name", "script"))
+
+    return update_recorded(queryset, {"owner": owner})
+
+
+def delete_recorded(queryset):
+    """Deletes the objects of a queryset, recording their deletion."""
+
+    with transaction.atomic():
+        record_changes(
+            queryset.model,
+            ((object_id, {}) for object_id in queryset.values_list("pk", flat=True)),
+            action=ChangeRecord.Action.DELETED,
+        )
+        return queryset.delete()
+
+
+def shift_minute(field_value, offset) -> str:
+    """Shifts the values of a minute field, wrapping around the hour."""
+
+    values = parse_field(field_value)
+    if values is None:
+        return field_value
+
+    shifted = sorted({(value + offset) % 60 for value in values})
+    return ",".join(str(value) for value in shifted)
+
+
+def shift_minutes(queryset, offset) -> int:
+    """Shifts the minutes of the schedules of a queryset.
+
+    The minutes wrap around the hour, so the hour field does not change. Every
+    distinct expression is shifted and validated once and all the schedules are
+    written by a single UPDATE, which maps each old expression hash to its new
+    fields.
+
+    The unique constraint of the expression hashes is deferred, so schedules of
+    a job can take each other's minutes in the UPDATE, e.g. 0 and 20 shifted by
+    20. Only the end state is checked, with one query before committing.
+
+    Raises:
+        ValidationError: If a shifted schedule duplicates another one of its job.
+    """
+
+    expressions = (
+        queryset.exclude(minute="*")
+        .order_by()
+        .values("expression_hash", *FIELD_NAMES, "time_zone")
+        .distinct()
+    )
+
+    shifted = {}
+    for expression in expressions:
+        schedule = JobSchedule(
+            **{name: expression[name] for name in (*FIELD_NAMES, "time_zone")}
+        )
+        schedule.minute = shift_minute(schedule.minute, offset)
+        shifted[expression["expression_hash"]] = schedule
+
+    if not shifted:
+        return 0
+
+    validate_in_batch(shifted.values())
+
+    def mapped(field_name):
+        return Case(
+            *(
+                When(
+                    expression_hash=old_hash, then=Value(getattr(schedule, field_name))
+                )
+                for old_hash, schedule in shifted.items()
+            )
+        )
+
+    queryset = queryset.filter(expression_hash__in=shifted)
+    duplicated = ValidationError(
+        "The shifted schedules would duplicate other schedules of their jobs"
+    )
+
+    try:
+        with transaction.atomic():
+            rows = list(
+                queryset.values_list(
+                    "pk", "job_id", "expression_hash", "minute"
+                ).order_by()
+            )
+            changes = [
+                (object_id, {"minute": [minute, shifted[old_hash].minute]})
+                for object_id, _, old_hash, minute in rows
+                if minute != shifted[old_hash].minute
+            ]
+            updated = queryset.update(
+                minute=mapped("minute"),
+                expression_hash=mapped("expression_hash"),
+                updated_at=timezone.now(),
+            )
+            if (
+                JobSchedule.objects.filter(job_id__in={row[1] for row in rows})
+                .values("job_id", "expression_hash")
+                .annotate(schedules=Count("id"))
+                .filter(schedules__gt=1)
+                .exists()
+            ):
+                raise duplicated
+            record_changes(JobSchedule, changes)
+            return updated
+    except IntegrityError:
+        raise duplicated
+
+
+def clone_schedules(queryset, job) -> int:
+    """Copies the schedules of a queryset to a job with batched INSERTs.
+
+    The schedules the job already has, and the duplicates among the copies, are
+    skipped.
+    """
+
+    clones = [
+        JobSchedule(
+            job=job,
+            description=schedule.description,
+            minute=schedule.minute,
+            hour=schedule.hour,
+            day_of_month=schedule.day_of_month,
+            month=schedule.month,
+            day_of_week=schedule.day_of_week,
+            year=schedule.year,
+            time_zone=schedule.time_zone,
+            enabled=schedule.enabled,
+        )
+        for schedule in queryset.order_by().iterator(chunk_size=BATCH_SIZE)
+    ]
+    validate_in_batch(clones)
+
+    existing = set(job.schedules.values_list("expression_hash", flat=True))
+    new_clones = []
+    for clone in clones:
+        if clone.expression_hash not in existing:
+            existing.add(clone.expression_hash)
+            new_clones.append(clone)
+
+    with transaction.atomic():
+        JobSchedule.objects.bulk_create(new_clones, batch_size=BATCH_SIZE)
+        record_changes(
+            JobSchedule,
+            ((clone.pk, clone.audit_changes()) for clone in new_clones),
+            action=ChangeRecord.Action.CREATED,
+        )
+
+    return len(new_clones)
@@ -0,0 +1,100 @@
+"""Coordination between several runner processes reading the same schedules.
+
+Two strategies are available:
+
+* ``claim``: every runner evaluates the schedules and each occurrence is claimed
+  by inserting its JobRun. The unique (schedule, scheduled_for) constraint lets
+  only one insert succeed, so an occurrence runs exactly once no matter how many
+  runners are alive, and there is nothing to fail over.
+* ``leader``: only the runner holding a PostgreSQL advisory lock evaluates the
+  schedules. The lock belongs to the database session, so it is released by the
+  server as soon as the leader dies or loses its connection and another runner
+  takes over on its next tick. Occurrences are still claimed as above.
+"""
+
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from cron.models import JobRun
+
+COORDINATION_CLAIM = "claim"
+COORDINATION_LEADER = "leader"
+COORDINATION_MODES = (COORDINATION_CLAIM, COORDINATION_LEADER)
+
+# Key of the advisory lock, derived from a fixed name so it does not clash with
+# locks taken by other applications on the same database.
+LEADER_LOCK_KEY = zlib.crc32(b"scheduler_web.cron.leader")
+
+
+def claim_occurrence(schedule, scheduled_for, worker, using="default"):
+    """Claims an occurrence of a schedule by creating its JobRun.
+
+    Args:
+        schedule (JobSchedule): The schedule that fires.
+        scheduled_for (datetime): The aware datetime of the occurrence.
+        worker (str): The name of the runner claiming the occurrence.
+        using (str): The database alias.
+
+    Returns:
+        JobRun | None: The created run, or None if another runner claimed it first.
+    """
+
+    try:
+        with transaction.atomic(using=using):
+            return JobRun.objects.using(using).create(
+                job=schedule.job,
+                schedule=schedule,
+                scheduled_for=scheduled_for,
+                worker=worker,
+                started_at=timezone.now(),
+            )
+    except IntegrityError:
+        return None
+
+
+class LeaderLock:
+    """Leader election through a session level PostgreSQL advisory lock."""
+
+    def __init__(self, using="default", key=LEADER_LOCK_KEY):
+        self.using = using
+        self.key = key
+        self.held = False
+
+        if connections[using].vendor != "postgresql":
+            raise ImproperlyConfigured(
+                "The leader coordination mode requires a PostgreSQL database."
+            )
+
+    def acquire(self) -> bool:
+        """Tries to become (or to remain) the leader without blocking.
+
+        Returns:
+            bool: True if this runner is the leader.
+        """
+
+        connection = connections[self.using]
+
+        if self.held and not connection.is_usable():
+            # The session that held the lock is gone, and so is the lock.
+            self.held = False
+            connection.close()
+
+        if not self.held:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_try_advisory_lock(%s)", [self.key])
+                self.held = cursor.fetchone()[0]
+
+        return self.held
+
+    def release(self):
+        """Releases the lock if it is held."""
+
+        if not self.held:
+            return
+
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_unlock(%s)", [self.key])
+        self.held = False
@@ -0,0 +1,76 @@
+"""Dependencies between jobs: "run B after A succeeds".
+
+The graph is a dict that maps the id of every job to the ids of the jobs that
+depend on it. When a scheduled run finishes, the jobs reachable from it form a
+DagRun. Every node keeps a counter with the upstream jobs that have not
+succeeded yet, so completing a node only touches its direct dependents instead
+of scanning the whole graph, and the nodes whose counter reaches zero are ready
+to run in parallel.
+
+Upstream jobs that are not reachable from the job that started the DagRun are
+not waited for.
+"""
+
+from collections import deque
+
+
+def reachable(edges, start) -> set:
+    """Returns the nodes reachable from start, start included."""
+
+    seen = {start}
+    pending = deque([start])
+    while pending:
+        node = pending.popleft()
+        for child in edges.get(node, ()):
+            if child not in seen:
+                seen.add(child)
+                pending.append(child)
+
+    return seen
+
+
+def creates_cycle(edges, upstream, downstream) -> bool:
+    """Whether adding the edge upstream -> downstream would close a cycle."""
+
+    return upstream in reachable(edges, downstream)
+
+
+class DagRun:
+    """Readiness of the jobs that depend on a finished run.
+
+    Args:
+        edges (dict): The dependency graph, upstream id -> downstream ids.
+        root: The id of the job whose run started the DagRun.
+    """
+
+    def __init__(self, edges, root):
+        self.edges = edges
+        self.nodes = reachable(edges, root)
+        self.pending_upstreams = {node: 0 for node in self.nodes}
+        for node in self.nodes:
+            for child in edges.get(node, ()):
+                self.pending_upstreams[child] += 1
+        self.skipped = set()
+
+    def complete(self, node, succeeded) -> list:
+        """Marks a node as finished.
+
+        Args:
+            node: The id of the finished job.
+            succeeded (bool): Whether it succeeded.
+
+        Returns:
+            list: The ids of the jobs that became ready to run.
+        """
+
+        if not succeeded:
+            self.skipped |= reachable(self.edges, node) - {node}
+            return []
+
+        ready = []
+        for child in self.edges.get(node, ()):
+            self.pending_upstreams[child] -= 1
+            if self.pending_upstreams[child] == 0 and child not in self.skipped:
+                ready.append(child)
+
+        return ready
@@ -0,0 +1,207 @@
+"""Ways of executing the scripts of the jobs.
+
+``subprocess`` starts a new Python interpreter for every execution.
+
+``forkserver`` keeps a warm server process that imports the configured preload
+modules once, and every execution is a process forked from it. The scripts find
+their heavy libraries already imported, so they skip the interpreter start up
+and the imports, while still running isolated from each other and from the
+runner.
+
+Both can run a script from the bytecode precompiled by cron.scripts instead of
+its source, so an execution does not read nor compile the source again. The
+script still runs as if started from its source: in its directory, with its
+path as __file__ and sys.argv[0].
+
+This module does not import Django so it can be imported by the forked
+processes without setting it up. It is also the program run by the subprocess
+executor for the precompiled scripts.
+"""
+
+import importlib.util
+import marshal
+import multiprocessing
+import os
+import runpy
+import subprocess
+import sys
+import types
+from multiprocessing import forkserver
+from pathlib import Path
+
+EXECUTOR_SUBPROCESS = "subprocess"
+EXECUTOR_FORKSERVER = "forkserver"
+EXECUTORS = (EXECUTOR_SUBPROCESS, EXECUTOR_FORKSERVER)
+
+
+# Size of the reads of the output of the scripts.
+READ_SIZE = 64 * 1024
+
+
+def pump(fd, output):
+    """Copies everything read from a file descriptor to output until the end."""
+
+    while chunk := os.read(fd, READ_SIZE):
+        output.write(chunk)
+
+
+def load_compiled(compiled):
+    """Returns the code object of a .pyc file written by this interpreter."""
+
+    with open(compiled, "rb") as file:
+        header = file.read(16)
+        if header[:4] != importlib.util.MAGIC_NUMBER:
+            raise ImportError(f"Bad magic number in {compiled}")
+        return marshal.load(file)
+
+
+def run_compiled(script, compiled):
+    """Runs the bytecode of a script as __main__, with the script as __file__."""
+
+    module = types.ModuleType("__main__")
+    module.__file__ = script
+    module.__cached__ = compiled
+    sys.modules["__main__"] = module
+    exec(load_compiled(compiled), module.__dict__)
+
+
+def run_script(script, output=None, compiled=None):
+    """Entry point of the forked processes: runs a script as __main__.
+
+    The exit code of the process is the one of the script, 1 if it raises an
+    exception.
+
+    Args:
+        script (str): The path of the script.
+        output (Connection): If given, the stdout and stderr of the script are
+            redirected to it.
+        compiled (str): If given, the path of the bytecode of the script, run
+            instead of its source.
+    """
+
+    if output is not None:
+        os.dup2(output.fileno(), 1)
+        os.dup2(output.fileno(), 2)
+        output.close()
+
+    directory = os.path.dirname(script)
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    sys.argv = [script]
+
+    if compiled is not None:
+        run_compiled(script, compiled)
+    else:
+        runpy.run_path(script, run_name="__main__")
+
+
+class SubprocessExecutor:
+    """Executes every script in a new Python interpreter."""
+
+    def run(self, script: Path, output=None, compiled=None) -> int:
+        """Runs a script and waits for it.
+
+        Args:
+            script (Path): The path of the script.
+            output: If given, an object with a write(bytes) method that receives
+                the stdout and stderr of the script as they are produced.
+            compiled (Path): If given, the bytecode of the script, run instead
+                of its source.
+
+        Returns:
+            int: The exit code of the script.
+        """
+
+        command = [sys.executable, str(script)]
+        if compiled is not None:
+            command = [sys.executable, __file__, str(script), str(compiled)]
+
+        if output is None:
+            return subprocess.run(command, cwd=script.parent).returncode
+
+        with subprocess.Popen(
+            command,
+            cwd=script.parent,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        ) as process:
+            pump(process.stdout.fileno(), output)
+            return process.wait()
+
+
+class ForkserverExecutor:
+    """Executes every script in a process forked from a warm server.
+
+    The server is shared by the whole process, so the preload modules must be
+    set before the first executor starts it.
+
+    Args:
+        preload_modules (list[str]): Modules imported once by the server and
+            inherited by every execution.
+    """
+
+    def __init__(self, preload_modules=()):
+        self.context = multiprocessing.get_context("forkserver")
+        self.context.set_forkserver_preload(list(preload_modules))
+        # Start the server now, so the first execution does not pay for it.
+        forkserver.ensure_running()
+
+    def run(self, script: Path, output=None, compiled=None) -> int:
+        """Runs a script in a forked process and waits for it.
+
+        Args:
+            script (Path): The path of the script.
+            output: If given, an object with a write(bytes) method that receives
+                the stdout and stderr of the script as they are produced.
+            compiled (Path): If given, the bytecode of the script, run instead
+                of its source.
+
+        Returns:
+            int: The exit code of the script.
+        """
+
+        if compiled is not None:
+            compiled = str(compiled)
+        elif not script.is_file():
+            raise FileNotFoundError(f"No such script: {script}")
+
+        if output is None:
+            process = self.context.Process(
+                target=run_script,
+                args=(str(script), None, compiled),
+                name=script.name,
+            )
+            process.start()
+            process.join()
+            return process.exitcode
+
+        reader, writer = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=run_script, args=(str(script), writer, compiled), name=script.name
+        )
+        process.start()
+        writer.close()
+
+        with reader:
+            pump(reader.fileno(), output)
+
+        process.join()
+        return process.exitcode
+
+
+def get_executor(name, preload_modules=()):
+    """Returns the executor with the given name, one of EXECUTORS."""
+
+    if name == EXECUTOR_FORKSERVER:
+        return ForkserverExecutor(preload_modules)
+    if name == EXECUTOR_SUBPROCESS:
+        return SubprocessExecutor()
+
+    raise ValueError(f"Unknown executor {name}")
+
+
+if __name__ == "__main__":
+    # Started by SubprocessExecutor with the script and its bytecode. The
+    # directory of this module is not the one of the script.
+    del sys.path[0]
+    run_script(sys.argv[1], compiled=sys.argv[2])
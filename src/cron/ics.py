@@ -0,0 +1,367 @@
+"""Generation of iCalendar (RFC 5545) feeds from the job schedules.
+
+Each JobSchedule is emitted as a recurring event with an RRULE, so the size of
+the feed depends on the number of schedules and not on the number of
+executions. A schedule whose years are not consecutive is emitted as one event
+per block of consecutive years, each with its own UNTIL.
+
+The times are given in the time zone of every schedule, and every zone used is
+described by a VTIMEZONE at the end of the feed, built from its transition
+table (see cron.timezones).
+
+RFC 5545 moves a local time skipped by a forward transition by the length of
+the gap (02:30 becomes 03:30), while the runner executes it at the transition
+(03:00). The executions in those gaps are excluded with EXDATE and added back
+at the transition with RDATE, up to the LAST_YEAR of the tables.
+
+Calendar clients cannot log in, so every feed is served to whoever has the
+secret token of its URL, see calendar_url.
+"""
+
+from datetime import datetime
+from datetime import timezone as dt_timezone
+from functools import lru_cache
+from typing import Iterable, Iterator
+from zoneinfo import ZoneInfo
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.http import urlencode
+
+from cron.schedules import CronFields
+from cron.timezones import FIRST_YEAR, local_datetime, transition_table
+
+PRODID = "-//scheduler_web//cron//ES"
+
+RRULE_WEEKDAYS = {1: "MO", 2: "TU", 3: "WE", 4: "TH", 5: "FR", 6: "SA", 7: "SU"}
+
+# Years searched for the first execution of a schedule without year restriction.
+# A 29th of February on a given weekday can take up to 28 years to happen again.
+FIRST_OCCURRENCE_SEARCH_YEARS = 29
+
+LOCAL_FORMAT = "%Y%m%dT%H%M%S"
+UTC_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+def escape_text(value: str) -> str:
+    """Escapes a TEXT value as required by RFC 5545."""
+
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Folds a content line to 75 octets per physical line and appends the CRLF."""
+
+    folded = []
+    current = ""
+    current_size = 0
+
+    for char in line:
+        char_size = len(char.encode())
+        if current_size + char_size > 75:
+            folded.append(current)
+            current = " "
+            current_size = 1
+        current += char
+        current_size += char_size
+
+    folded.append(current)
+    return "\r\n".join(folded) + "\r\n"
+
+
+def year_blocks(years: tuple) -> list:
+    """Splits sorted years into blocks of consecutive years.
+
+    Returns:
+        list[tuple[int, int]]: The first and last year of every block.
+    """
+
+    blocks = []
+    for year in years:
+        if blocks and blocks[-1][1] == year - 1:
+            blocks[-1] = (blocks[-1][0], year)
+        else:
+            blocks.append((year, year))
+
+    return blocks
+
+
+def build_rrule(fields: CronFields, tz, last_year=None) -> str:
+    """Builds the RRULE value for the schedule fields.
+
+    Every schedule is described with FREQ=DAILY: BYMONTH, BYMONTHDAY and BYDAY
+    limit the days and BYHOUR and BYMINUTE expand the times of each day, which
+    matches the cron semantics. Some clients do not support HOURLY or MINUTELY
+    frequencies, so those are never used.
+
+    Args:
+        fields (CronFields): The parsed fields of the schedule.
+        tz (ZoneInfo): The time zone of the schedule.
+        last_year (int): If given, the rule ends with this year. The last
+            possible year, 9999, has no end, since its end cannot be given in
+            UTC west of it.
+    """
+
+    parts = ["FREQ=DAILY"]
+
+    if last_year is not None and last_year < 9999:
+        last_moment = datetime(last_year, 12, 31, 23, 59, 59, tzinfo=tz)
+        until = last_moment.astimezone(ZoneInfo("UTC")).strftime(UTC_FORMAT)
+        parts.append(f"UNTIL={until}")
+    if fields.month is not None:
+        parts.append("BYMONTH=" + ",".join(map(str, fields.month)))
+    if fields.day_of_month is not None:
+        parts.append("BYMONTHDAY=" + ",".join(map(str, fields.day_of_month)))
+    if fields.day_of_week is not None:
+        parts.append(
+            "BYDAY=" + ",".join(RRULE_WEEKDAYS[day] for day in fields.day_of_week)
+        )
+
+    parts.append("BYHOUR=" + ",".join(map(str, fields.expand("hour"))))
+    parts.append("BYMINUTE=" + ",".join(map(str, fields.expand("minute"))))
+
+    return ";".join(parts)
+
+
+def search_end(start: datetime, last_year=None) -> datetime:
+    """Returns the end of the window where the executions of a schedule are searched."""
+
+    if last_year is not None:
+        if last_year == 9999:
+            return datetime.max
+        return datetime(last_year + 1, 1, 1)
+
+    return datetime(start.year + FIRST_OCCURRENCE_SEARCH_YEARS, 1, 1)
+
+
+@lru_cache(maxsize=None)
+def skipped_times(zone_name) -> list:
+    """Returns the local times skipped by every forward transition of a zone.
+
+    Returns:
+        list[tuple[list[datetime], set[int], datetime]]: The naive local minutes
+            skipped by each transition, their hours, and the local time after
+            the transition, when the runner executes them.
+    """
+
+    table = transition_table(zone_name)
+    gaps = []
+    for transition, before, after in zip(
+        table.transition_list, table.offset_list, table.offset_list[1:]
+    ):
+        if after <= before:
+            continue
+
+        skipped = [
+            local_datetime(second)
+            for second in range(transition + before, transition + after, 60)
+        ]
+        hours = {moment.hour for moment in skipped}
+        gaps.append((skipped, hours, local_datetime(transition + after)))
+
+    return gaps
+
+
+def gap_dates(fields: CronFields, zone_name, first: datetime, last_year=None) -> tuple:
+    """Returns the executions of a schedule that fall in the gaps of its zone.
+
+    Args:
+        fields (CronFields): The parsed fields of the schedule.
+        zone_name (str): The time zone of the schedule.
+        first (datetime): The first execution of the event.
+        last_year (int): If given, the last year of the event.
+
+    Returns:
+        tuple[list[datetime], list[datetime]]: The skipped local times matched
+            by the schedule, for the EXDATE, and the local times after each
+            of those gaps, for the RDATE.
+    """
+
+    exdates, rdates = [], []
+    for skipped, hours, executed_at in skipped_times(zone_name):
+        if skipped[-1] < first:
+            continue
+        if last_year is not None and skipped[0].year > last_year:
+            break
+        if fields.hour is not None and hours.isdisjoint(fields.hour):
+            continue
+
+        matched = [
+            moment for moment in skipped if moment >= first and fields.matches(moment)
+        ]
+        if not matched:
+            continue
+
+        exdates.extend(matched)
+        # The runner executes them once, with the first minute after the gap.
+        if not fields.matches(executed_at):
+            rdates.append(executed_at)
+
+    return exdates, rdates
+
+
+def iter_schedule_event(schedule) -> Iterator[str]:
+    """Yields the folded content lines of the VEVENTs of a schedule.
+
+    Every event starts at the first execution after the last modification of
+    the schedule, so the content is stable between requests while the schedule
+    does not change. Schedules that never fire produce no event. The times are
+    given in the time zone of the schedule.
+
+    A schedule with years is emitted as one event per block of consecutive
+    years. If there is more than one block, the first year of the block is
+    part of the UID of its event.
+    """
+
+    tz = ZoneInfo(schedule.time_zone)
+    fields = CronFields.from_schedule(schedule)
+    if fields.is_empty():
+        return
+
+    updated_at = timezone.localtime(schedule.updated_at, tz).replace(
+        tzinfo=None, second=0, microsecond=0
+    )
+    blocks = year_blocks(fields.year) if fields.year is not None else [None]
+
+    job = schedule.job
+    description = f"Responsable: {job.owner}\nFichero: {job.script}"
+    if schedule.description:
+        description = f"{schedule.description}\n{description}"
+    stamp = schedule.updated_at.astimezone(ZoneInfo("UTC")).strftime(UTC_FORMAT)
+
+    for block in blocks:
+        anchor, last_year = updated_at, None
+        if block is not None:
+            anchor = max(anchor, datetime(max(block[0], 1), 1, 1))
+            last_year = block[1]
+
+        first = next(fields.iter_datetimes(anchor, search_end(anchor, last_year)), None)
+        if first is None:
+            continue
+
+        uid = schedule.id if len(blocks) == 1 else f"{schedule.id}-{block[0]}"
+        exdates, rdates = gap_dates(fields, tz.key, first, last_year)
+
+        yield fold_line("BEGIN:VEVENT")
+        yield fold_line(f"UID:{uid}@scheduler")
+        yield fold_line(f"DTSTAMP:{stamp}")
+        yield fold_line(f"DTSTART;TZID={tz.key}:{first.strftime(LOCAL_FORMAT)}")
+        yield fold_line("DURATION:PT1M")
+        yield fold_line(f"RRULE:{build_rrule(fields, tz, last_year)}")
+        for name, moments in (("EXDATE", exdates), ("RDATE", rdates)):
+            if moments:
+                values = ",".join(moment.strftime(LOCAL_FORMAT) for moment in moments)
+                yield fold_line(f"{name};TZID={tz.key}:{values}")
+        yield fold_line(f"SUMMARY:{escape_text(job.name)}")
+        yield fold_line(f"DESCRIPTION:{escape_text(description)}")
+        yield fold_line("END:VEVENT")
+
+
+def format_offset(seconds: int) -> str:
+    """Formats a UTC offset as the UTC-OFFSET value of RFC 5545, e.g. -0500."""
+
+    sign = "-" if seconds < 0 else "+"
+    hours, rest = divmod(abs(seconds), 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{sign}{hours:02d}{minutes:02d}" + (f"{seconds:02d}" if seconds else "")
+
+
+def iter_timezone(zone_name: str) -> Iterator[str]:
+    """Yields the folded content lines of the VTIMEZONE of a zone.
+
+    Every distinct change of offset is an observance, with the local times at
+    which it happens from FIRST_YEAR on as its DTSTART and RDATEs.
+    """
+
+    zone = ZoneInfo(zone_name)
+    table = transition_table(zone_name)
+    start = int(datetime(FIRST_YEAR, 1, 1, tzinfo=dt_timezone.utc).timestamp())
+    first_offset = table.offset_list[0]
+
+    observances = {}
+    changes = [(start, first_offset, first_offset)] + list(
+        zip(table.transition_list, table.offset_list, table.offset_list[1:])
+    )
+    for instant, offset_from, offset_to in changes:
+        moment = datetime.fromtimestamp(instant, zone)
+        kind = "DAYLIGHT" if moment.dst() else "STANDARD"
+        key = (kind, offset_from, offset_to, moment.tzname())
+        onset = local_datetime(instant + offset_from).strftime(LOCAL_FORMAT)
+        observances.setdefault(key, []).append(onset)
+
+    yield fold_line("BEGIN:VTIMEZONE")
+    yield fold_line(f"TZID:{zone_name}")
+    for (kind, offset_from, offset_to, name), onsets in observances.items():
+        yield fold_line(f"BEGIN:{kind}")
+        yield fold_line(f"DTSTART:{onsets[0]}")
+        if len(onsets) > 1:
+            yield fold_line(f"RDATE:{','.join(onsets[1:])}")
+        yield fold_line(f"TZOFFSETFROM:{format_offset(offset_from)}")
+        yield fold_line(f"TZOFFSETTO:{format_offset(offset_to)}")
+        if name:
+            yield fold_line(f"TZNAME:{escape_text(name)}")
+        yield fold_line(f"END:{kind}")
+    yield fold_line("END:VTIMEZONE")
+
+
+def calendar_token(owner=None) -> str:
+    """Returns the secret token of the calendar feed of an owner (or of every job).
+
+    Calendar clients cannot log in, so the feeds are protected by a token in
+    their URL, derived from SECRET_KEY: changing the key revokes every URL.
+    """
+
+    value = f"owner:{owner}" if owner is not None else "all"
+    return salted_hmac("cron.calendar", value).hexdigest()
+
+
+def calendar_url(owner=None) -> str:
+    """Returns the path of the calendar feed of an owner (or of every job), with its token."""
+
+    if owner is None:
+        path = reverse("cron:calendar")
+    else:
+        path = reverse("cron:owner_calendar", kwargs={"owner": owner})
+    return f"{path}?{urlencode({'token': calendar_token(owner)})}"
+
+
+def iter_calendar(schedules: Iterable, calendar_name: str) -> Iterator[str]:
+    """Yields the iCalendar feed of the given schedules, one chunk per event.
+
+    Args:
+        schedules (Iterable[JobSchedule]): The schedules, with their job already loaded.
+        calendar_name (str): The name shown by the calendar clients.
+    """
+
+    yield "".join(
+        (
+            fold_line("BEGIN:VCALENDAR"),
+            fold_line("VERSION:2.0"),
+            fold_line(f"PRODID:{PRODID}"),
+            fold_line("CALSCALE:GREGORIAN"),
+            fold_line(f"X-WR-CALNAME:{escape_text(calendar_name)}"),
+            fold_line(f"X-WR-TIMEZONE:{settings.TIME_ZONE}"),
+        )
+    )
+
+    # The zones are only known once the events are written, and RFC 5545 does
+    # not require the VTIMEZONEs to come before them.
+    zones = []
+    for schedule in schedules:
+        event = "".join(iter_schedule_event(schedule))
+        if event:
+            if schedule.time_zone not in zones:
+                zones.append(schedule.time_zone)
+            yield event
+
+    for zone in zones:
+        yield "".join(iter_timezone(zone))
+
+    yield fold_line("END:VCALENDAR")
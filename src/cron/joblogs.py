@@ -0,0 +1,161 @@
+"""Output of the job executions, stored in rotated files instead of the database.
+
+The output of every run goes to its own directory. The segment being written
+is ``output.log``; when it reaches JOB_LOG_SEGMENT_BYTES it is closed, renamed
+to ``output.<n>.log`` and compressed to ``output.<n>.log.gz`` in the background.
+Readers only touch the end of the current segment, so showing the last lines
+of a huge output costs the same as showing those of a small one.
+"""
+
+import gzip
+import mmap
+import os
+import shutil
+import threading
+from collections import deque
+from pathlib import Path
+
+from django.conf import settings
+
+CURRENT_SEGMENT = "output.log"
+
+
+def run_log_directory(run) -> Path:
+    """Returns the directory with the output of a run."""
+
+    return Path(settings.JOB_LOGS_DIR) / str(run.job_id) / str(run.pk)
+
+
+def compress_segment(path: Path):
+    """Compresses a closed segment and removes the uncompressed file.
+
+    The segment is compressed to a temporary name and moved into place when it
+    is complete, so closed_segments never lists a partial file.
+    """
+
+    compressed = path.with_name(f"{path.name}.gz")
+    partial = path.with_name(f"{path.name}.gz.partial")
+    with open(path, "rb") as source, gzip.open(partial, "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.replace(partial, compressed)
+    path.unlink()
+
+
+class SegmentWriter:
+    """Buffered writer that rotates and compresses the output of a run.
+
+    Args:
+        directory (Path): The directory of the run, created if needed.
+        segment_bytes (int): Size at which the current segment is rotated.
+        buffer_size (int): Size of the write buffer.
+    """
+
+    def __init__(self, directory, segment_bytes=None, buffer_size=64 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes or settings.JOB_LOG_SEGMENT_BYTES
+        self.buffer_size = buffer_size
+        self.segments = len(closed_segments(self.directory))
+        self.compressions = []
+        self.open_segment()
+
+    def open_segment(self):
+        self.file = open(self.directory / CURRENT_SEGMENT, "ab", self.buffer_size)
+        self.size = self.file.tell()
+
+    def rotate(self):
+        """Closes the current segment and starts compressing it."""
+
+        self.file.close()
+        self.segments += 1
+        closed = self.directory / f"output.{self.segments}.log"
+        os.replace(self.directory / CURRENT_SEGMENT, closed)
+
+        compression = threading.Thread(target=compress_segment, args=(closed,))
+        compression.start()
+        self.compressions.append(compression)
+
+        self.open_segment()
+
+    def write(self, data: bytes):
+        while data:
+            if self.size >= self.segment_bytes:
+                self.rotate()
+            room = self.segment_bytes - self.size
+            chunk, data = data[:room], data[room:]
+            self.file.write(chunk)
+            self.size += len(chunk)
+
+    def close(self):
+        self.file.close()
+        for compression in self.compressions:
+            compression.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def closed_segments(directory) -> list:
+    """Returns the compressed segments of a run, from the oldest to the newest."""
+
+    return sorted(
+        Path(directory).glob("output.*.log.gz"),
+        key=lambda path: int(path.name.split(".")[1]),
+    )
+
+
+def read_current_range(directory, start, end) -> bytes:
+    """Reads the bytes [start, end] of the current segment of a run."""
+
+    path = Path(directory) / CURRENT_SEGMENT
+    with open(path, "rb") as log:
+        log.seek(start)
+        return log.read(end - start + 1)
+
+
+def current_size(directory) -> int:
+    """Returns the size of the current segment of a run, 0 if it does not exist."""
+
+    try:
+        return (Path(directory) / CURRENT_SEGMENT).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def read_tail(directory, size) -> bytes:
+    """Returns the last bytes of the output of a run.
+
+    The current segment is memory mapped and only its end is read. The previous
+    segment is only decompressed if the current one is shorter than size.
+
+    Args:
+        directory (Path): The directory of the run.
+        size (int): The maximum number of bytes returned.
+    """
+
+    tail = b""
+    path = Path(directory) / CURRENT_SEGMENT
+
+    if current_size(directory):
+        with open(path, "rb") as log, mmap.mmap(
+            log.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped:
+            tail = mapped[-size:]
+
+    missing = size - len(tail)
+    segments = closed_segments(directory)
+    if missing > 0 and segments:
+        chunks = deque()
+        kept = 0
+        with gzip.open(segments[-1], "rb") as segment:
+            while chunk := segment.read(64 * 1024):
+                chunks.append(chunk)
+                kept += len(chunk)
+                while kept - len(chunks[0]) >= missing:
+                    kept -= len(chunks.popleft())
+        tail = b"".join(chunks)[-missing:] + tail
+
+    return tail
@@ -0,0 +1,174 @@
+"""Keyset (seek) pagination of the list endpoints.
+
+A page is selected by the ordering key of the last row of the previous one
+instead of an OFFSET, so every page is an index range scan however deep it is
+and the whole table is read in linear time. The keys end with the primary key,
+so they are unique and no row is repeated or skipped between pages.
+
+The condition of a page is a row value comparison, e.g. (a, b) > (x, y), when
+every column has the same direction and none is nullable, so the database
+turns it into the start of an index range. Otherwise it is expanded to
+(a > x) OR (a = x AND b > y), with a redundant a >= x added so the index
+range still starts at the first column.
+
+The cursor given to the clients is the key of a row encoded as URL-safe base64
+JSON, opaque to them.
+"""
+
+import base64
+import binascii
+import json
+from typing import NamedTuple
+
+from django.db.models import F, Func, Q, Value
+from django.db.models.fields import Field
+from django.db.models.lookups import GreaterThan, LessThan
+
+# Rows fetched by each query while streaming.
+CHUNK_SIZE = 500
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+class Row(Func):
+    """A row value, e.g. (a, b)."""
+
+    template = "(%(expressions)s)"
+    arg_joiner = ", "
+    output_field = Field()
+
+
+class Key(NamedTuple):
+    """A column of an ordering key. Nullable columns sort their NULLs last."""
+
+    field: str
+    descending: bool = False
+    nullable: bool = False
+
+    def order_by(self):
+        expression = F(self.field)
+        if self.descending:
+            return expression.desc(nulls_last=self.nullable or None)
+        return expression.asc(nulls_last=self.nullable or None)
+
+    def equal(self, value) -> Q:
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True})
+        return Q(**{self.field: value})
+
+    def after(self, value) -> Q:
+        """Returns the filter of the values that sort after value."""
+
+        if value is None:
+            # NULLs are last, nothing comes after them.
+            return Q(pk__in=[])
+
+        lookup = "lt" if self.descending else "gt"
+        after = Q(**{f"{self.field}__{lookup}": value})
+        if self.nullable:
+            after |= Q(**{f"{self.field}__isnull": True})
+        return after
+
+    def from_(self, value) -> Q:
+        """Returns the filter of the values that sort at or after value."""
+
+        if value is None:
+            return Q(**{f"{self.field}__isnull": True})
+
+        lookup = "lte" if self.descending else "gte"
+        start = Q(**{f"{self.field}__{lookup}": value})
+        if self.nullable:
+            start |= Q(**{f"{self.field}__isnull": True})
+        return start
+
+
+def seek(model, keys, values):
+    """Returns the filter of the rows that sort after the row with the given key values.
+
+    Args:
+        model: The model of the rows, whose fields convert the values.
+        keys (list[Key]): The ordering key.
+        values (list): The key values of the row.
+    """
+
+    directions = {key.descending for key in keys}
+    if len(directions) == 1 and not any(key.nullable for key in keys):
+        compare = LessThan if keys[0].descending else GreaterThan
+        return compare(
+            Row(*(F(key.field) for key in keys)),
+            Row(
+                *(
+                    Value(value, output_field=model._meta.get_field(key.field))
+                    for key, value in zip(keys, values)
+                )
+            ),
+        )
+
+    condition = Q(pk__in=[])
+    equal = Q()
+    for key, value in zip(keys, values):
+        condition |= equal & key.after(value)
+        equal &= key.equal(value)
+
+    return keys[0].from_(values[0]) & condition
+
+
+def encode_cursor(values) -> str:
+    # str() keeps the microseconds of the datetimes, which DjangoJSONEncoder drops.
+    return base64.urlsafe_b64encode(json.dumps(values, default=str).encode()).decode()
+
+
+def decode_cursor(cursor, keys) -> list:
+    """Decodes a cursor given by encode_cursor.
+
+    Raises:
+        InvalidCursor: If it is not a cursor of the given keys.
+    """
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise InvalidCursor(f"Invalid cursor {cursor}")
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise InvalidCursor(f"Invalid cursor {cursor}")
+
+    return values
+
+
+def iter_keyset(queryset, keys, fields, after=None, limit=None):
+    """Yields the rows of a queryset from a key on, querying a chunk at a time.
+
+    Args:
+        queryset (QuerySet): The rows, unordered.
+        keys (list[Key]): The ordering key, ending with a unique column.
+        fields (list[str]): The fields of every row, which must include the keys.
+        after (list): The key values of the row after which the rows start.
+        limit (int): Maximum number of rows, every row by default.
+
+    Yields:
+        dict: The fields of every row.
+    """
+
+    ordered = queryset.order_by(*(key.order_by() for key in keys)).values(*fields)
+    remaining = limit
+
+    while remaining is None or remaining > 0:
+        chunk_size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+        page = (
+            ordered.filter(seek(queryset.model, keys, after))
+            if after is not None
+            else ordered
+        )
+        rows = list(page[:chunk_size])
+
+        yield from rows
+
+        if len(rows) < chunk_size:
+            return
+
+        after = [rows[-1][key.field] for key in keys]
+        if remaining is not None:
+            remaining -= len(rows)
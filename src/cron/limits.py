@@ -0,0 +1,170 @@
+"""Limits checked by the runner before executing a claimed run.
+
+* Job.max_instances: runs of the same job that can be in progress at once.
+* OwnerRateLimit: a token bucket per owner. Every run takes a token and the
+  bucket recovers ``rate`` tokens per minute up to ``burst``.
+
+LocalLimiter keeps the counters and buckets in memory, so every check is O(1)
+and the limits apply to each runner on its own. SharedLimiter keeps them in the
+database and applies them to all the runners together: every check is a single
+conditional UPDATE, so two runners can never take the same slot or token.
+"""
+
+import threading
+import time
+from collections import Counter
+
+from django.db.models import F
+from django.utils import timezone
+
+from cron.models import Job, OwnerRateLimit
+
+# Conditional updates retried when another runner changes the bucket first.
+MAX_BUCKET_RETRIES = 5
+
+
+class TokenBucket:
+    """In memory token bucket.
+
+    Args:
+        rate (float): Tokens recovered per minute.
+        burst (int): Maximum number of tokens.
+    """
+
+    __slots__ = ("rate", "burst", "tokens", "refilled_at")
+
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.refilled_at = time.monotonic()
+
+    def take(self, now=None) -> bool:
+        """Takes a token if there is one available."""
+
+        now = time.monotonic() if now is None else now
+        elapsed = now - self.refilled_at
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate / 60)
+        self.refilled_at = now
+
+        if self.tokens < 1:
+            return False
+
+        self.tokens -= 1
+        return True
+
+
+class LocalLimiter:
+    """Limits applied by each runner on its own."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = Counter()
+        self.buckets = {}
+
+    def refresh(self):
+        """Loads the rate limits of the owners, keeping the state of the buckets."""
+
+        limits = {
+            limit.owner: limit
+            for limit in OwnerRateLimit.objects.only("owner", "rate", "burst")
+        }
+
+        with self.lock:
+            buckets = {}
+            for owner, limit in limits.items():
+                bucket = self.buckets.get(owner) or TokenBucket(limit.rate, limit.burst)
+                bucket.rate, bucket.burst = limit.rate, limit.burst
+                buckets[owner] = bucket
+            self.buckets = buckets
+
+    def acquire(self, job) -> bool:
+        """Takes a slot of the job and a token of its owner if both are available."""
+
+        with self.lock:
+            if self.running[job.pk] >= job.max_instances:
+                return False
+
+            bucket = self.buckets.get(job.owner)
+            if bucket is not None and not bucket.take():
+                return False
+
+            self.running[job.pk] += 1
+            return True
+
+    def release(self, job):
+        """Frees the slot taken by a finished run of the job."""
+
+        with self.lock:
+            self.running[job.pk] -= 1
+            if self.running[job.pk] <= 0:
+                del self.running[job.pk]
+
+
+class SharedLimiter:
+    """Limits applied by all the runners together through the database."""
+
+    def refresh(self):
+        pass
+
+    def take_instance(self, job) -> bool:
+        """Takes a slot of the job with a conditional increment."""
+
+        return bool(
+            Job.objects.filter(
+                pk=job.pk, running_instances__lt=F("max_instances")
+            ).update(running_instances=F("running_instances") + 1)
+        )
+
+    def take_token(self, owner) -> bool:
+        """Takes a token of the owner, if it has a rate limit.
+
+        The bucket is refilled and decremented with a compare and swap on the
+        time of its last refill, retried if another runner updated it first.
+        """
+
+        for _ in range(MAX_BUCKET_RETRIES):
+            limit = OwnerRateLimit.objects.filter(owner=owner).first()
+            if limit is None:
+                return True
+
+            now = timezone.now()
+            tokens = float(limit.burst)
+            if limit.refilled_at is not None:
+                elapsed = (now - limit.refilled_at).total_seconds()
+                tokens = min(limit.burst, limit.tokens + elapsed * limit.rate / 60)
+
+            if tokens < 1:
+                return False
+
+            if OwnerRateLimit.objects.filter(
+                pk=limit.pk, refilled_at=limit.refilled_at
+            ).update(tokens=tokens - 1, refilled_at=now):
+                return True
+
+        return False
+
+    def acquire(self, job) -> bool:
+        """Takes a slot of the job and a token of its owner if both are available."""
+
+        if not self.take_instance(job):
+            return False
+
+        if not self.take_token(job.owner):
+            self.release(job)
+            return False
+
+        return True
+
+    def release(self, job):
+        """Frees the slot taken by a finished run of the job."""
+
+        Job.objects.filter(pk=job.pk, running_instances__gt=0).update(
+            running_instances=F("running_instances") - 1
+        )
+
+
+def get_limiter(shared=False):
+    """Returns the limiter of the runner."""
+
+    return SharedLimiter() if shared else LocalLimiter()
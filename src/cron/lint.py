@@ -0,0 +1,334 @@
+"""Checks of the whole inventory of schedules that clean() cannot do row by row.
+
+* never_fires: no future day matches the year, month, day of month and day of
+  week of the schedule, e.g. February 30 or only years in the past.
+* duplicate: the schedule fires at exactly the same instants as another
+  schedule of its job, e.g. the same fields in UTC and in Etc/UTC.
+* overlap: two schedules of a job start within its expected runtime of each
+  other, so the second run starts while the first is still running.
+
+The checks work on the same boolean masks as cron.simulation, built once per
+distinct combination of field values, so their cost depends on the number of
+distinct patterns and not on the size of the inventory.
+
+The days of the Gregorian calendar repeat every 400 years, so a schedule that
+does not fire in the 400 years from today never fires. The overlaps are looked
+for in the next OVERLAP_DAYS, comparing the times of day in UTC with the
+current offset of every time zone.
+"""
+
+import math
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from cron.metrics import latest_snapshot
+from cron.models import JobSchedule
+from cron.schedules import FIELD_NAMES, parse_field
+from cron.simulation import MINUTES_PER_DAY, day_fields, field_table, intern
+from cron.timezones import transition_table
+
+NEVER_FIRES = "never_fires"
+DUPLICATE = "duplicate"
+OVERLAP = "overlap"
+
+# Days of a full cycle of the Gregorian calendar.
+CYCLE_YEARS = 400
+CYCLE_DAYS = 146097
+
+# Days in which the overlaps are looked for, four years to include a leap day.
+OVERLAP_DAYS = 4 * 365 + 1
+
+# Day patterns whose masks are built at once, to bound the memory.
+PATTERN_CHUNK = 64
+
+
+class Finding(NamedTuple):
+    """A problem found in a schedule."""
+
+    kind: str
+    schedule_id: object
+    job_name: str
+    message: str
+
+
+def day_masks(patterns, days) -> np.ndarray:
+    """Returns a boolean matrix, one row per (month, day_of_month, day_of_week) pattern and one column per day."""
+
+    _, months, days_of_month, days_of_week = day_fields(days)
+
+    def column(position):
+        return [pattern[position] for pattern in patterns]
+
+    return (
+        field_table(column(0), "month", months)
+        & field_table(column(1), "day_of_month", days_of_month)
+        & field_table(column(2), "day_of_week", days_of_week)
+    )
+
+
+def allowed_years(year_field, today, span) -> np.ndarray:
+    """Returns which offsets from the current year a year field allows.
+
+    Args:
+        year_field (str): The year field of a schedule.
+        today (date): The first day checked.
+        span (int): Number of offsets, the years of the days checked.
+    """
+
+    values = parse_field(year_field)
+    if values is None:
+        return np.ones(span, dtype=bool)
+
+    allowed = np.zeros(span, dtype=bool)
+    for year in values:
+        offset = year - today.year
+        if offset < 0:
+            continue
+        if offset == 0:
+            allowed[0] = True
+            continue
+
+        # A later year has the same days as a year of the cycle. The one of the
+        # current year is split between the rest of it and the start of the
+        # year that repeats it.
+        offset %= CYCLE_YEARS
+        if offset:
+            allowed[offset] = True
+        else:
+            allowed[0] = True
+            allowed[CYCLE_YEARS:] = True
+
+    return allowed
+
+
+def firing_years(patterns, today) -> np.ndarray:
+    """Returns which years from the current one every day pattern fires in.
+
+    The days checked are the CYCLE_DAYS from today, so the offset 0 is the rest
+    of the current year and the offset CYCLE_YEARS the start of the year that
+    repeats it.
+    """
+
+    days = np.datetime64(today, "D") + np.arange(CYCLE_DAYS)
+    offsets = day_fields(days)[0] - today.year
+    year_starts = np.flatnonzero(np.diff(offsets, prepend=-1))
+
+    years = []
+    for first in range(0, len(patterns), PATTERN_CHUNK):
+        masks = day_masks(patterns[first : first + PATTERN_CHUNK], days)
+        years.append(np.logical_or.reduceat(masks, year_starts, axis=1))
+
+    return np.concatenate(years) if years else np.zeros((0, len(year_starts)), bool)
+
+
+def find_never_firing(schedules, today) -> list:
+    """Returns the findings of the schedules that never fire again."""
+
+    day_patterns, day_inverse = intern(
+        [
+            (schedule["month"], schedule["day_of_month"], schedule["day_of_week"])
+            for schedule in schedules
+        ]
+    )
+    years = firing_years(day_patterns, today)
+    span = years.shape[1]
+
+    findings = []
+    year_masks = {}
+    for schedule, pattern in zip(schedules, day_inverse):
+        year_field = schedule["year"]
+        if year_field not in year_masks:
+            year_masks[year_field] = allowed_years(year_field, today, span)
+        allowed = year_masks[year_field]
+
+        if (years[pattern] & allowed).any():
+            continue
+
+        message = (
+            "Todos sus años ya pasaron."
+            if not allowed.any()
+            else "Ningún día coincide con su mes, día del mes, día de la semana y año."
+        )
+        findings.append(
+            Finding(NEVER_FIRES, schedule["id"], schedule["job__name"], message)
+        )
+
+    return findings
+
+
+def zone_key(zone_name) -> tuple:
+    """Returns a key shared by the time zones with the same UTC offsets."""
+
+    table = transition_table(zone_name)
+    return tuple(table.transition_list), tuple(table.offset_list)
+
+
+def find_duplicates(schedules) -> list:
+    """Returns the findings of the schedules that repeat another one of their job."""
+
+    first = {}
+    findings = []
+    for schedule in schedules:
+        key = (
+            schedule["job_id"],
+            *(schedule[name] for name in FIELD_NAMES),
+            zone_key(schedule["time_zone"]),
+        )
+        original = first.setdefault(key, schedule)
+        if original is not schedule:
+            findings.append(
+                Finding(
+                    DUPLICATE,
+                    schedule["id"],
+                    schedule["job__name"],
+                    f"Se ejecuta a la vez que el horario {original['id']}.",
+                )
+            )
+
+    return findings
+
+
+def time_mask(schedule, offset_minutes) -> np.ndarray:
+    """Returns the UTC minutes of the day at which a schedule starts."""
+
+    minutes = np.arange(MINUTES_PER_DAY)
+    mask = (
+        field_table([schedule["hour"]], "hour", minutes // 60)
+        & field_table([schedule["minute"]], "minute", minutes % 60)
+    )[0]
+    return np.roll(mask, -offset_minutes)
+
+
+def widen(mask, minutes) -> np.ndarray:
+    """Returns the minutes of the day within minutes - 1 of a True of mask, circularly."""
+
+    if minutes <= 1:
+        return mask
+    minutes = min(minutes, MINUTES_PER_DAY)
+
+    tripled = np.concatenate([mask, mask, mask]).astype(np.int64)
+    cumulative = np.concatenate(([0], np.cumsum(tripled)))
+    index = np.arange(MINUTES_PER_DAY) + MINUTES_PER_DAY
+    low = np.maximum(index - minutes + 1, 0)
+    high = index + minutes
+    return (cumulative[high] - cumulative[low]) > 0
+
+
+def find_overlaps(schedules, runtimes, today) -> list:
+    """Returns the findings of the schedules that start during a run of another one of their job.
+
+    Args:
+        schedules (list[dict]): The schedules, without the ones that never fire
+            or duplicate another one.
+        runtimes (dict): The expected runtime in minutes of every job id.
+        today (date): The first day checked.
+    """
+
+    by_job = {}
+    for schedule in schedules:
+        by_job.setdefault(schedule["job_id"], []).append(schedule)
+    candidates = [group for group in by_job.values() if len(group) > 1]
+    if not candidates:
+        return []
+
+    days = np.datetime64(today, "D") + np.arange(OVERLAP_DAYS)
+    day_years = day_fields(days)[0]
+    day_patterns, day_inverse = intern(
+        [
+            tuple(
+                schedule[name]
+                for name in ("year", "month", "day_of_month", "day_of_week")
+            )
+            for group in candidates
+            for schedule in group
+        ]
+    )
+    masks = day_masks([pattern[1:] for pattern in day_patterns], days)
+    masks &= field_table([pattern[0] for pattern in day_patterns], "year", day_years)
+    packed = np.packbits(masks, axis=1)
+
+    now = int(timezone.now().timestamp())
+    offsets = {}
+
+    findings = []
+    position = 0
+    for group in candidates:
+        runtime = runtimes.get(group[0]["job_id"], 1)
+        patterns = day_inverse[position : position + len(group)]
+        position += len(group)
+
+        times = []
+        for schedule in group:
+            zone = schedule["time_zone"]
+            if zone not in offsets:
+                offsets[zone] = int(transition_table(zone).to_local(now) - now) // 60
+            times.append(time_mask(schedule, offsets[zone]))
+
+        for later in range(1, len(group)):
+            for earlier in range(later):
+                same_days = np.bitwise_and(
+                    packed[patterns[earlier]], packed[patterns[later]]
+                ).any()
+                if same_days and (widen(times[earlier], runtime) & times[later]).any():
+                    schedule = group[later]
+                    findings.append(
+                        Finding(
+                            OVERLAP,
+                            schedule["id"],
+                            schedule["job__name"],
+                            f"Empieza a menos de {runtime} minutos del horario "
+                            f"{group[earlier]['id']}.",
+                        )
+                    )
+                    break
+
+    return findings
+
+
+def expected_runtimes(schedules) -> dict:
+    """Returns the expected runtime of the jobs of the schedules, in whole minutes.
+
+    It is the duration p95 of the latest metrics snapshot of the job, or
+    LINT_DEFAULT_RUNTIME_MINUTES if it has none.
+    """
+
+    default = settings.LINT_DEFAULT_RUNTIME_MINUTES
+    return {
+        schedule["job_id"]: (
+            max(1, math.ceil(schedule["duration_p95"] / 60))
+            if schedule["duration_p95"] is not None
+            else default
+        )
+        for schedule in schedules
+    }
+
+
+def lint_schedules(queryset=None, today=None) -> list:
+    """Checks every schedule of a queryset, all of them by default.
+
+    Returns:
+        list[Finding]: The problems found, by kind.
+    """
+
+    today = today or date.today()
+    queryset = queryset if queryset is not None else JobSchedule.objects.all()
+    schedules = list(
+        queryset.annotate(duration_p95=latest_snapshot("duration_p95", "job_id"))
+        .order_by("job_id", "id")
+        .values("id", "job_id", "job__name", "time_zone", "duration_p95", *FIELD_NAMES)
+    )
+
+    never_firing = find_never_firing(schedules, today)
+    duplicates = find_duplicates(schedules)
+    flagged = {finding.schedule_id for finding in never_firing + duplicates}
+    overlaps = find_overlaps(
+        [schedule for schedule in schedules if schedule["id"] not in flagged],
+        expected_runtimes(schedules),
+        today,
+    )
+
+    return never_firing + duplicates + overlaps
@@ -0,0 +1,268 @@
+"""Synthetic populations and replayed traffic to measure the app at production scale.
+
+generate_population() creates jobs and schedules shaped like the production
+ones: a few owners have most of the jobs (Zipf weights), most jobs have a
+single schedule and most schedules fire at the top of the hour, many of them
+in the morning. The rows are written with bulk inserts in batches and are not
+recorded as ChangeRecords.
+
+replay() sends a mix of admin and API requests through the test client at a
+target rate and measures the latency and the queries of every request.
+"""
+
+import random
+import time
+from typing import NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cron.ics import calendar_url
+from cron.metrics import PERCENTILES, RingBuffer
+from cron.models import Job, JobSchedule
+
+# Names of the generated jobs start with this prefix, so they can be removed.
+PREFIX = "loadtest-"
+
+# Sizes of the populations used to compare changes.
+POPULATION_SIZES = (10_000, 100_000, 1_000_000)
+
+# Expressions (minute, hour, day_of_month, day_of_week) and their weights,
+# "{hour}" is replaced by a random hour. Only a few fire off the hour.
+EXPRESSIONS = (
+    (("0", "{hour}", "*", "*"), 40),
+    (("0", "*", "*", "*"), 15),
+    (("0", "{hour}", "*", "1,2,3,4,5"), 15),
+    (("30", "{hour}", "*", "*"), 8),
+    (("0,15,30,45", "*", "*", "*"), 6),
+    (("0", "{hour}", "1", "*"), 6),
+    (("{minute}", "{hour}", "*", "*"), 8),
+    (("*", "*", "*", "*"), 2),
+)
+
+# Weights of the hours of the day, most jobs run early in the morning.
+HOUR_WEIGHTS = [1] * 5 + [6, 8, 10, 6, 4] + [2] * 14
+
+SCHEDULES_PER_JOB = ((1, 60), (2, 25), (3, 10), (4, 5))
+
+
+def zipf_weights(count, exponent=1.1) -> list:
+    """Returns the weights of count ranks that follow a Zipf distribution."""
+
+    return [1 / rank**exponent for rank in range(1, count + 1)]
+
+
+def random_schedules(rng, job) -> list:
+    """Returns the schedules of a generated job, without duplicate expressions."""
+
+    time_zones = (settings.TIME_ZONE, "UTC", "America/New_York", "Europe/Madrid")
+    expressions, weights = zip(*EXPRESSIONS)
+    count = rng.choices(*zip(*SCHEDULES_PER_JOB))[0]
+
+    schedules = {}
+    for template in rng.choices(expressions, weights, k=count):
+        minute, hour, day_of_month, day_of_week = (
+            value.format(
+                minute=rng.randrange(60),
+                hour=rng.choices(range(24), HOUR_WEIGHTS)[0],
+            )
+            for value in template
+        )
+        schedule = JobSchedule(
+            job=job,
+            minute=minute,
+            hour=hour,
+            day_of_month=day_of_month,
+            day_of_week=day_of_week,
+            time_zone=rng.choices(time_zones, (70, 20, 5, 5))[0],
+            enabled=rng.random() >= 0.03,
+        )
+        schedule.normalize_fields()
+        schedules.setdefault(schedule.expression_hash, schedule)
+
+    return list(schedules.values())
+
+
+def generate_population(jobs, owners=200, seed=None, batch_size=5000) -> tuple:
+    """Creates jobs and their schedules with bulk inserts.
+
+    The generated jobs are numbered after the ones already generated, so a
+    population can be grown.
+
+    Args:
+        jobs (int): Number of jobs created.
+        owners (int): Number of distinct owners.
+        seed (int): Seed of the random generator, to repeat a population.
+        batch_size (int): Jobs inserted by each transaction.
+
+    Returns:
+        tuple[int, int]: The number of jobs and schedules created.
+    """
+
+    rng = random.Random(seed)
+    owner_names = [f"{PREFIX}owner-{rank:04d}" for rank in range(1, owners + 1)]
+    owner_weights = zipf_weights(owners)
+    first = Job.objects.filter(name__startswith=PREFIX).count()
+
+    created_schedules = 0
+    for start in range(first, first + jobs, batch_size):
+        stop = min(start + batch_size, first + jobs)
+        new_jobs = [
+            Job(
+                name=f"{PREFIX}{index:07d}",
+                owner=rng.choices(owner_names, owner_weights)[0],
+                script=f"{PREFIX}{index:07d}.py",
+                enabled=rng.random() >= 0.05,
+            )
+            for index in range(start, stop)
+        ]
+        schedules = [
+            schedule for job in new_jobs for schedule in random_schedules(rng, job)
+        ]
+
+        with transaction.atomic():
+            Job.objects.bulk_create(new_jobs, batch_size=batch_size)
+            JobSchedule.objects.bulk_create(schedules, batch_size=batch_size)
+        created_schedules += len(schedules)
+
+    return jobs, created_schedules
+
+
+def delete_population() -> int:
+    """Deletes the generated jobs and, by cascade, their schedules and runs."""
+
+    deleted, _ = Job.objects.filter(name__startswith=PREFIX).delete()
+    return deleted
+
+
+class Target(NamedTuple):
+    """A kind of request of the replayed traffic."""
+
+    label: str
+    weight: int
+    admin: bool
+    url: object  # Callable (rng, sample) -> str.
+
+
+TARGETS = (
+    Target(
+        "admin job list",
+        20,
+        True,
+        lambda rng, sample: reverse("admin:cron_job_changelist"),
+    ),
+    Target(
+        "admin job search",
+        10,
+        True,
+        lambda rng, sample: reverse("admin:cron_job_changelist")
+        + f"?q={rng.choice(sample['owners'])}",
+    ),
+    Target(
+        "admin job change",
+        15,
+        True,
+        lambda rng, sample: reverse(
+            "admin:cron_job_change", args=[rng.choice(sample["jobs"])]
+        ),
+    ),
+    Target(
+        "admin schedule list",
+        15,
+        True,
+        lambda rng, sample: reverse("admin:cron_jobschedule_changelist")
+        + "?enabled__exact=1",
+    ),
+    Target(
+        "admin run list",
+        10,
+        True,
+        lambda rng, sample: reverse("admin:cron_jobrun_changelist"),
+    ),
+    Target(
+        "owner calendar",
+        15,
+        False,
+        lambda rng, sample: calendar_url(rng.choice(sample["owners"])),
+    ),
+    Target("metrics", 15, True, lambda rng, sample: reverse("cron:metrics")),
+)
+
+
+class TargetStats:
+    """Latencies and query counts of the requests of a target."""
+
+    def __init__(self, size):
+        self.latencies = RingBuffer(size)
+        self.queries = RingBuffer(size)
+        self.errors = 0
+
+    def report(self) -> dict:
+        latencies = self.latencies.percentiles()
+        queries = self.queries.values()
+        return {
+            "requests": self.latencies.count,
+            "errors": self.errors,
+            **{f"p{percent}_ms": latencies[percent] for percent in PERCENTILES},
+            "queries_mean": sum(queries) / len(queries) if queries else 0,
+            "queries_max": max(queries, default=0),
+        }
+
+
+def replay(client, requests, rate, admin=True, seed=None) -> dict:
+    """Sends requests through the test client at a target rate.
+
+    The requests are scheduled at fixed intervals, so a slow response delays
+    the next ones instead of lowering the load, as it would with real clients.
+    Streamed responses are read completely inside the measurement.
+
+    Args:
+        client (Client): The client, logged in as a staff user if admin is True.
+        requests (int): Number of requests sent.
+        rate (float): Requests per second.
+        admin (bool): Whether to include the admin pages in the traffic.
+        seed (int): Seed of the random generator, to repeat the traffic.
+
+    Returns:
+        dict: The stats of every target by label, see TargetStats.report, and
+            the achieved rate under "rate".
+    """
+
+    rng = random.Random(seed)
+    jobs = Job.objects.order_by().values_list("pk", "owner")[:1000]
+    sample = {
+        "jobs": [str(pk) for pk, _ in jobs] or [""],
+        "owners": sorted({owner for _, owner in jobs}) or [""],
+    }
+    targets = [target for target in TARGETS if admin or not target.admin]
+    weights = [target.weight for target in targets]
+    stats = {target.label: TargetStats(requests) for target in targets}
+
+    started = time.perf_counter()
+    for index in range(requests):
+        delay = started + index / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+        target = rng.choices(targets, weights)[0]
+        url = target.url(rng, sample)
+        request_started = time.perf_counter()
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        elapsed_ms = (time.perf_counter() - request_started) * 1000
+
+        target_stats = stats[target.label]
+        target_stats.latencies.append(elapsed_ms)
+        target_stats.queries.append(len(queries))
+        if response.status_code >= 400:
+            target_stats.errors += 1
+
+    elapsed = time.perf_counter() - started
+    return {
+        "rate": requests / elapsed if elapsed else 0,
+        **{label: target_stats.report() for label, target_stats in stats.items()},
+    }
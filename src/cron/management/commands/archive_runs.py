@@ -0,0 +1,50 @@
+from datetime import date, datetime, time, timedelta, timezone
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cron.archive import archive_directory, archive_runs
+
+
+def parse_date(value) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value}, the format is YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves the finished runs scheduled before a date out of the database "
+        "into compressed columnar files, one per month, see cron.archive."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--before",
+            type=parse_date,
+            help=(
+                "Archive the runs scheduled before this UTC day (YYYY-MM-DD). "
+                "Defaults to RUN_ARCHIVE_DAYS days ago."
+            ),
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the runs that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        before = options["before"] or date.today() - timedelta(
+            days=settings.RUN_ARCHIVE_DAYS
+        )
+        cutoff = datetime.combine(before, time(), tzinfo=timezone.utc)
+
+        archived = archive_runs(cutoff, dry_run=options["dry_run"])
+
+        verb = "would be archived" if options["dry_run"] else "archived"
+        for name, count in archived.items():
+            self.stdout.write(f"  {count:>10} {name}")
+        self.stdout.write(
+            f"{sum(archived.values())} runs before {before} {verb} in {archive_directory()}"
+        )
@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cron.loadtest import POPULATION_SIZES, delete_population, generate_population
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates a synthetic population of jobs and schedules shaped like the "
+        "production ones, to measure the app at scale. Do not run it against "
+        "the production database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--jobs",
+            type=int,
+            default=POPULATION_SIZES[0],
+            help=(
+                "Number of jobs created, each with one to four schedules. The "
+                "reference sizes are "
+                + ", ".join(str(size) for size in POPULATION_SIZES)
+                + "."
+            ),
+        )
+        parser.add_argument(
+            "--owners",
+            type=int,
+            default=200,
+            help="Number of owners, the jobs are assigned with Zipf weights.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed of the random generator, to repeat a population.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Jobs inserted by each transaction.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete the previously generated jobs first.",
+        )
+
+    def handle(self, *args, **options):
+        if options["jobs"] < 1 or options["owners"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--jobs, --owners and --batch-size must be positive")
+
+        if options["clear"]:
+            self.stdout.write(f"{delete_population()} generated rows deleted")
+
+        started = time.perf_counter()
+        jobs, schedules = generate_population(
+            options["jobs"],
+            owners=options["owners"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            f"{jobs} jobs and {schedules} schedules created in {elapsed:.1f}s"
+        )
@@ -0,0 +1,122 @@
+import os
+import subprocess
+import sys
+from typing import NamedTuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class ImportTime(NamedTuple):
+    """A line of the -X importtime output, with the times in microseconds."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(output) -> list:
+    """Parses the lines written by ``python -X importtime`` to stderr.
+
+    Args:
+        output (str): The stderr of the process.
+
+    Returns:
+        list[ImportTime]: The imported modules, in the order they finished.
+    """
+
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue  # Header line.
+
+        name = module.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append(
+            ImportTime(name.strip(), int(self_us), int(cumulative_us), depth)
+        )
+
+    return imports
+
+
+def measure_imports(settings_module, modules) -> list:
+    """Measures the imports of django.setup() and modules with a settings module.
+
+    Runs in a new interpreter, so nothing imported by this process is reused.
+    """
+
+    code = "\n".join(
+        ["import django", "django.setup()", *(f"import {module}" for module in modules)]
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "DJANGO_SETTINGS_MODULE": settings_module},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        raise CommandError(
+            f"Could not set up {settings_module}: {result.stderr.strip().splitlines()[-1]}"
+        )
+
+    return parse_importtime(result.stderr)
+
+
+class Command(BaseCommand):
+    help = (
+        "Reports the time spent importing modules when a process starts with "
+        "each settings module, measured with python -X importtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            action="append",
+            dest="profiles",
+            help=(
+                "Settings module to measure, can be repeated. Defaults to "
+                "scheduler.settings_worker and scheduler.settings."
+            ),
+        )
+        parser.add_argument(
+            "--module",
+            action="append",
+            dest="modules",
+            help="Module imported after django.setup(), can be repeated. Defaults to cron.runner.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=15,
+            help="Number of slowest imports listed for each settings module.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = options["profiles"] or [
+            "scheduler.settings_worker",
+            "scheduler.settings",
+        ]
+        modules = options["modules"] or ["cron.runner"]
+
+        for profile in profiles:
+            imports = measure_imports(profile, modules)
+            total_ms = sum(item.self_us for item in imports) / 1000
+
+            self.stdout.write(
+                f"{profile}: {len(imports)} modules imported in {total_ms:.1f} ms"
+            )
+            top_level = sorted(
+                (item for item in imports if item.depth == 0),
+                key=lambda item: -item.cumulative_us,
+            )
+            for item in top_level[: options["top"]]:
+                self.stdout.write(
+                    f"  {item.cumulative_us / 1000:>8.1f} ms {item.module}"
+                )
+            self.stdout.write("")
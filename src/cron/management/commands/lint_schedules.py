@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from cron.lint import DUPLICATE, NEVER_FIRES, OVERLAP, lint_schedules
+
+TITLES = {
+    NEVER_FIRES: "Schedules that never fire",
+    DUPLICATE: "Schedules that duplicate another one of their job",
+    OVERLAP: "Schedules that overlap another one of their job",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Checks every schedule for dates that never come, duplicates and "
+        "overlaps within the expected runtime of its job."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail",
+            action="store_true",
+            help="Exit with an error if any problem is found.",
+        )
+
+    def handle(self, *args, **options):
+        findings = lint_schedules()
+
+        for kind, title in TITLES.items():
+            kind_findings = [finding for finding in findings if finding.kind == kind]
+            self.stdout.write(f"{title}: {len(kind_findings)}")
+            for finding in kind_findings:
+                self.stdout.write(
+                    f"  {finding.schedule_id} {finding.job_name}: {finding.message}"
+                )
+
+        if findings and options["fail"]:
+            raise CommandError(f"{len(findings)} problems found in the schedules")
@@ -0,0 +1,83 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from cron.loadtest import replay
+from cron.metrics import PERCENTILES
+
+
+class Command(BaseCommand):
+    help = (
+        "Replays admin and API traffic through the test client at a target rate "
+        "and reports the latency percentiles and the queries of every kind of "
+        "request. Use generate_jobs first to load a population."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Number of requests sent.",
+        )
+        parser.add_argument(
+            "--rate",
+            type=float,
+            default=20,
+            help="Target requests per second.",
+        )
+        parser.add_argument(
+            "--username",
+            help="Staff user the admin pages are requested as. Without it only the API is requested.",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed of the random generator, to repeat the traffic.",
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["rate"] <= 0:
+            raise CommandError("--requests and --rate must be positive")
+
+        client = Client()
+        if options["username"]:
+            user_model = get_user_model()
+            try:
+                user = user_model.objects.get(
+                    **{user_model.USERNAME_FIELD: options["username"]}
+                )
+            except user_model.DoesNotExist:
+                raise CommandError(f"Unknown user {options['username']}")
+            client.force_login(user)
+
+        # Allows the host of the test client and keeps the settings as in the tests.
+        setup_test_environment()
+        try:
+            report = replay(
+                client,
+                options["requests"],
+                options["rate"],
+                admin=bool(options["username"]),
+                seed=options["seed"],
+            )
+        finally:
+            teardown_test_environment()
+
+        self.stdout.write(
+            f"{options['requests']} requests at {report.pop('rate'):.1f} req/s "
+            f"(target {options['rate']:g})"
+        )
+        columns = "".join(f"{f'p{percent} ms':>10}" for percent in PERCENTILES)
+        self.stdout.write(
+            f"{'request':<22}{'count':>7}{'errors':>7}{columns}{'queries':>9}{'max':>5}"
+        )
+        for label, stats in report.items():
+            values = "".join(
+                f"{stats[f'p{percent}_ms'] or 0:>10.1f}" for percent in PERCENTILES
+            )
+            self.stdout.write(
+                f"{label:<22}{stats['requests']:>7}{stats['errors']:>7}{values}"
+                f"{stats['queries_mean']:>9.1f}{stats['queries_max']:>5.0f}"
+            )
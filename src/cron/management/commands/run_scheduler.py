@@ -0,0 +1,88 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cron.coordination import COORDINATION_LEADER, COORDINATION_MODES
+from cron.executors import EXECUTORS
+from cron.runner import Runner, default_worker_name
+from cron.sharding import HashRing
+
+
+class Command(BaseCommand):
+    help = "Executes the jobs according to their schedules."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--worker-name",
+            help="Name of this runner. Defaults to <hostname>:<pid>.",
+        )
+        parser.add_argument(
+            "--coordination",
+            choices=COORDINATION_MODES,
+            default=settings.RUNNER_COORDINATION,
+            help="How this runner coordinates with the other runners.",
+        )
+        parser.add_argument(
+            "--max-workers",
+            type=int,
+            default=settings.RUNNER_MAX_WORKERS,
+            help="Maximum number of scripts executed at the same time.",
+        )
+        parser.add_argument(
+            "--executor",
+            choices=EXECUTORS,
+            default=settings.RUNNER_EXECUTOR,
+            help=(
+                "How the scripts are executed: a new interpreter per execution or "
+                "a fork of a warm server that preloads RUNNER_PRELOAD_MODULES."
+            ),
+        )
+        parser.add_argument(
+            "--shared-limits",
+            action="store_true",
+            default=settings.RUNNER_SHARED_LIMITS,
+            help="Apply max_instances and the owner rate limits to all the runners together.",
+        )
+        parser.add_argument(
+            "--workers",
+            help=(
+                "Comma separated names of every runner sharing the jobs. Each "
+                "runner only loads the jobs that the hash ring of the live ones "
+                "assigns to it."
+            ),
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Dispatch the current minute and exit.",
+        )
+
+    def handle(self, *args, **options):
+        worker_name = options["worker_name"] or default_worker_name()
+        ring = None
+
+        if options["workers"]:
+            # Only the leader ticks, so the shards of the others would never fire.
+            if options["coordination"] == COORDINATION_LEADER:
+                raise CommandError(
+                    "--workers cannot be used with the leader coordination"
+                )
+            workers = [name.strip() for name in options["workers"].split(",")]
+            if worker_name not in workers:
+                raise CommandError(f"{worker_name} is not one of the --workers")
+            ring = HashRing(workers)
+
+        runner = Runner(
+            worker_name=worker_name,
+            coordination=options["coordination"],
+            max_workers=options["max_workers"],
+            ring=ring,
+            executor=options["executor"],
+            shared_limits=options["shared_limits"],
+        )
+
+        if options["once"]:
+            runs = runner.run_once()
+            self.stdout.write(f"{len(runs)} runs dispatched by {runner.worker_name}")
+            return
+
+        runner.run_forever()
@@ -0,0 +1,137 @@
+import json
+import time
+from datetime import date, timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cron.models import JobSchedule
+from cron.schedules import FIELD_NAMES
+from cron.simulation import simulate
+
+
+def parse_date(value) -> date:
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise CommandError(f"Invalid date {value}, the format is YYYY-MM-DD")
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulates every execution of the job schedules between two dates and "
+        "reports the executions per job and per hour, the peak concurrency and "
+        "the schedules that never fire."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="start",
+            type=parse_date,
+            default=date.today(),
+            help="First simulated day (YYYY-MM-DD). Defaults to today.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="end",
+            type=parse_date,
+            help="Day after the last simulated day (YYYY-MM-DD). Defaults to a year after --from.",
+        )
+        parser.add_argument(
+            "--time-zone",
+            default=settings.TIME_ZONE,
+            help="Time zone of the dates and of the report. Each schedule fires in its own time zone.",
+        )
+        parser.add_argument(
+            "--duration",
+            type=int,
+            default=1,
+            help="Minutes every execution is assumed to last for the concurrency.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of jobs and hours listed in the report.",
+        )
+        parser.add_argument(
+            "--output",
+            help="Path of a JSON file where the full counts per job and per hour are written.",
+        )
+
+    def handle(self, *args, **options):
+        start = options["start"]
+        end = options["end"] or start + timedelta(days=365)
+        if end <= start:
+            raise CommandError("--to must be after --from")
+
+        started = time.perf_counter()
+        schedules = list(
+            JobSchedule.objects.active()
+            .values("id", "job__name", "time_zone", *FIELD_NAMES)
+            .order_by()
+        )
+        result = simulate(schedules, start, end, options["time_zone"])
+        elapsed = time.perf_counter() - started
+
+        per_job = {}
+        for schedule, count in zip(schedules, result.counts):
+            per_job[schedule["job__name"]] = per_job.get(
+                schedule["job__name"], 0
+            ) + int(count)
+
+        hours, per_hour = result.per_hour()
+        concurrency = result.concurrency(options["duration"])
+        peak = int(concurrency.argmax()) if len(concurrency) else 0
+
+        self.stdout.write(
+            f"{len(schedules)} schedules simulated from {start} to {end} "
+            f"in {elapsed:.2f}s: {result.total} executions"
+        )
+        self.stdout.write(
+            f"Peak concurrency: {int(concurrency[peak])} at {result.minute_at(peak)}"
+        )
+
+        self.stdout.write("\nJobs with more executions:")
+        for name, count in sorted(per_job.items(), key=lambda item: -item[1])[
+            : options["top"]
+        ]:
+            self.stdout.write(f"  {count:>10} {name}")
+
+        self.stdout.write("\nHours with more executions:")
+        for index in np.argsort(-per_hour, kind="stable")[: options["top"]]:
+            self.stdout.write(f"  {int(per_hour[index]):>10} {hours[index]}:00")
+
+        never_firing = set(result.never_firing())
+        self.stdout.write(f"\nSchedules that never fire: {len(never_firing)}")
+        for schedule in schedules:
+            if schedule["id"] in never_firing:
+                fields = " ".join(schedule[name] for name in FIELD_NAMES)
+                self.stdout.write(
+                    f"  {schedule['id']} {schedule['job__name']} ({fields})"
+                )
+
+        if options["output"]:
+            with open(options["output"], "w") as output:
+                json.dump(
+                    {
+                        "from": str(start),
+                        "to": str(end),
+                        "total": result.total,
+                        "peak_concurrency": int(concurrency[peak]),
+                        "peak_at": str(result.minute_at(peak)),
+                        "per_job": per_job,
+                        "per_hour": {
+                            str(hour): int(count)
+                            for hour, count in zip(hours, per_hour)
+                            if count
+                        },
+                        "never_firing": [
+                            str(schedule_id) for schedule_id in never_firing
+                        ],
+                    },
+                    output,
+                    indent=2,
+                )
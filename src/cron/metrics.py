@@ -0,0 +1,185 @@
+"""Timing metrics of the runs dispatched by a runner.
+
+Every run measures three durations, in seconds:
+
+* drift: when it started minus when it was scheduled.
+* wait: how long it waited in the pool for a free worker.
+* duration: how long the script ran.
+
+The samples of every job are kept in fixed size ring buffers backed by
+array.array, so a sample is a float written in place instead of an object,
+and the memory of a runner does not grow with the number of runs. Only the
+percentiles are stored in the database, as a JobMetricsSnapshot per job every
+METRICS_FLUSH_SECONDS. The snapshots older than METRICS_RETENTION_DAYS of the
+jobs flushed are deleted by the same flush.
+
+The percentiles of a snapshot only describe the runs of the runner that took
+it. Percentiles cannot be merged without the samples, and with the claim
+coordination the runs of a job are spread across the runners, so the admin
+and metrics.json show the latest snapshot of every job along with its runner,
+not the percentiles of every run of the job.
+"""
+
+import math
+import threading
+import time
+from array import array
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from cron.models import Job, JobMetricsSnapshot
+
+METRICS = ("drift", "wait", "duration")
+PERCENTILES = (50, 95, 99)
+
+
+def latest_snapshot(field="pk", job_ref="pk") -> Subquery:
+    """Subquery of a field of the latest snapshot of the job referenced by job_ref.
+
+    The snapshot was taken by a single runner, see the "worker" field.
+    """
+
+    return Subquery(
+        JobMetricsSnapshot.objects.filter(job=OuterRef(job_ref))
+        .order_by("-taken_at")
+        .values(field)[:1]
+    )
+
+
+def latest_snapshots():
+    """Returns the latest snapshot of every job that has one, with its job.
+
+    Each one holds the percentiles of the runs of the runner that took it.
+    """
+
+    latest = Job.objects.annotate(snapshot_id=latest_snapshot()).values("snapshot_id")
+    return JobMetricsSnapshot.objects.filter(pk__in=latest).select_related("job")
+
+
+class RingBuffer:
+    """The last size samples of a metric.
+
+    Args:
+        size (int): The number of samples kept.
+    """
+
+    __slots__ = ("samples", "size", "count")
+
+    def __init__(self, size):
+        self.samples = array("d", bytes(8 * size))
+        self.size = size
+        self.count = 0
+
+    def append(self, value):
+        self.samples[self.count % self.size] = value
+        self.count += 1
+
+    def values(self) -> array:
+        """Returns the samples kept, in no particular order."""
+
+        return self.samples[: min(self.count, self.size)]
+
+    def percentiles(self, percents=PERCENTILES) -> dict:
+        """Returns the nearest-rank percentiles of the samples kept, None if empty."""
+
+        values = sorted(self.values())
+        if not values:
+            return {percent: None for percent in percents}
+
+        return {
+            percent: values[max(math.ceil(percent / 100 * len(values)) - 1, 0)]
+            for percent in percents
+        }
+
+
+class MetricsRegistry:
+    """Ring buffers of the metrics of every job, shared by the pool threads.
+
+    Args:
+        size (int): Samples kept per job and metric, METRICS_BUFFER_SIZE by default.
+        flush_seconds (int): Seconds between snapshots, METRICS_FLUSH_SECONDS by default.
+        retention_days (int): Days the snapshots are kept, METRICS_RETENTION_DAYS
+            by default.
+    """
+
+    def __init__(self, size=None, flush_seconds=None, retention_days=None):
+        self.size = size or settings.METRICS_BUFFER_SIZE
+        self.flush_seconds = flush_seconds or settings.METRICS_FLUSH_SECONDS
+        self.retention_days = retention_days or settings.METRICS_RETENTION_DAYS
+        self.lock = threading.Lock()
+        self.buffers = {}
+        self.pending = set()
+        self.flushed_at = time.monotonic()
+
+    def observe(self, job_id, **samples):
+        """Adds samples of a job, given as metric=seconds keyword arguments."""
+
+        with self.lock:
+            buffers = self.buffers.get(job_id)
+            if buffers is None:
+                buffers = self.buffers[job_id] = {
+                    metric: RingBuffer(self.size) for metric in METRICS
+                }
+            for metric, value in samples.items():
+                buffers[metric].append(value)
+            self.pending.add(job_id)
+
+    def summary(self, job_id) -> dict:
+        """Returns the count and percentiles of every metric of a job."""
+
+        with self.lock:
+            buffers = self.buffers.get(job_id, {})
+            return {
+                metric: {
+                    "count": buffer.count,
+                    **{f"p{p}": v for p, v in buffer.percentiles().items()},
+                }
+                for metric, buffer in buffers.items()
+            }
+
+    def flush(self, worker, now=None) -> list:
+        """Stores a snapshot of the jobs with new samples since the last flush.
+
+        The expired snapshots of those jobs are deleted through the index of
+        the job and date, never the one just taken.
+        """
+
+        with self.lock:
+            job_ids, self.pending = self.pending, set()
+            self.flushed_at = time.monotonic()
+
+        taken_at = now or timezone.now()
+        snapshots = []
+        for job_id in job_ids:
+            summary = self.summary(job_id)
+            snapshot = JobMetricsSnapshot(
+                job_id=job_id,
+                worker=worker,
+                taken_at=taken_at,
+                samples=summary["duration"]["count"],
+            )
+            for metric in METRICS:
+                for percent in PERCENTILES:
+                    value = summary[metric][f"p{percent}"]
+                    setattr(snapshot, f"{metric}_p{percent}", value)
+            snapshots.append(snapshot)
+
+        snapshots = JobMetricsSnapshot.objects.bulk_create(snapshots)
+        if job_ids:
+            JobMetricsSnapshot.objects.filter(
+                job_id__in=job_ids,
+                taken_at__lt=taken_at - timedelta(days=self.retention_days),
+            ).delete()
+
+        return snapshots
+
+    def flush_if_due(self, worker) -> list:
+        """Flushes if METRICS_FLUSH_SECONDS have passed since the last flush."""
+
+        if time.monotonic() - self.flushed_at < self.flush_seconds:
+            return []
+
+        return self.flush(worker)
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cron', '0005_alter_job_name_alter_job_script'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modificado'),
+        ),
+        migrations.AddField(
+            model_name='jobschedule',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Modificado'),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0006_job_updated_at_jobschedule_updated_at"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobRun",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("scheduled_for", models.DateTimeField(verbose_name="Programada para")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "En ejecución"),
+                            ("succeeded", "Exitosa"),
+                            ("failed", "Fallida"),
+                        ],
+                        default="running",
+                        max_length=20,
+                        verbose_name="Estado",
+                    ),
+                ),
+                ("worker", models.CharField(max_length=255, verbose_name="Worker")),
+                (
+                    "started_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Inicio"),
+                ),
+                (
+                    "finished_at",
+                    models.DateTimeField(blank=True, null=True, verbose_name="Fin"),
+                ),
+                (
+                    "exit_code",
+                    models.IntegerField(
+                        blank=True, null=True, verbose_name="Código de salida"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="runs",
+                        to="cron.job",
+                    ),
+                ),
+                (
+                    "schedule",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="runs",
+                        to="cron.jobschedule",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ejecución de Job",
+                "verbose_name_plural": "Ejecuciones de Jobs",
+                "ordering": ["-scheduled_for"],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="jobrun",
+            constraint=models.UniqueConstraint(
+                fields=("schedule", "scheduled_for"),
+                name="unique_run_per_schedule_occurrence",
+            ),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0007_jobrun"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobschedule",
+            name="time_zone",
+            field=models.CharField(
+                default="America/Bogota",
+                help_text="Zona horaria IANA de los campos anteriores, por ejemplo America/New_York. Las horas que no existen por el cambio de horario se ejecutan al terminar el salto y las horas repetidas solo la primera vez.",
+                max_length=64,
+                verbose_name="Zona horaria",
+            ),
+        ),
+    ]
@@ -0,0 +1,80 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0008_jobschedule_time_zone"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobrun",
+            name="triggered_by",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="triggered_runs",
+                to="cron.jobrun",
+                verbose_name="Disparada por",
+            ),
+        ),
+        migrations.CreateModel(
+            name="JobDependency",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "downstream",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="upstream_dependencies",
+                        to="cron.job",
+                        verbose_name="Job dependiente",
+                    ),
+                ),
+                (
+                    "upstream",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="downstream_dependencies",
+                        to="cron.job",
+                        verbose_name="Job previo",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Dependencia de Job",
+                "verbose_name_plural": "Dependencias de Jobs",
+            },
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="depends_on",
+            field=models.ManyToManyField(
+                blank=True,
+                related_name="dependents",
+                through="cron.JobDependency",
+                to="cron.job",
+                verbose_name="Depende de",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="jobdependency",
+            constraint=models.UniqueConstraint(
+                fields=("upstream", "downstream"), name="unique_job_dependency"
+            ),
+        ),
+    ]
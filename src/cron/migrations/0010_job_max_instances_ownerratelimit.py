@@ -0,0 +1,96 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:41
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0009_jobdependency"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OwnerRateLimit",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "owner",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Responsable"
+                    ),
+                ),
+                (
+                    "rate",
+                    models.FloatField(
+                        help_text="Ejecuciones por minuto que recupera el responsable.",
+                        verbose_name="Ejecuciones por minuto",
+                    ),
+                ),
+                (
+                    "burst",
+                    models.PositiveIntegerField(
+                        help_text="Ejecuciones que el responsable puede iniciar de una vez.",
+                        verbose_name="Ráfaga",
+                    ),
+                ),
+                (
+                    "tokens",
+                    models.FloatField(
+                        default=0, editable=False, verbose_name="Disponibles"
+                    ),
+                ),
+                (
+                    "refilled_at",
+                    models.DateTimeField(
+                        blank=True, editable=False, null=True, verbose_name="Recargado"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Límite de Responsable",
+                "verbose_name_plural": "Límites de Responsables",
+                "ordering": ["owner"],
+            },
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="max_instances",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Cantidad de ejecuciones de este Job que pueden estar en curso al mismo tiempo.",
+                verbose_name="Máximo de ejecuciones simultáneas",
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="running_instances",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Ejecuciones en curso"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "En ejecución"),
+                    ("succeeded", "Exitosa"),
+                    ("failed", "Fallida"),
+                    ("skipped", "Omitida"),
+                ],
+                default="running",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+    ]
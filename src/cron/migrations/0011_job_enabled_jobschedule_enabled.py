@@ -0,0 +1,31 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0010_job_max_instances_ownerratelimit"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="enabled",
+            field=models.BooleanField(
+                default=True,
+                help_text="Los Jobs inactivos no se ejecutan, aunque conservan sus horarios.",
+                verbose_name="Activo",
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobschedule",
+            name="enabled",
+            field=models.BooleanField(
+                default=True,
+                help_text="Los horarios inactivos no se ejecutan.",
+                verbose_name="Activo",
+            ),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0011_job_enabled_jobschedule_enabled"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="paused_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Si se indica, el Job no se ejecuta hasta esta fecha.",
+                null=True,
+                verbose_name="Pausado hasta",
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobschedule",
+            name="paused_until",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Si se indica, el horario no se ejecuta hasta esta fecha.",
+                null=True,
+                verbose_name="Pausado hasta",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                condition=models.Q(("enabled", True)),
+                fields=["owner", "paused_until"],
+                name="job_active_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobschedule",
+            index=models.Index(
+                condition=models.Q(("enabled", True)),
+                fields=["job", "paused_until"],
+                name="jobschedule_active_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,110 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:46
+
+import hashlib
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+# Frozen copies of cron.schedules as of this migration, so later changes to the
+# canonical form do not change what it does.
+FIELD_RANGES = {
+    "minute": (0, 59),
+    "hour": (0, 23),
+    "day_of_month": (1, 31),
+    "month": (1, 12),
+    "day_of_week": (1, 7),
+    "year": (0, 9999),
+}
+
+FIELD_NAMES = tuple(FIELD_RANGES)
+
+
+def normalize_field(field_value, field_name):
+    if field_value.strip() == "*":
+        return "*"
+
+    values = sorted({int(value) for value in field_value.split(",") if value})
+    min_value, max_value = FIELD_RANGES[field_name]
+    if len(values) == max_value - min_value + 1:
+        return "*"
+
+    return ",".join(str(value) for value in values)
+
+
+def expression_hash(fields, time_zone):
+    expression = " ".join([*(fields[name] for name in FIELD_NAMES), time_zone])
+    return hashlib.sha1(expression.encode()).hexdigest()
+
+
+def normalize_schedules(apps, schema_editor):
+    """Normalizes the stored schedules.
+
+    Nothing is deleted: if a job has equivalent schedules, the migration fails
+    listing them, so they are reviewed and removed by hand before migrating
+    again.
+    """
+
+    JobSchedule = apps.get_model("cron", "JobSchedule")
+
+    groups = {}
+    normalized = []
+
+    for schedule in JobSchedule.objects.order_by("job_id", "id").iterator(
+        chunk_size=BATCH_SIZE
+    ):
+        fields = {
+            name: normalize_field(getattr(schedule, name), name) for name in FIELD_NAMES
+        }
+        for name, value in fields.items():
+            setattr(schedule, name, value)
+        schedule.expression_hash = expression_hash(fields, schedule.time_zone)
+
+        groups.setdefault((schedule.job_id, schedule.expression_hash), []).append(
+            schedule.pk
+        )
+        normalized.append(schedule)
+
+    duplicates = [(job_id, ids) for (job_id, _), ids in groups.items() if len(ids) > 1]
+    if duplicates:
+        lines = "\n".join(
+            f"  Job {job_id}: {', '.join(str(pk) for pk in ids)}"
+            for job_id, ids in duplicates
+        )
+        raise RuntimeError(
+            "These schedules are equivalent to others of their job. Keep one "
+            f"schedule of every group, delete the rest and migrate again:\n{lines}"
+        )
+
+    JobSchedule.objects.bulk_update(
+        normalized, [*FIELD_NAMES, "expression_hash"], batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0012_paused_until_active_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="jobschedule",
+            name="expression_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                max_length=40,
+                verbose_name="Hash de la expresión",
+            ),
+        ),
+        migrations.RunPython(normalize_schedules, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="jobschedule",
+            constraint=models.UniqueConstraint(
+                fields=("job", "expression_hash"),
+                name="unique_schedule_per_job",
+            ),
+        ),
+    ]
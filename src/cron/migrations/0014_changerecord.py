@@ -0,0 +1,76 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:52
+
+import django.core.serializers.json
+from django.db import migrations, models
+import django.utils.timezone
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0013_jobschedule_expression_hash"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeRecord",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("model", models.CharField(max_length=32, verbose_name="Modelo")),
+                ("object_id", models.UUIDField(verbose_name="Objeto")),
+                (
+                    "action",
+                    models.CharField(
+                        choices=[
+                            ("created", "Creado"),
+                            ("changed", "Modificado"),
+                            ("deleted", "Eliminado"),
+                        ],
+                        max_length=16,
+                        verbose_name="Acción",
+                    ),
+                ),
+                (
+                    "changes",
+                    models.JSONField(
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                        help_text="Campos modificados, con su valor anterior y su valor nuevo.",
+                        verbose_name="Cambios",
+                    ),
+                ),
+                (
+                    "actor",
+                    models.CharField(
+                        blank=True, max_length=150, verbose_name="Usuario"
+                    ),
+                ),
+                (
+                    "changed_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, verbose_name="Fecha"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Cambio",
+                "verbose_name_plural": "Cambios",
+                "ordering": ["-changed_at", "-id"],
+                "indexes": [
+                    models.Index(
+                        fields=["object_id", "changed_at", "id"],
+                        name="changerecord_object_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,106 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0014_changerecord"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobMetricsSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("worker", models.CharField(max_length=255, verbose_name="Runner")),
+                ("taken_at", models.DateTimeField(verbose_name="Fecha")),
+                (
+                    "samples",
+                    models.PositiveIntegerField(
+                        default=0,
+                        help_text="Ejecuciones medidas por el runner desde que inició.",
+                        verbose_name="Ejecuciones medidas",
+                    ),
+                ),
+                (
+                    "drift_p50",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Retraso p50"
+                    ),
+                ),
+                (
+                    "drift_p95",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Retraso p95"
+                    ),
+                ),
+                (
+                    "drift_p99",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Retraso p99"
+                    ),
+                ),
+                (
+                    "wait_p50",
+                    models.FloatField(blank=True, null=True, verbose_name="Espera p50"),
+                ),
+                (
+                    "wait_p95",
+                    models.FloatField(blank=True, null=True, verbose_name="Espera p95"),
+                ),
+                (
+                    "wait_p99",
+                    models.FloatField(blank=True, null=True, verbose_name="Espera p99"),
+                ),
+                (
+                    "duration_p50",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Duración p50"
+                    ),
+                ),
+                (
+                    "duration_p95",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Duración p95"
+                    ),
+                ),
+                (
+                    "duration_p99",
+                    models.FloatField(
+                        blank=True, null=True, verbose_name="Duración p99"
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="metrics_snapshots",
+                        to="cron.job",
+                        verbose_name="Job",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Métricas de Job",
+                "verbose_name_plural": "Métricas de Jobs",
+                "ordering": ["-taken_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["job", "-taken_at"], name="jobmetricssnapshot_job_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,93 @@
+# Generated by Django 4.2.4 on 2026-10-19 12:59
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0015_jobmetricssnapshot"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="jobrun",
+            name="unique_run_per_schedule_occurrence",
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="max_attempts",
+            field=models.PositiveIntegerField(
+                default=1,
+                help_text="Intentos de cada ejecución, incluido el primero. Con 1 las ejecuciones fallidas no se reintentan.",
+                validators=[django.core.validators.MinValueValidator(1)],
+                verbose_name="Máximo de intentos",
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="retry_backoff",
+            field=models.PositiveIntegerField(
+                default=60,
+                help_text="Segundos antes del primer reintento, la espera se duplica en cada intento.",
+                verbose_name="Espera del primer reintento",
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="retry_jitter",
+            field=models.FloatField(
+                default=0.1,
+                help_text="Fracción de la espera que se suma o resta al azar, entre 0 y 1.",
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(1),
+                ],
+                verbose_name="Variación de la espera",
+            ),
+        ),
+        migrations.AddField(
+            model_name="jobrun",
+            name="attempt",
+            field=models.PositiveIntegerField(default=1, verbose_name="Intento"),
+        ),
+        migrations.AddField(
+            model_name="jobrun",
+            name="next_attempt_at",
+            field=models.DateTimeField(
+                blank=True, null=True, verbose_name="Próximo intento"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="jobrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "En ejecución"),
+                    ("succeeded", "Exitosa"),
+                    ("failed", "Fallida"),
+                    ("skipped", "Omitida"),
+                    ("pending", "Reintento pendiente"),
+                ],
+                default="running",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobrun",
+            index=models.Index(
+                condition=models.Q(("status", "pending")),
+                fields=["next_attempt_at"],
+                name="jobrun_pending_retry_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="jobrun",
+            constraint=models.UniqueConstraint(
+                fields=("schedule", "scheduled_for", "attempt"),
+                name="unique_run_per_schedule_occurrence",
+            ),
+        ),
+    ]
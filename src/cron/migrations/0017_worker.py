@@ -0,0 +1,73 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:01
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0016_job_retries"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Worker",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                (
+                    "name",
+                    models.CharField(
+                        max_length=255, unique=True, verbose_name="Nombre"
+                    ),
+                ),
+                ("hostname", models.CharField(max_length=255, verbose_name="Equipo")),
+                (
+                    "capacity",
+                    models.PositiveIntegerField(
+                        help_text="Ejecuciones simultáneas que admite el runner.",
+                        verbose_name="Capacidad",
+                    ),
+                ),
+                (
+                    "running",
+                    models.PositiveIntegerField(default=0, verbose_name="En ejecución"),
+                ),
+                ("started_at", models.DateTimeField(verbose_name="Iniciado")),
+                (
+                    "last_heartbeat",
+                    models.DateTimeField(db_index=True, verbose_name="Último latido"),
+                ),
+            ],
+            options={
+                "verbose_name": "Runner",
+                "verbose_name_plural": "Runners",
+                "ordering": ["name"],
+            },
+        ),
+        migrations.AlterField(
+            model_name="jobrun",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("running", "En ejecución"),
+                    ("succeeded", "Exitosa"),
+                    ("failed", "Fallida"),
+                    ("skipped", "Omitida"),
+                    ("pending", "Reintento pendiente"),
+                    ("lost", "Perdida"),
+                ],
+                default="running",
+                max_length=20,
+                verbose_name="Estado",
+            ),
+        ),
+    ]
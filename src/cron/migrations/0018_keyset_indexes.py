@@ -0,0 +1,25 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0017_worker"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="jobrun",
+            index=models.Index(
+                fields=["-scheduled_for", "-id"], name="jobrun_keyset_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="jobschedule",
+            index=models.Index(
+                fields=["job", "description", "id"], name="jobschedule_keyset_idx"
+            ),
+        ),
+    ]
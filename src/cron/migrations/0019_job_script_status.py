@@ -0,0 +1,58 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0018_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="job",
+            name="script_changed_at",
+            field=models.DateTimeField(
+                blank=True,
+                editable=False,
+                help_text="Cuándo se detectó el último cambio del estado o del contenido del fichero.",
+                null=True,
+                verbose_name="Fichero cambiado",
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="script_error",
+            field=models.TextField(
+                blank=True, editable=False, verbose_name="Error del fichero"
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="script_hash",
+            field=models.CharField(
+                blank=True,
+                editable=False,
+                help_text="SHA-256 del contenido del fichero en la última revisión.",
+                max_length=64,
+                verbose_name="Hash del fichero",
+            ),
+        ),
+        migrations.AddField(
+            model_name="job",
+            name="script_status",
+            field=models.CharField(
+                choices=[
+                    ("unchecked", "Sin revisar"),
+                    ("ok", "Correcto"),
+                    ("missing", "No encontrado"),
+                    ("invalid", "Con errores"),
+                ],
+                default="unchecked",
+                editable=False,
+                max_length=20,
+                verbose_name="Estado del fichero",
+            ),
+        ),
+    ]
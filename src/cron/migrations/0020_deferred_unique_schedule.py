@@ -0,0 +1,26 @@
+# Generated by Django 4.2.4 on 2026-10-19 13:18
+
+from django.db import migrations, models
+import django.db.models.constraints
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cron", "0019_job_script_status"),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name="jobschedule",
+            name="unique_schedule_per_job",
+        ),
+        migrations.AddConstraint(
+            model_name="jobschedule",
+            constraint=models.UniqueConstraint(
+                deferrable=django.db.models.constraints.Deferrable["DEFERRED"],
+                fields=("job", "expression_hash"),
+                name="unique_schedule_per_job",
+            ),
+        ),
+    ]
@@ -1,16 +1,234 @@
 import uuid
-
-from django.db import models
+from functools import lru_cache
+from zoneinfo import available_timezones
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, router, transaction
+from django.db.models import Q
 from django.forms import ValidationError
+from django.utils import timezone
+
+from cron.audit import current_actor
+from cron.dag import creates_cycle
+from cron.schedules import FIELD_NAMES, expression_hash, normalize_field
+
+
+@lru_cache(maxsize=None)
+def get_available_time_zones() -> frozenset:
+    """Returns the names of the IANA time zones known by the system."""
+
+    return frozenset(available_timezones())
+
+
+def not_paused(now=None, prefix="") -> Q:
+    """Returns the condition of the rows whose pause, if any, has already finished."""
+
+    return Q(**{f"{prefix}paused_until__isnull": True}) | Q(
+        **{f"{prefix}paused_until__lte": now or timezone.now()}
+    )
+
+
+class JobQuerySet(models.QuerySet):
+    def active(self, now=None):
+        """Returns the enabled jobs that are not paused."""
+
+        return self.filter(not_paused(now), enabled=True)
+
+
+class JobScheduleQuerySet(models.QuerySet):
+    def active(self, now=None):
+        """Returns the enabled schedules that are not paused, of active jobs."""
+
+        return self.filter(
+            not_paused(now),
+            not_paused(now, prefix="job__"),
+            enabled=True,
+            job__enabled=True,
+        )
+
+
+class AuditedModel(models.Model):
+    """Base of the models whose changes are stored as ChangeRecords.
 
+    The values loaded from the database are kept, so saving only compares them
+    with the current ones and records the fields that changed, in the same
+    transaction as the save, without querying the previous row.
+    """
 
-class Job(models.Model):
+    # Fields that change on every save or that are kept up to date by the system.
+    audit_exclude = ("id", "updated_at")
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def audited_fields(cls) -> list:
+        return [
+            field
+            for field in cls._meta.concrete_fields
+            if field.name not in cls.audit_exclude
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._audit_values = instance.audit_values()
+        return instance
+
+    def audit_values(self) -> dict:
+        """Returns the current value of every audited field that is loaded."""
+
+        deferred = self.get_deferred_fields()
+        return {
+            field.name: field.value_from_object(self)
+            for field in self.audited_fields()
+            if field.attname not in deferred
+        }
+
+    def audit_changes(self) -> dict:
+        """Returns the audited fields changed since loaded, field -> [old, new]."""
+
+        previous = getattr(self, "_audit_values", {})
+        return {
+            name: [previous.get(name), value]
+            for name, value in self.audit_values().items()
+            if name not in previous or previous[name] != value
+        }
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+            changes = self.audit_changes()
+            if adding or changes:
+                ChangeRecord.objects.using(using).create(
+                    model=self._meta.model_name,
+                    object_id=self.pk,
+                    action=(
+                        ChangeRecord.Action.CREATED
+                        if adding
+                        else ChangeRecord.Action.CHANGED
+                    ),
+                    changes=changes,
+                    actor=current_actor.get(),
+                )
+
+        self._audit_values = self.audit_values()
+
+    def delete(self, *args, **kwargs):
+        using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+
+        with transaction.atomic(using=using):
+            ChangeRecord.objects.using(using).create(
+                model=self._meta.model_name,
+                object_id=self.pk,
+                action=ChangeRecord.Action.DELETED,
+                actor=current_actor.get(),
+            )
+            return super().delete(*args, **kwargs)
+
+
+class Job(AuditedModel):
     """Model that describes a Job or RPA"""
 
+    class ScriptStatus(models.TextChoices):
+        UNCHECKED = "unchecked", "Sin revisar"
+        OK = "ok", "Correcto"
+        MISSING = "missing", "No encontrado"
+        INVALID = "invalid", "Con errores"
+
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255, verbose_name="Nombre", unique=True)
     owner = models.CharField(max_length=255, verbose_name="Responsable")
     script = models.CharField(max_length=200, verbose_name="Fichero", unique=True)
+    enabled = models.BooleanField(
+        default=True,
+        verbose_name="Activo",
+        help_text="Los Jobs inactivos no se ejecutan, aunque conservan sus horarios.",
+    )
+    paused_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Pausado hasta",
+        help_text="Si se indica, el Job no se ejecuta hasta esta fecha.",
+    )
+    max_instances = models.PositiveIntegerField(
+        default=1,
+        verbose_name="Máximo de ejecuciones simultáneas",
+        help_text="Cantidad de ejecuciones de este Job que pueden estar en curso al mismo tiempo.",
+    )
+    running_instances = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name="Ejecuciones en curso",
+    )
+    max_attempts = models.PositiveIntegerField(
+        default=1,
+        validators=[MinValueValidator(1)],
+        verbose_name="Máximo de intentos",
+        help_text="Intentos de cada ejecución, incluido el primero. Con 1 las ejecuciones fallidas no se reintentan.",
+    )
+    retry_backoff = models.PositiveIntegerField(
+        default=60,
+        verbose_name="Espera del primer reintento",
+        help_text="Segundos antes del primer reintento, la espera se duplica en cada intento.",
+    )
+    retry_jitter = models.FloatField(
+        default=0.1,
+        validators=[MinValueValidator(0), MaxValueValidator(1)],
+        verbose_name="Variación de la espera",
+        help_text="Fracción de la espera que se suma o resta al azar, entre 0 y 1.",
+    )
+    script_status = models.CharField(
+        max_length=20,
+        choices=ScriptStatus.choices,
+        default=ScriptStatus.UNCHECKED,
+        editable=False,
+        verbose_name="Estado del fichero",
+    )
+    script_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        editable=False,
+        verbose_name="Hash del fichero",
+        help_text="SHA-256 del contenido del fichero en la última revisión.",
+    )
+    script_error = models.TextField(
+        blank=True, editable=False, verbose_name="Error del fichero"
+    )
+    script_changed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name="Fichero cambiado",
+        help_text="Cuándo se detectó el último cambio del estado o del contenido del fichero.",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Modificado")
+    depends_on = models.ManyToManyField(
+        "self",
+        through="JobDependency",
+        through_fields=("downstream", "upstream"),
+        symmetrical=False,
+        related_name="dependents",
+        blank=True,
+        verbose_name="Depende de",
+    )
+
+    audit_exclude = (
+        "id",
+        "updated_at",
+        "running_instances",
+        "script_status",
+        "script_hash",
+        "script_error",
+        "script_changed_at",
+    )
+
+    objects = JobQuerySet.as_manager()
 
     def __str__(self):
         return self.name
@@ -19,9 +237,107 @@ class Job(models.Model):
         verbose_name = "Job"
         verbose_name_plural = "Jobs"
         ordering = ["name"]
+        # Only the active rows are indexed, the paused and historical ones are
+        # never read by the runners.
+        indexes = [
+            models.Index(
+                fields=["owner", "paused_until"],
+                condition=Q(enabled=True),
+                name="job_active_idx",
+            ),
+        ]
+
+
+class OwnerRateLimit(models.Model):
+    """Model that describes the token bucket that limits the executions of the jobs of an owner"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.CharField(max_length=255, verbose_name="Responsable", unique=True)
+    rate = models.FloatField(
+        verbose_name="Ejecuciones por minuto",
+        help_text="Ejecuciones por minuto que recupera el responsable.",
+    )
+    burst = models.PositiveIntegerField(
+        verbose_name="Ráfaga",
+        help_text="Ejecuciones que el responsable puede iniciar de una vez.",
+    )
+    tokens = models.FloatField(default=0, editable=False, verbose_name="Disponibles")
+    refilled_at = models.DateTimeField(
+        blank=True, null=True, editable=False, verbose_name="Recargado"
+    )
+
+    def __str__(self):
+        return self.owner
+
+    class Meta:
+        verbose_name = "Límite de Responsable"
+        verbose_name_plural = "Límites de Responsables"
+        ordering = ["owner"]
+
+
+class JobDependency(models.Model):
+    """Model that describes that a Job runs after another one succeeds"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    upstream = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="downstream_dependencies",
+        verbose_name="Job previo",
+    )
+    downstream = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="upstream_dependencies",
+        verbose_name="Job dependiente",
+    )
+
+    def __str__(self):
+        return f"{self.upstream} -> {self.downstream}"
+
+    class Meta:
+        verbose_name = "Dependencia de Job"
+        verbose_name_plural = "Dependencias de Jobs"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["upstream", "downstream"], name="unique_job_dependency"
+            ),
+        ]
+
+    def validate_acyclic(self):
+        """Validates that the dependency does not close a cycle between jobs.
+
+        Raises:
+            ValidationError: If the upstream job already depends on the downstream job.
+        """
 
+        # An inline of a new job is cleaned before the job is saved, the
+        # missing side is validated by its own field.
+        if self.upstream_id is None or self.downstream_id is None:
+            return
 
-class JobSchedule(models.Model):
+        edges = {}
+        for upstream_id, downstream_id in JobDependency.objects.exclude(
+            pk=self.pk
+        ).values_list("upstream_id", "downstream_id"):
+            edges.setdefault(upstream_id, []).append(downstream_id)
+
+        if self.upstream_id == self.downstream_id or creates_cycle(
+            edges, self.upstream_id, self.downstream_id
+        ):
+            raise ValidationError("The dependency creates a cycle between jobs")
+
+    def clean(self):
+        self.validate_acyclic()
+
+        super().clean()
+
+    def save(self, *args, **kwargs):
+        self.full_clean()
+        super().save(*args, **kwargs)
+
+
+class JobSchedule(AuditedModel):
     """Model taht describes the schedules on which the job will be executed"""
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -65,6 +381,34 @@ class JobSchedule(models.Model):
         verbose_name="Años",
         help_text="Años donde se iniciará la ejecución. Deben ser un número de 4 dígitos.",
     )
+    time_zone = models.CharField(
+        max_length=64,
+        default=settings.TIME_ZONE,
+        verbose_name="Zona horaria",
+        help_text="Zona horaria IANA de los campos anteriores, por ejemplo America/New_York. Las horas que no existen por el cambio de horario se ejecutan al terminar el salto y las horas repetidas solo la primera vez.",
+    )
+    enabled = models.BooleanField(
+        default=True,
+        verbose_name="Activo",
+        help_text="Los horarios inactivos no se ejecutan.",
+    )
+    paused_until = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name="Pausado hasta",
+        help_text="Si se indica, el horario no se ejecuta hasta esta fecha.",
+    )
+    expression_hash = models.CharField(
+        max_length=40,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="Hash de la expresión",
+    )
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Modificado")
+
+    objects = JobScheduleQuerySet.as_manager()
+    audit_exclude = ("id", "updated_at", "expression_hash")
 
     def __str__(self):
         return (
@@ -77,6 +421,26 @@ class JobSchedule(models.Model):
         verbose_name = "Horario de Job"
         verbose_name_plural = "Horarios de Jobs"
         ordering = ["job", "description"]
+        indexes = [
+            models.Index(
+                fields=["job", "paused_until"],
+                condition=Q(enabled=True),
+                name="jobschedule_active_idx",
+            ),
+            # Ordering key of the keyset pagination of the schedules, see cron.keyset.
+            models.Index(
+                fields=["job", "description", "id"], name="jobschedule_keyset_idx"
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["job", "expression_hash"],
+                name="unique_schedule_per_job",
+                # Checked on commit, so bulk.shift_minutes can swap the minutes
+                # of the schedules of a job in one UPDATE.
+                deferrable=models.Deferrable.DEFERRED,
+            ),
+        ]
 
     def validate_allowed_chars(self, field_value, field_name) -> bool:
         """Validates whether the provided field value contains only allowed characters.
@@ -255,6 +619,23 @@ class JobSchedule(models.Model):
                 field_name=field_name,
             )
 
+    def validate_time_zone(self):
+        """Validates that the 'time_zone' field is a known IANA time zone."""
+
+        if self.time_zone not in get_available_time_zones():
+            raise ValidationError(f"Unknown time zone {self.time_zone}")
+
+    def normalize_fields(self):
+        """Stores the validated fields in their canonical form and hashes the expression."""
+
+        fields = {
+            name: normalize_field(getattr(self, name), name) for name in FIELD_NAMES
+        }
+        for name, value in fields.items():
+            setattr(self, name, value)
+
+        self.expression_hash = expression_hash(fields, self.time_zone)
+
     def clean(self):
         self.validate_minute()
         self.validate_hour()
@@ -262,9 +643,195 @@ class JobSchedule(models.Model):
         self.validate_month()
         self.validate_day_of_week()
         self.validate_year()
+        self.validate_time_zone()
+        self.normalize_fields()
 
         super().clean()
 
     def save(self, *args, **kwargs):
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+class JobRun(models.Model):
+    """Model that describes an execution of a Job"""
+
+    class Status(models.TextChoices):
+        RUNNING = "running", "En ejecución"
+        SUCCEEDED = "succeeded", "Exitosa"
+        FAILED = "failed", "Fallida"
+        SKIPPED = "skipped", "Omitida"
+        PENDING = "pending", "Reintento pendiente"
+        LOST = "lost", "Perdida"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name="runs")
+    schedule = models.ForeignKey(
+        JobSchedule,
+        on_delete=models.SET_NULL,
+        related_name="runs",
+        blank=True,
+        null=True,
+    )
+    scheduled_for = models.DateTimeField(verbose_name="Programada para")
+    status = models.CharField(
+        max_length=20,
+        choices=Status.choices,
+        default=Status.RUNNING,
+        verbose_name="Estado",
+    )
+    worker = models.CharField(max_length=255, verbose_name="Worker")
+    started_at = models.DateTimeField(verbose_name="Inicio", blank=True, null=True)
+    finished_at = models.DateTimeField(verbose_name="Fin", blank=True, null=True)
+    exit_code = models.IntegerField(
+        verbose_name="Código de salida", blank=True, null=True
+    )
+    triggered_by = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        related_name="triggered_runs",
+        blank=True,
+        null=True,
+        verbose_name="Disparada por",
+    )
+    attempt = models.PositiveIntegerField(default=1, verbose_name="Intento")
+    next_attempt_at = models.DateTimeField(
+        blank=True, null=True, verbose_name="Próximo intento"
+    )
+
+    def __str__(self):
+        return f"{self.job.name} | {self.scheduled_for}"
+
+    class Meta:
+        verbose_name = "Ejecución de Job"
+        verbose_name_plural = "Ejecuciones de Jobs"
+        ordering = ["-scheduled_for"]
+        constraints = [
+            # Every attempt of an occurrence of a schedule is claimed by
+            # exactly one runner.
+            models.UniqueConstraint(
+                fields=["schedule", "scheduled_for", "attempt"],
+                name="unique_run_per_schedule_occurrence",
+            ),
+        ]
+        # Only the pending retries are indexed, the runners read them by
+        # next_attempt_at without scanning the history.
+        indexes = [
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(status="pending"),
+                name="jobrun_pending_retry_idx",
+            ),
+            # Ordering key of the keyset pagination of the runs, see cron.keyset.
+            models.Index(fields=["-scheduled_for", "-id"], name="jobrun_keyset_idx"),
+        ]
+
+
+class Worker(models.Model):
+    """Model that describes a live runner, refreshed by its heartbeat, see cron.workers"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=255, unique=True, verbose_name="Nombre")
+    hostname = models.CharField(max_length=255, verbose_name="Equipo")
+    capacity = models.PositiveIntegerField(
+        verbose_name="Capacidad",
+        help_text="Ejecuciones simultáneas que admite el runner.",
+    )
+    running = models.PositiveIntegerField(default=0, verbose_name="En ejecución")
+    started_at = models.DateTimeField(verbose_name="Iniciado")
+    last_heartbeat = models.DateTimeField(db_index=True, verbose_name="Último latido")
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        verbose_name = "Runner"
+        verbose_name_plural = "Runners"
+        ordering = ["name"]
+
+
+class JobMetricsSnapshot(models.Model):
+    """Model that describes the percentiles of the timing metrics of a Job measured by a runner, see cron.metrics"""
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name="metrics_snapshots",
+        verbose_name="Job",
+    )
+    worker = models.CharField(max_length=255, verbose_name="Runner")
+    taken_at = models.DateTimeField(verbose_name="Fecha")
+    samples = models.PositiveIntegerField(
+        default=0,
+        verbose_name="Ejecuciones medidas",
+        help_text="Ejecuciones medidas por el runner desde que inició.",
+    )
+    drift_p50 = models.FloatField(blank=True, null=True, verbose_name="Retraso p50")
+    drift_p95 = models.FloatField(blank=True, null=True, verbose_name="Retraso p95")
+    drift_p99 = models.FloatField(blank=True, null=True, verbose_name="Retraso p99")
+    wait_p50 = models.FloatField(blank=True, null=True, verbose_name="Espera p50")
+    wait_p95 = models.FloatField(blank=True, null=True, verbose_name="Espera p95")
+    wait_p99 = models.FloatField(blank=True, null=True, verbose_name="Espera p99")
+    duration_p50 = models.FloatField(blank=True, null=True, verbose_name="Duración p50")
+    duration_p95 = models.FloatField(blank=True, null=True, verbose_name="Duración p95")
+    duration_p99 = models.FloatField(blank=True, null=True, verbose_name="Duración p99")
+
+    def __str__(self):
+        return f"{self.job} | {self.taken_at}"
+
+    class Meta:
+        verbose_name = "Métricas de Job"
+        verbose_name_plural = "Métricas de Jobs"
+        ordering = ["-taken_at"]
+        indexes = [
+            models.Index(
+                fields=["job", "-taken_at"], name="jobmetricssnapshot_job_idx"
+            ),
+        ]
+
+
+class ChangeRecord(models.Model):
+    """Model that describes a change of a Job or a JobSchedule, with only the fields that changed"""
+
+    class Action(models.TextChoices):
+        CREATED = "created", "Creado"
+        CHANGED = "changed", "Modificado"
+        DELETED = "deleted", "Eliminado"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.CharField(max_length=32, verbose_name="Modelo")
+    object_id = models.UUIDField(verbose_name="Objeto")
+    action = models.CharField(
+        max_length=16, choices=Action.choices, verbose_name="Acción"
+    )
+    changes = models.JSONField(
+        default=dict,
+        encoder=DjangoJSONEncoder,
+        verbose_name="Cambios",
+        help_text="Campos modificados, con su valor anterior y su valor nuevo.",
+    )
+    actor = models.CharField(max_length=150, blank=True, verbose_name="Usuario")
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name="Fecha")
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} {self.action}"
+
+    class Meta:
+        verbose_name = "Cambio"
+        verbose_name_plural = "Cambios"
+        ordering = ["-changed_at", "-id"]
+        indexes = [
+            models.Index(
+                fields=["object_id", "changed_at", "id"],
+                name="changerecord_object_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("The change records cannot be modified")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("The change records cannot be deleted")
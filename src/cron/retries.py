@@ -0,0 +1,143 @@
+"""Retries of the failed runs.
+
+A failed run of a job with max_attempts above one creates the run of its next
+attempt, PENDING until its next_attempt_at. The delay doubles with every
+attempt from the retry_backoff of the job and is spread by its retry_jitter,
+so the jobs that failed together do not retry together.
+
+The pending runs are the queue, so the retries survive the restarts of the
+runners. Every runner loads the ones due soon with a range scan of a partial
+index, which only holds the pending runs, into a heap ordered by
+next_attempt_at, and claims each one when it is due with a conditional UPDATE,
+so only one runner executes it.
+"""
+
+import heapq
+import random
+import threading
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from cron.models import Job, JobRun
+
+# Longest delay between two attempts, in seconds.
+MAX_BACKOFF_SECONDS = 24 * 60 * 60
+
+
+def retry_delay(job, attempt, rng=random) -> float:
+    """Returns the seconds to wait before the attempt after the given one.
+
+    Args:
+        job (Job): The job of the failed run.
+        attempt (int): The number of the failed attempt, starting at 1.
+        rng: Source of the random jitter.
+    """
+
+    delay = min(job.retry_backoff * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+    return delay * (1 + rng.uniform(-job.retry_jitter, job.retry_jitter))
+
+
+def schedule_retry(run, now=None):
+    """Creates the pending run of the next attempt of a failed run.
+
+    Returns:
+        JobRun | None: The pending run, or None if the job has no attempts
+            left or the next attempt already exists.
+    """
+
+    if run.attempt >= run.job.max_attempts:
+        return None
+
+    now = now or timezone.now()
+    try:
+        with transaction.atomic():
+            return JobRun.objects.create(
+                job=run.job,
+                schedule_id=run.schedule_id,
+                scheduled_for=run.scheduled_for,
+                status=JobRun.Status.PENDING,
+                attempt=run.attempt + 1,
+                next_attempt_at=now
+                + timedelta(seconds=retry_delay(run.job, run.attempt)),
+                triggered_by_id=run.triggered_by_id,
+            )
+    except IntegrityError:
+        return None
+
+
+def claim_retry(run, worker, now=None) -> bool:
+    """Claims a pending run for a runner, True if no other runner claimed it first."""
+
+    now = now or timezone.now()
+    claimed = JobRun.objects.filter(pk=run.pk, status=JobRun.Status.PENDING).update(
+        status=JobRun.Status.RUNNING, worker=worker, started_at=now
+    )
+    if claimed:
+        run.status, run.worker, run.started_at = JobRun.Status.RUNNING, worker, now
+
+    return bool(claimed)
+
+
+class RetryQueue:
+    """Heap of the pending runs due soon, ordered by next_attempt_at.
+
+    The failed runs are pushed from the threads of the pool while the main loop
+    loads and pops, so every method holds a lock.
+    """
+
+    def __init__(self):
+        self.heap = []
+        self.queued = set()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        with self.lock:
+            return len(self.heap)
+
+    def _push(self, run_id, next_attempt_at):
+        if run_id not in self.queued:
+            self.queued.add(run_id)
+            heapq.heappush(self.heap, (next_attempt_at, run_id))
+
+    def push(self, run_id, next_attempt_at):
+        with self.lock:
+            self._push(run_id, next_attempt_at)
+
+    def load(self, until, *filters, now=None):
+        """Adds the pending runs of active jobs due before until that match the filters.
+
+        The retries of the disabled or paused jobs stay pending, and are loaded
+        once their job is active again.
+        """
+
+        pending = JobRun.objects.filter(
+            *filters,
+            job__in=Job.objects.active(now),
+            status=JobRun.Status.PENDING,
+            next_attempt_at__lt=until,
+        )
+        runs = list(pending.values_list("pk", "next_attempt_at").order_by())
+
+        with self.lock:
+            for run_id, next_attempt_at in runs:
+                self._push(run_id, next_attempt_at)
+
+    def next_at(self):
+        """Returns when the first queued run is due, None if the queue is empty."""
+
+        with self.lock:
+            return self.heap[0][0] if self.heap else None
+
+    def pop_due(self, now) -> list:
+        """Removes and returns the ids of the runs due at now."""
+
+        due = []
+        with self.lock:
+            while self.heap and self.heap[0][0] <= now:
+                _, run_id = heapq.heappop(self.heap)
+                self.queued.discard(run_id)
+                due.append(run_id)
+
+        return due
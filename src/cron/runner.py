@@ -0,0 +1,473 @@
+"""Runner that dispatches the executions of the job schedules every minute."""
+
+import logging
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from cron.coordination import (
+    COORDINATION_CLAIM,
+    COORDINATION_LEADER,
+    LeaderLock,
+    claim_occurrence,
+)
+from cron.dag import DagRun
+from cron.executors import get_executor
+from cron.joblogs import SegmentWriter, run_log_directory
+from cron.limits import get_limiter
+from cron.metrics import MetricsRegistry
+from cron.models import Job, JobDependency, JobRun, JobSchedule, Worker
+from cron.retries import RetryQueue, claim_retry, schedule_retry
+from cron.schedules import CronFields
+from cron.scripts import ScriptCache, ScriptWatcher
+from cron.sharding import HashRing
+from cron.timezones import local_datetime, transition_table
+from cron.workers import Heartbeat
+
+logger = logging.getLogger(__name__)
+
+# Minutes that are still dispatched if the runner wakes up late.
+MAX_CATCH_UP_MINUTES = 5
+
+
+def default_worker_name() -> str:
+    """Returns a name that identifies this runner process."""
+
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Runner:
+    """Evaluates the schedules every minute and executes the scripts of the jobs that fire.
+
+    Args:
+        worker_name (str): Name of the runner, stored in the runs it claims.
+        coordination (str): How this runner coordinates with the others, one of
+            the modes of cron.coordination.
+        max_workers (int): Maximum number of scripts executed at the same time.
+        ring (HashRing): If given, the runner only loads the jobs of its shard
+            of the ring made of the runners of this one that are alive, see
+            refresh_ring.
+        executor (str): How the scripts are executed, one of cron.executors.EXECUTORS.
+        shared_limits (bool): Whether the limits of the jobs and owners apply to
+            all the runners together instead of to each one, see cron.limits.
+    """
+
+    def __init__(
+        self,
+        worker_name=None,
+        coordination=COORDINATION_CLAIM,
+        max_workers=None,
+        ring=None,
+        executor=None,
+        shared_limits=None,
+    ):
+        self.worker_name = worker_name or default_worker_name()
+        self.ring = ring
+        # Every runner that may share the jobs, the ring only has the live ones.
+        self.ring_members = ring.workers if ring is not None else []
+        self.executor = get_executor(
+            executor or settings.RUNNER_EXECUTOR, settings.RUNNER_PRELOAD_MODULES
+        )
+        self.limiter = get_limiter(
+            settings.RUNNER_SHARED_LIMITS if shared_limits is None else shared_limits
+        )
+        self.leader_lock = LeaderLock() if coordination == COORDINATION_LEADER else None
+        self.metrics = MetricsRegistry()
+        self.retries = RetryQueue()
+        self.scripts = ScriptCache()
+        self.capacity = max_workers or settings.RUNNER_MAX_WORKERS
+        self.pool = ThreadPoolExecutor(max_workers=self.capacity)
+        # Runs submitted and not finished yet, reported by the heartbeat.
+        self.in_flight = 0
+        self.in_flight_lock = threading.Lock()
+        self.last_minute = None
+        self.dependencies = {}
+        # DagRun of every dependent run in progress, see run_dependents.
+        self.dag_runs = {}
+        self.dag_lock = threading.Lock()
+
+    def load_dependencies(self, now=None) -> dict:
+        """Returns the dependency graph, upstream job id -> downstream job ids.
+
+        Inactive jobs are left out, so they and the jobs after them do not run.
+        """
+
+        edges = {}
+        for upstream_id, downstream_id in JobDependency.objects.filter(
+            downstream__in=Job.objects.active(now)
+        ).values_list("upstream_id", "downstream_id"):
+            edges.setdefault(upstream_id, []).append(downstream_id)
+
+        return edges
+
+    def refresh_ring(self, now=None):
+        """Rebuilds the ring with the members whose heartbeat is fresh.
+
+        This runner is always on the ring, even before its first beat. The
+        members without a fresh heartbeat are logged as errors, since their
+        jobs are run by the others until they beat again.
+        """
+
+        if self.ring is None:
+            return
+
+        now = now or timezone.now()
+        cutoff = now - timedelta(seconds=settings.WORKER_STALE_SECONDS)
+        live = set(
+            Worker.objects.filter(
+                name__in=self.ring_members, last_heartbeat__gte=cutoff
+            ).values_list("name", flat=True)
+        )
+        live.add(self.worker_name)
+
+        missing = sorted(set(self.ring_members) - live)
+        if missing:
+            logger.error(
+                "Runners %s have no heartbeat since %s, their jobs are shared by %s",
+                ", ".join(missing),
+                cutoff,
+                ", ".join(sorted(live)),
+            )
+
+        if sorted(live) != self.ring.workers:
+            self.ring = HashRing(live, self.ring.replicas)
+
+    def active_scripts(self, now=None) -> list:
+        """Returns the scripts of the active jobs of the shard of this runner."""
+
+        jobs = Job.objects.active(now)
+        if self.ring is not None:
+            jobs = jobs.filter(self.ring.shard_filter(self.worker_name))
+
+        return list(jobs.values_list("script", flat=True))
+
+    def load_schedules(self, now=None) -> list:
+        """Returns the active schedules of the shard of this runner paired with their parsed fields."""
+
+        schedules = JobSchedule.objects.active(now).select_related("job")
+        if self.ring is not None:
+            schedules = schedules.filter(
+                self.ring.shard_filter(self.worker_name, field="job_id")
+            )
+
+        return [
+            (schedule, CronFields.from_schedule(schedule)) for schedule in schedules
+        ]
+
+    def pending_minutes(self, minute) -> list:
+        """Returns the minutes not dispatched yet, up to the given one."""
+
+        if self.last_minute is None or minute <= self.last_minute:
+            return [minute]
+
+        elapsed = int((minute - self.last_minute) / timedelta(minutes=1))
+        first = max(1, elapsed - MAX_CATCH_UP_MINUTES + 1)
+        return [
+            self.last_minute + timedelta(minutes=offset)
+            for offset in range(first, elapsed + 1)
+        ]
+
+    def tick(self, now=None) -> list:
+        """Dispatches the occurrences of the minutes elapsed since the previous tick.
+
+        Args:
+            now (datetime): The current aware datetime, timezone.now() by default.
+
+        Returns:
+            list[JobRun]: The runs claimed by this runner.
+        """
+
+        minute = (now or timezone.now()).replace(second=0, microsecond=0)
+        minutes = self.pending_minutes(minute)
+        self.last_minute = minute
+
+        if self.leader_lock is not None and not self.leader_lock.acquire():
+            return []
+
+        self.refresh_ring(now)
+        self.dependencies = self.load_dependencies(minute)
+        self.limiter.refresh()
+        self.metrics.flush_if_due(self.worker_name)
+        self.load_retries(minute + timedelta(minutes=1), minute)
+        self.dispatch_retries(now)
+
+        schedules_by_zone = {}
+        for schedule, fields in self.load_schedules(minute):
+            schedules_by_zone.setdefault(schedule.time_zone, []).append(
+                (schedule, fields)
+            )
+
+        runs = []
+
+        for moment in minutes:
+            utc_second = int(moment.timestamp())
+            for zone_name, schedules in schedules_by_zone.items():
+                local_moments = [
+                    local_datetime(local_second)
+                    for local_second in transition_table(zone_name).local_times_at(
+                        utc_second
+                    )
+                ]
+                for schedule, fields in schedules:
+                    if not any(fields.matches(local) for local in local_moments):
+                        continue
+
+                    run = claim_occurrence(schedule, moment, self.worker_name)
+                    if run is not None:
+                        runs.append(run)
+                        self.start(run)
+
+        return runs
+
+    def load_retries(self, until, now=None):
+        """Queues the pending retries of active jobs of the shard of this runner due before until."""
+
+        filters = []
+        if self.ring is not None:
+            filters.append(self.ring.shard_filter(self.worker_name, field="job_id"))
+
+        self.retries.load(until, *filters, now=now)
+
+    def dispatch_retries(self, now=None) -> list:
+        """Claims and submits the queued retries that are due.
+
+        The retries are limited like the scheduled runs, but one that the limits
+        do not allow stays pending and is tried again after RETRY_POSTPONE_SECONDS
+        instead of being skipped.
+
+        Returns:
+            list[JobRun]: The retries claimed by this runner.
+        """
+
+        now = now or timezone.now()
+        due = self.retries.pop_due(now)
+        if not due:
+            return []
+
+        # The jobs disabled or paused since the retries were loaded are left
+        # pending, see RetryQueue.load.
+        claimed = []
+        for run in JobRun.objects.filter(
+            pk__in=due,
+            job__in=Job.objects.active(now),
+            status=JobRun.Status.PENDING,
+        ).select_related("job"):
+            if not self.limiter.acquire(run.job):
+                self.retries.push(
+                    run.pk, now + timedelta(seconds=settings.RETRY_POSTPONE_SECONDS)
+                )
+                continue
+
+            if not claim_retry(run, self.worker_name, now):
+                self.limiter.release(run.job)
+                continue
+
+            claimed.append(run)
+            self.submit(run)
+
+        return claimed
+
+    def start(self, run):
+        """Submits a claimed run to the pool, or skips it if the limits do not allow it."""
+
+        if self.limiter.acquire(run.job):
+            self.submit(run)
+            return
+
+        logger.info("Run %s of %s skipped by the limits", run.pk, run.job)
+        JobRun.objects.filter(pk=run.pk).update(
+            status=JobRun.Status.SKIPPED, finished_at=timezone.now()
+        )
+        self.run_dependents(run, succeeded=False)
+
+    def submit(self, run):
+        """Submits a run whose limits are taken to the pool."""
+
+        with self.in_flight_lock:
+            self.in_flight += 1
+        self.pool.submit(self.execute, run, time.time())
+
+    def execute(self, run, submitted_at=None):
+        """Executes the script of a run, stores its result and measures its timing.
+
+        Nothing reads the futures of the pool, so an error that escapes is
+        logged here and the run is marked as FAILED instead of staying RUNNING
+        while the runner keeps beating.
+
+        Args:
+            run (JobRun): The claimed run.
+            submitted_at (float): When the run was submitted to the pool, as a
+                timestamp, to measure how long it waited for a free worker.
+        """
+
+        try:
+            self.execute_run(run, submitted_at)
+        except Exception:
+            logger.exception("Run %s of %s failed in the runner", run.pk, run.job)
+            try:
+                JobRun.objects.filter(pk=run.pk, status=JobRun.Status.RUNNING).update(
+                    status=JobRun.Status.FAILED, finished_at=timezone.now()
+                )
+            except Exception:
+                logger.exception("Could not mark run %s as failed", run.pk)
+
+    def execute_run(self, run, submitted_at=None):
+        """Executes a run and stores its result, see execute."""
+
+        started_at = time.time()
+
+        try:
+            script = self.scripts.get(run.job.script)
+            with SegmentWriter(run_log_directory(run)) as output:
+                exit_code = self.executor.run(
+                    script.path, output, compiled=script.compiled
+                )
+        except Exception:
+            logger.exception("Could not execute %s", run.job.script)
+            exit_code = -1
+        finally:
+            self.limiter.release(run.job)
+            with self.in_flight_lock:
+                self.in_flight -= 1
+
+        self.metrics.observe(
+            run.job_id,
+            drift=started_at - (run.next_attempt_at or run.scheduled_for).timestamp(),
+            wait=started_at - (submitted_at or started_at),
+            duration=time.time() - started_at,
+        )
+        JobRun.objects.filter(pk=run.pk).update(
+            status=JobRun.Status.SUCCEEDED if exit_code == 0 else JobRun.Status.FAILED,
+            exit_code=exit_code,
+            finished_at=timezone.now(),
+        )
+
+        if exit_code != 0 and self.retry(run):
+            return
+
+        self.run_dependents(run, succeeded=exit_code == 0)
+
+    def retry(self, run) -> bool:
+        """Schedules the next attempt of a failed run, if its job has attempts left.
+
+        The dependents wait for the last attempt, so the DagRun of the run, if
+        any, moves to the retry.
+        """
+
+        retry = schedule_retry(run)
+        if retry is None:
+            return False
+
+        logger.info(
+            "Run %s of %s failed, attempt %s at %s",
+            run.pk,
+            run.job,
+            retry.attempt,
+            retry.next_attempt_at,
+        )
+        with self.dag_lock:
+            dag_run = self.dag_runs.pop(run.pk, None)
+            if dag_run is not None:
+                self.dag_runs[retry.pk] = dag_run
+        self.retries.push(retry.pk, retry.next_attempt_at)
+        return True
+
+    def run_dependents(self, run, succeeded):
+        """Dispatches the jobs that become ready when a run finishes.
+
+        A scheduled run of a job with dependents starts a DagRun, shared by all
+        the runs it triggers. The dependents are executed by the same pool, so
+        the independent branches run in parallel up to max_workers.
+        """
+
+        with self.dag_lock:
+            dag_run = self.dag_runs.pop(run.pk, None)
+            if dag_run is None:
+                if not self.dependencies.get(run.job_id):
+                    return
+                dag_run = DagRun(self.dependencies, run.job_id)
+
+            dependent_runs = []
+            for job_id in dag_run.complete(run.job_id, succeeded):
+                now = timezone.now()
+                dependent = JobRun.objects.create(
+                    job_id=job_id,
+                    scheduled_for=now,
+                    started_at=now,
+                    worker=self.worker_name,
+                    triggered_by=run,
+                )
+                self.dag_runs[dependent.pk] = dag_run
+                dependent_runs.append(dependent)
+
+        for dependent in dependent_runs:
+            self.start(dependent)
+
+    def sleep_until_next_minute(self):
+        """Sleeps until the next minute, dispatching the retries due meanwhile."""
+
+        while True:
+            seconds = 60 - time.time() % 60
+            next_at = self.retries.next_at()
+            if next_at is None:
+                break
+
+            retry_seconds = (next_at - timezone.now()).total_seconds()
+            if retry_seconds >= seconds:
+                break
+
+            time.sleep(max(retry_seconds, 0))
+            self.dispatch_retries()
+
+        time.sleep(seconds)
+
+    def run_once(self, now=None) -> list:
+        """Dispatches the current minute and waits for its runs.
+
+        The runner beats before dispatching and until its runs finish, so it is
+        registered like the ones that run forever and its runs are not reaped.
+
+        Returns:
+            list[JobRun]: The runs claimed by this runner.
+        """
+
+        heartbeat = Heartbeat(self)
+        heartbeat.beat()
+        heartbeat.start()
+
+        try:
+            return self.tick(now)
+        finally:
+            self.pool.shutdown(wait=True)
+            heartbeat.stop()
+            self.metrics.flush(self.worker_name)
+            if self.leader_lock is not None:
+                self.leader_lock.release()
+
+    def run_forever(self):
+        """Ticks at the beginning of every minute until interrupted."""
+
+        logger.info("Runner %s started", self.worker_name)
+        heartbeat = Heartbeat(self)
+        heartbeat.start()
+        watcher = ScriptWatcher(self)
+        watcher.start()
+
+        try:
+            while True:
+                self.tick()
+                self.sleep_until_next_minute()
+        finally:
+            self.pool.shutdown(wait=True)
+            # Stops beating once the runs are finished, so they are not reaped.
+            heartbeat.stop()
+            watcher.stop()
+            self.metrics.flush(self.worker_name)
+            if self.leader_lock is not None:
+                self.leader_lock.release()
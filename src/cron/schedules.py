@@ -0,0 +1,169 @@
+"""Helpers to interpret the cron-like fields of a JobSchedule.
+
+The fields of a JobSchedule are comma separated lists of numbers or a single
+asterisk. All the fields must match for the schedule to fire, the same way the
+APScheduler cron trigger works.
+"""
+
+import hashlib
+from datetime import date, datetime, time, timedelta
+from typing import Iterator, NamedTuple, Optional
+
+FIELD_RANGES = {
+    "minute": (0, 59),
+    "hour": (0, 23),
+    "day_of_month": (1, 31),
+    "month": (1, 12),
+    "day_of_week": (1, 7),
+    "year": (0, 9999),
+}
+
+FIELD_NAMES = tuple(FIELD_RANGES)
+
+
+def parse_field(field_value: str) -> Optional[tuple]:
+    """Parses the value of a cron field.
+
+    Args:
+        field_value (str): The value of the field, already validated by the model.
+
+    Returns:
+        tuple[int] | None: The sorted distinct values of the field, or None when
+            the field is an asterisk (every possible value).
+    """
+
+    if field_value.strip() == "*":
+        return None
+
+    return tuple(sorted({int(value) for value in field_value.split(",") if value}))
+
+
+def normalize_field(field_value: str, field_name: str) -> str:
+    """Returns the canonical form of a valid cron field.
+
+    The values are deduplicated and sorted, empty items are dropped and a list
+    with every possible value becomes an asterisk, so ``3,2,1,1`` and ``1,2,3``
+    are stored the same way.
+    """
+
+    values = parse_field(field_value)
+    if values is None:
+        return "*"
+
+    min_value, max_value = FIELD_RANGES[field_name]
+    if len(values) == max_value - min_value + 1:
+        return "*"
+
+    return ",".join(str(value) for value in values)
+
+
+def expression_hash(fields: dict, time_zone: str) -> str:
+    """Returns the hash of the canonical expression of a schedule.
+
+    Args:
+        fields (dict): The normalized value of every field in FIELD_NAMES.
+        time_zone (str): The time zone of the schedule.
+    """
+
+    expression = " ".join([*(fields[name] for name in FIELD_NAMES), time_zone])
+    return hashlib.sha1(expression.encode()).hexdigest()
+
+
+class CronFields(NamedTuple):
+    """Parsed fields of a schedule. A None field means every possible value."""
+
+    minute: Optional[tuple]
+    hour: Optional[tuple]
+    day_of_month: Optional[tuple]
+    month: Optional[tuple]
+    day_of_week: Optional[tuple]
+    year: Optional[tuple]
+
+    @classmethod
+    def from_schedule(cls, schedule) -> "CronFields":
+        """Builds the parsed fields from a JobSchedule (or any object with the same fields)."""
+
+        return cls(*(parse_field(getattr(schedule, name)) for name in FIELD_NAMES))
+
+    def expand(self, field_name) -> tuple:
+        """Returns every value of a field, expanding the asterisk to the full range."""
+
+        values = getattr(self, field_name)
+        if values is None:
+            min_value, max_value = FIELD_RANGES[field_name]
+            return tuple(range(min_value, max_value + 1))
+
+        return values
+
+    def is_empty(self) -> bool:
+        """Whether any field has no values at all, so the schedule can never fire."""
+
+        return any(values == () for values in self)
+
+    def matches_date(self, day: date) -> bool:
+        """Whether the schedule fires at some time of the given day."""
+
+        return (
+            (self.year is None or day.year in self.year)
+            and (self.month is None or day.month in self.month)
+            and (self.day_of_month is None or day.day in self.day_of_month)
+            and (self.day_of_week is None or day.isoweekday() in self.day_of_week)
+        )
+
+    def matches(self, moment: datetime) -> bool:
+        """Whether the schedule fires at the minute of the given (local) datetime."""
+
+        return (
+            (self.minute is None or moment.minute in self.minute)
+            and (self.hour is None or moment.hour in self.hour)
+            and self.matches_date(moment.date())
+        )
+
+    def iter_dates(self, start: date, end: date) -> Iterator[date]:
+        """Yields the days in [start, end] on which the schedule fires.
+
+        Years and months that are not part of the schedule are skipped entirely
+        instead of being walked day by day.
+        """
+
+        if self.is_empty():
+            return
+
+        day = start
+        while day <= end:
+            if self.year is not None and day.year not in self.year:
+                next_years = [year for year in self.year if year > day.year]
+                if not next_years:
+                    return
+                day = date(next_years[0], 1, 1)
+                continue
+
+            if self.month is not None and day.month not in self.month:
+                if day.month == 12:
+                    day = date(day.year + 1, 1, 1)
+                else:
+                    day = date(day.year, day.month + 1, 1)
+                continue
+
+            if self.matches_date(day):
+                yield day
+
+            day += timedelta(days=1)
+
+    def iter_datetimes(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Yields the naive local datetimes in [start, end) on which the schedule fires."""
+
+        times = [
+            time(hour, minute)
+            for hour in self.expand("hour")
+            for minute in self.expand("minute")
+        ]
+
+        for day in self.iter_dates(start.date(), end.date()):
+            for moment_time in times:
+                moment = datetime.combine(day, moment_time)
+                if moment < start:
+                    continue
+                if moment >= end:
+                    return
+                yield moment
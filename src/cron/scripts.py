@@ -0,0 +1,249 @@
+"""Cache of the scripts of the jobs, resolved, hashed and compiled ahead of their runs.
+
+The runner does not look for the script of a run when it executes it. A
+background thread inspects the scripts of the active jobs every
+SCRIPT_CHECK_SECONDS: a stat per script, and only for the scripts whose mtime
+or size changed since the previous check, a read to hash their content and a
+compilation to bytecode. The runs take the path and the bytecode of their
+script from the cache, so they do not touch the directory of the scripts until
+the executor starts them, and a script changed after the last check runs its
+previous version until the next one.
+
+The bytecode is written to SCRIPT_CACHE_DIR with the SHA-256 of the source in
+its name, so the same content is compiled once however many jobs or versions
+share it.
+
+Every change found is stored in the job (script_status, script_hash,
+script_error, script_changed_at) when it is found, so a missing or broken
+script shows up in the admin before it is due. Only the runners check the
+scripts, since the web hosts may not have SCRIPTS_DIR: a script set in the
+admin is unchecked until the next check.
+"""
+
+import hashlib
+import importlib.util
+import logging
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+
+from cron.models import Job
+
+logger = logging.getLogger(__name__)
+
+# Flags of the header of a .pyc whose source is not checked when it is loaded.
+UNCHECKED_HASH_FLAGS = (0b01).to_bytes(4, "little")
+
+
+class ScriptInfo(NamedTuple):
+    """A script as found by the last check."""
+
+    name: str
+    path: Path
+    status: str
+    mtime_ns: Optional[int] = None
+    size: Optional[int] = None
+    sha256: str = ""
+    compiled: Optional[Path] = None
+    error: str = ""
+
+
+def compile_script(path, source, sha256, cache_dir) -> Path:
+    """Compiles the source of a script to a .pyc file, unless it is already.
+
+    Raises:
+        SyntaxError: If the source is not valid Python.
+    """
+
+    compiled = cache_dir / f"{sha256}.{sys.implementation.cache_tag}.pyc"
+    if compiled.exists():
+        return compiled
+
+    code = compile(source, str(path), "exec", dont_inherit=True)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=cache_dir, delete=False) as file:
+        file.write(importlib.util.MAGIC_NUMBER)
+        file.write(UNCHECKED_HASH_FLAGS)
+        file.write(importlib.util.source_hash(source))
+        marshal.dump(code, file)
+    os.replace(file.name, compiled)
+
+    return compiled
+
+
+def inspect_script(name, scripts_dir, cache_dir, previous=None) -> ScriptInfo:
+    """Resolves, hashes and compiles a script.
+
+    Args:
+        name (str): The script of a job, relative to scripts_dir.
+        scripts_dir (Path): The directory of the scripts.
+        cache_dir (Path): Where the bytecode is written.
+        previous (ScriptInfo): The previous check of the script. It is returned
+            as is if the mtime and size of the file did not change.
+    """
+
+    path = scripts_dir / name
+    try:
+        stat = path.stat()
+        if (
+            previous is not None
+            and previous.status != Job.ScriptStatus.MISSING
+            and (previous.mtime_ns, previous.size) == (stat.st_mtime_ns, stat.st_size)
+        ):
+            return previous
+        source = path.read_bytes()
+    except OSError as error:
+        return ScriptInfo(name, path, Job.ScriptStatus.MISSING, error=str(error))
+
+    found = ScriptInfo(
+        name,
+        path,
+        Job.ScriptStatus.OK,
+        mtime_ns=stat.st_mtime_ns,
+        size=stat.st_size,
+        sha256=hashlib.sha256(source).hexdigest(),
+    )
+    try:
+        compiled = compile_script(path, source, found.sha256, cache_dir)
+    except (SyntaxError, ValueError) as error:
+        return found._replace(status=Job.ScriptStatus.INVALID, error=str(error))
+    except OSError:
+        # The script runs from its source.
+        logger.exception("Could not write the bytecode of %s", path)
+        return found
+
+    return found._replace(compiled=compiled)
+
+
+def record_scripts(scripts, now=None) -> int:
+    """Stores the checks of some scripts in their jobs, if they changed.
+
+    Returns:
+        int: The number of jobs updated.
+    """
+
+    now = now or timezone.now()
+    updated = 0
+    for script in scripts:
+        updated += (
+            Job.objects.filter(script=script.name)
+            .exclude(
+                Q(script_status=script.status)
+                & Q(script_hash=script.sha256)
+                & Q(script_error=script.error)
+            )
+            .update(
+                script_status=script.status,
+                script_hash=script.sha256,
+                script_error=script.error,
+                script_changed_at=now,
+            )
+        )
+
+    return updated
+
+
+class ScriptCache:
+    """The last check of every script, refreshed by ScriptWatcher.
+
+    Args:
+        scripts_dir (Path): The directory of the scripts, SCRIPTS_DIR by default.
+        cache_dir (Path): Where the bytecode is written, SCRIPT_CACHE_DIR by default.
+    """
+
+    def __init__(self, scripts_dir=None, cache_dir=None):
+        self.scripts_dir = Path(scripts_dir or settings.SCRIPTS_DIR)
+        self.cache_dir = Path(cache_dir or settings.SCRIPT_CACHE_DIR)
+        self.scripts = {}
+
+    def get(self, name) -> ScriptInfo:
+        """Returns the last check of a script, checking it now only if it was never checked."""
+
+        script = self.scripts.get(name)
+        if script is None:
+            script = inspect_script(name, self.scripts_dir, self.cache_dir)
+            self.scripts[name] = script
+            record_scripts([script])
+
+        return script
+
+    def refresh(self, names) -> list:
+        """Checks the given scripts again and forgets the rest.
+
+        Returns:
+            list[ScriptInfo]: The scripts that changed, already stored in their jobs.
+        """
+
+        scripts = {}
+        changed = []
+        for name in names:
+            previous = self.scripts.get(name)
+            script = inspect_script(name, self.scripts_dir, self.cache_dir, previous)
+            if script != previous:
+                changed.append(script)
+            scripts[name] = script
+
+        # Replaced at once, so the runs read either the old or the new checks.
+        self.scripts = scripts
+
+        # The jobs whose script was changed in the admin since the last check,
+        # even if this runner already knew the new script.
+        unchecked = Job.objects.filter(
+            script_status=Job.ScriptStatus.UNCHECKED
+        ).values_list("script", flat=True)
+        stale = [
+            scripts[name]
+            for name in unchecked
+            if name in scripts and scripts[name] not in changed
+        ]
+        record_scripts(changed + stale)
+
+        return changed
+
+
+class ScriptWatcher(threading.Thread):
+    """Thread that refreshes the scripts of the active jobs of a runner until stopped.
+
+    Args:
+        runner (Runner): The runner, whose scripts and active_scripts() are used.
+        interval (int): Seconds between checks, SCRIPT_CHECK_SECONDS by default.
+    """
+
+    def __init__(self, runner, interval=None):
+        super().__init__(name=f"scripts-{runner.worker_name}", daemon=True)
+        self.runner = runner
+        self.interval = interval or settings.SCRIPT_CHECK_SECONDS
+        self.stopped = threading.Event()
+
+    def check(self):
+        for script in self.runner.scripts.refresh(self.runner.active_scripts()):
+            if script.status == Job.ScriptStatus.OK:
+                logger.info("Script %s changed, %s", script.name, script.sha256)
+            else:
+                logger.warning(
+                    "Script %s is %s: %s", script.name, script.status, script.error
+                )
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                try:
+                    self.check()
+                except Exception:
+                    logger.exception("Check of the scripts failed")
+                self.stopped.wait(self.interval)
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stopped.set()
+        self.join()
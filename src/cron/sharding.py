@@ -0,0 +1,110 @@
+"""Consistent hashing of the jobs across several runners.
+
+Every runner is placed several times (virtual nodes) on a ring that covers the
+128 bit space of the UUIDs. A job belongs to the first virtual node found
+clockwise from its id, so when a runner joins or leaves only the jobs of the
+arcs next to its virtual nodes move, about 1/N of them.
+
+The ids of the jobs are random UUIDs, so they are used directly as positions on
+the ring. This way the shard of a runner is a set of id ranges that the database
+filters through the primary key index, and a runner never loads the jobs of the
+others.
+"""
+
+import hashlib
+import uuid
+from bisect import bisect_left
+
+from django.db.models import Q
+
+# Virtual nodes per runner. More nodes balance the shards better.
+DEFAULT_REPLICAS = 64
+
+RING_SIZE = 2**128
+
+
+def ring_position(label: str) -> int:
+    """Returns the position on the ring of a virtual node."""
+
+    return int.from_bytes(
+        hashlib.blake2b(label.encode(), digest_size=16).digest(), "big"
+    )
+
+
+class HashRing:
+    """Ring with the virtual nodes of the runners.
+
+    Args:
+        workers (Iterable[str]): The names of the runners.
+        replicas (int): The number of virtual nodes of each runner.
+    """
+
+    def __init__(self, workers, replicas=DEFAULT_REPLICAS):
+        self.workers = sorted(set(workers))
+        self.replicas = replicas
+        if not self.workers:
+            raise ValueError("A hash ring needs at least one worker")
+
+        points = sorted(
+            (ring_position(f"{worker}#{replica}"), worker)
+            for worker in self.workers
+            for replica in range(replicas)
+        )
+        self.positions = [position for position, _ in points]
+        self.owners = [worker for _, worker in points]
+
+    def worker_for(self, key: uuid.UUID) -> str:
+        """Returns the runner that owns the given job id."""
+
+        index = bisect_left(self.positions, key.int)
+        return self.owners[index % len(self.owners)]
+
+    def ranges(self, worker) -> list:
+        """Returns the arcs of the ring owned by a runner.
+
+        Returns:
+            list[tuple[int, int]]: Inclusive (first, last) positions, sorted and
+                with the adjacent arcs merged.
+        """
+
+        ranges = []
+        previous = self.positions[-1] - RING_SIZE
+
+        for position, owner in zip(self.positions, self.owners):
+            if owner == worker:
+                first = previous + 1
+                if ranges and ranges[-1][1] + 1 == first:
+                    ranges[-1] = (ranges[-1][0], position)
+                else:
+                    ranges.append((first, position))
+            previous = position
+
+        if ranges and ranges[0][0] < 0:
+            # The first arc wraps around the end of the ring.
+            first, last = ranges.pop(0)
+            if ranges and ranges[-1][1] + 1 == first + RING_SIZE:
+                ranges[-1] = (ranges[-1][0], RING_SIZE - 1)
+            else:
+                ranges.append((first + RING_SIZE, RING_SIZE - 1))
+            ranges.insert(0, (0, last))
+
+        return ranges
+
+    def shard_filter(self, worker, field="id") -> Q:
+        """Returns the filter that selects the rows owned by a runner.
+
+        Args:
+            worker (str): The name of the runner.
+            field (str): The lookup of the job id, e.g. "job_id" for schedules.
+        """
+
+        shard = Q(pk__in=[])
+        for first, last in self.ranges(worker):
+            shard |= Q(
+                **{
+                    f"{field}__gte": uuid.UUID(int=first),
+                    f"{field}__lte": uuid.UUID(int=last),
+                }
+            )
+
+        return shard
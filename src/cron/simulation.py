@@ -0,0 +1,327 @@
+"""Simulation of every execution of the job schedules over a long window.
+
+A schedule fires at the cartesian product of the days allowed by its day fields
+and the times allowed by its hour and minute fields, so the simulation never
+walks the minutes of the window one schedule at a time. Each schedule becomes a
+boolean day mask and a boolean minute-of-day mask, built with table lookups over
+the distinct field values, and the executions per minute of the whole inventory
+are the product of those matrices. Schedules with the same day or time fields
+share their masks, so the cost depends on the number of distinct patterns and
+not on the size of the inventory.
+
+Every schedule is simulated over the same calendar days in its own time zone,
+and its executions are moved to a common UTC timeline with the transition
+tables of cron.timezones. The local minutes skipped by a forward transition
+are executed at the transition together with the first minute after it, and
+like the runner a schedule fires once there however many of them it matches.
+"""
+
+from datetime import date
+
+import numpy as np
+
+from cron.schedules import FIELD_RANGES
+from cron.timezones import transition_table
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def field_table(values, field_name, columns) -> np.ndarray:
+    """Builds the lookup table of a cron field for several distinct values.
+
+    Args:
+        values (list[str]): Values of the field.
+        field_name (str): The name of the field.
+        columns (np.ndarray): The field value of every simulated day or minute.
+
+    Returns:
+        np.ndarray: Boolean matrix with one row per value and one column per
+            element of columns, True where the value allows it.
+    """
+
+    min_value, max_value = FIELD_RANGES[field_name]
+    table = np.zeros((len(values), max_value + 1), dtype=bool)
+
+    for row, value in enumerate(values):
+        if value.strip() == "*":
+            table[row, min_value:] = True
+        else:
+            table[row, [int(item) for item in value.split(",") if item]] = True
+
+    return table[:, columns]
+
+
+def intern(keys) -> tuple:
+    """Returns the distinct keys and the index of every key among them."""
+
+    index = {}
+    inverse = np.fromiter(
+        (index.setdefault(key, len(index)) for key in keys),
+        dtype=np.int64,
+        count=len(keys),
+    )
+    return list(index), inverse
+
+
+def day_fields(days) -> tuple:
+    """Returns the year, month, day of month and day of week of every day.
+
+    Args:
+        days (np.ndarray): The days, as datetime64[D].
+    """
+
+    years = days.astype("datetime64[Y]").astype(int) + 1970
+    months = days.astype("datetime64[M]").astype(int) % 12 + 1
+    days_of_month = (days - days.astype("datetime64[M]")).astype(int) + 1
+    # 1970-01-01 was a Thursday (4), the weekdays go from 1 (Monday) to 7 (Sunday).
+    days_of_week = (days.astype(int) + 3) % 7 + 1
+    return years, months, days_of_month, days_of_week
+
+
+class SimulationResult:
+    """Executions of a set of schedules over a window of whole days.
+
+    Attributes:
+        schedule_ids (list): The ids of the simulated schedules.
+        counts (np.ndarray): Executions of each schedule in the window.
+        first_minute (int): UTC epoch minute of the first element of per_minute.
+        per_minute (np.ndarray): Executions started at each UTC minute.
+        display_table (TransitionTable): Time zone in which the minutes are shown.
+    """
+
+    def __init__(self, schedule_ids, counts, first_minute, per_minute, display_table):
+        self.schedule_ids = schedule_ids
+        self.counts = counts
+        self.first_minute = first_minute
+        self.per_minute = per_minute
+        self.display_table = display_table
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def local_minutes(self) -> np.ndarray:
+        """Returns the local epoch minute of every element of per_minute."""
+
+        utc_minutes = self.first_minute + np.arange(len(self.per_minute))
+        return self.display_table.to_local(utc_minutes * 60) // 60
+
+    def per_hour(self) -> tuple:
+        """Returns the executions started at each local hour.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The hours, as datetime64[h], and the
+                executions started during each of them.
+        """
+
+        if not len(self.per_minute):
+            return np.array([], dtype="datetime64[h]"), np.array([], dtype=np.int64)
+
+        hours = self.local_minutes() // 60
+        counts = np.bincount(hours - hours.min(), weights=self.per_minute)
+        labels = (hours.min() + np.arange(len(counts))).astype("datetime64[h]")
+        return labels, counts.astype(np.int64)
+
+    def never_firing(self) -> list:
+        """Returns the ids of the schedules that do not fire inside the window."""
+
+        return [
+            schedule_id
+            for schedule_id, count in zip(self.schedule_ids, self.counts)
+            if count == 0
+        ]
+
+    def concurrency(self, duration=1) -> np.ndarray:
+        """Returns the executions running at each minute of the timeline.
+
+        Args:
+            duration (int): The minutes every execution is assumed to last.
+        """
+
+        starts = self.per_minute
+        if duration <= 1:
+            return starts
+
+        cumulative = np.concatenate(([0], np.cumsum(starts)))
+        running = cumulative[1:].copy()
+        running[duration:] -= cumulative[1 : len(starts) - duration + 1]
+        return running
+
+    def minute_at(self, index) -> np.datetime64:
+        """Returns the local datetime of an index of per_minute."""
+
+        utc_second = (self.first_minute + int(index)) * 60
+        return np.datetime64(int(self.display_table.to_local(utc_second)), "s").astype(
+            "datetime64[m]"
+        )
+
+
+def gap_minutes(table, local_minutes) -> list:
+    """Returns the local minutes of the window executed at each forward transition.
+
+    Args:
+        table (TransitionTable): The transitions of the zone.
+        local_minutes (np.ndarray): The local epoch minutes of the window.
+
+    Returns:
+        list[np.ndarray]: For every forward transition inside the window, the
+            indexes in local_minutes of the skipped minutes and of the first
+            minute after them, which the runner executes at the same instant.
+    """
+
+    gaps = []
+    for transition, before, after in zip(
+        table.transition_list, table.offset_list, table.offset_list[1:]
+    ):
+        if after <= before:
+            continue
+
+        first = (transition + before) // 60 - int(local_minutes[0])
+        indexes = np.arange(first, first + (after - before) // 60 + 1)
+        indexes = indexes[(indexes >= 0) & (indexes < len(local_minutes))]
+        if len(indexes) > 1:
+            gaps.append(indexes)
+
+    return gaps
+
+
+def simulate_local(schedules, days, gaps=()) -> tuple:
+    """Simulates the executions of schedules that share a time zone.
+
+    Args:
+        schedules (list[dict]): The schedules, with their cron fields.
+        days (np.ndarray): The simulated local days, as datetime64[D].
+        gaps (list[np.ndarray]): Groups of minutes, as indexes of the flattened
+            days x minutes of the window, where each schedule fires at most once.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The executions of each schedule and the
+            executions started at each local minute, one row per day.
+    """
+
+    years, months, days_of_month, days_of_week = day_fields(days)
+    minutes_of_day = np.arange(MINUTES_PER_DAY)
+
+    # Most schedules share their day fields or their time fields with others, so
+    # the masks are only built once per distinct combination of values.
+    day_patterns, day_inverse = intern(
+        [
+            (
+                schedule["year"],
+                schedule["month"],
+                schedule["day_of_month"],
+                schedule["day_of_week"],
+            )
+            for schedule in schedules
+        ]
+    )
+    time_patterns, time_inverse = intern(
+        [(schedule["hour"], schedule["minute"]) for schedule in schedules]
+    )
+
+    def patterns_field(patterns, position):
+        return [pattern[position] for pattern in patterns]
+
+    day_masks = (
+        field_table(patterns_field(day_patterns, 0), "year", years)
+        & field_table(patterns_field(day_patterns, 1), "month", months)
+        & field_table(patterns_field(day_patterns, 2), "day_of_month", days_of_month)
+        & field_table(patterns_field(day_patterns, 3), "day_of_week", days_of_week)
+    )
+    time_masks = field_table(
+        patterns_field(time_patterns, 0), "hour", minutes_of_day // 60
+    ) & field_table(patterns_field(time_patterns, 1), "minute", minutes_of_day % 60)
+
+    counts = (
+        day_masks.sum(axis=1, dtype=np.int64)[day_inverse]
+        * time_masks.sum(axis=1, dtype=np.int64)[time_inverse]
+    )
+
+    # Executions per minute = sum over the schedules of day_mask x time_mask,
+    # computed as day_masks.T @ pairs @ time_masks, where pairs counts the
+    # schedules of every (day pattern, time pattern) combination.
+    pairs = np.zeros((len(day_patterns), len(time_patterns)), dtype=np.float64)
+    np.add.at(pairs, (day_inverse, time_inverse), 1)
+    per_minute = (day_masks.T.astype(np.float64) @ pairs) @ time_masks.astype(
+        np.float64
+    )
+
+    per_minute = np.rint(per_minute).astype(np.int64)
+
+    for gap in gaps:
+        gap_days, gap_times = np.divmod(gap, MINUTES_PER_DAY)
+        # Minutes of the gap matched by every (day pattern, time pattern).
+        matched = day_masks[:, gap_days].astype(np.float64) @ time_masks[
+            :, gap_times
+        ].T.astype(np.float64)
+        matched = np.rint(matched).astype(np.int64)
+        counts -= np.maximum(matched - 1, 0)[day_inverse, time_inverse]
+
+        flat = per_minute.reshape(-1)
+        flat[gap] = 0
+        flat[gap[-1]] = int(np.rint(pairs[matched > 0].sum()))
+
+    return counts, per_minute
+
+
+def simulate(schedules, start: date, end: date, time_zone) -> SimulationResult:
+    """Simulates the executions of the schedules between two dates.
+
+    Args:
+        schedules (list[dict]): The schedules, with their "id", cron fields and
+            "time_zone".
+        start (date): The first simulated day.
+        end (date): The day after the last simulated day.
+        time_zone (str): The time zone in which the results are shown.
+
+    Returns:
+        SimulationResult: The executions of every schedule.
+    """
+
+    days = np.arange(np.datetime64(start, "D"), np.datetime64(end, "D"))
+    if not len(days):
+        raise ValueError("The simulation window must contain at least one day")
+
+    local_minutes = (
+        days.astype("datetime64[m]").astype(np.int64)[:, None]
+        + np.arange(MINUTES_PER_DAY)
+    ).reshape(-1)
+
+    by_zone = {}
+    for position, schedule in enumerate(schedules):
+        by_zone.setdefault(schedule["time_zone"], []).append(position)
+
+    counts = np.zeros(len(schedules), dtype=np.int64)
+    zone_minutes = []
+    zone_executions = []
+
+    for zone_name, positions in by_zone.items():
+        table = transition_table(zone_name)
+        zone_counts, per_minute = simulate_local(
+            [schedules[position] for position in positions],
+            days,
+            gap_minutes(table, local_minutes),
+        )
+        counts[positions] = zone_counts
+
+        per_minute = per_minute.reshape(-1)
+        firing = np.flatnonzero(per_minute)
+        utc_seconds = table.to_utc(local_minutes[firing] * 60)
+        zone_minutes.append(utc_seconds // 60)
+        zone_executions.append(per_minute[firing])
+
+    display_table = transition_table(time_zone)
+    window = display_table.to_utc(local_minutes[[0, -1]] * 60) // 60
+    utc_minutes = np.concatenate([window, *zone_minutes])
+    executions = np.concatenate([np.zeros(2, dtype=np.int64), *zone_executions])
+
+    first_minute = int(utc_minutes.min())
+    per_minute = np.bincount(utc_minutes - first_minute, weights=executions)
+
+    return SimulationResult(
+        schedule_ids=[schedule["id"] for schedule in schedules],
+        counts=counts,
+        first_minute=first_minute,
+        per_minute=per_minute.astype(np.int64),
+        display_table=display_table,
+    )
@@ -0,0 +1,156 @@
+from django.contrib.auth.models import User
+from django.db import connection
+from django.forms import ValidationError
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cron import bulk
+from cron.models import Job, JobSchedule
+
+
+class BulkChangesTestCase(TestCase):
+    """Test class for the set-based changes of many jobs and schedules."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.target = Job.objects.create(
+            name="Target job", owner="Sergio", script="target.py"
+        )
+        schedules = [
+            JobSchedule(job=self.job, minute=minute, hour=str(hour))
+            for hour in range(24)
+            for minute in ("0", "15,45", "*")
+        ]
+        bulk.validate_in_batch(schedules)
+        JobSchedule.objects.bulk_create(schedules)
+
+    def test_shift_minutes_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = bulk.shift_minutes(JobSchedule.objects.all(), 20)
+
+        updates = [query for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updated, 48)
+        self.assertEqual(
+            set(JobSchedule.objects.values_list("minute", flat=True)),
+            {"20", "5,35", "*"},
+        )
+
+    def test_shift_minutes_into_each_other_is_allowed(self):
+        schedules = JobSchedule.objects.filter(job=self.target)
+        for minute in ("0", "20"):
+            JobSchedule.objects.create(job=self.target, minute=minute, hour="8")
+
+        self.assertEqual(bulk.shift_minutes(schedules, 20), 2)
+        self.assertEqual(
+            sorted(schedules.values_list("minute", flat=True)), ["20", "40"]
+        )
+
+    def test_shift_minutes_onto_an_unshifted_schedule_is_rejected(self):
+        for minute in ("0", "20"):
+            JobSchedule.objects.create(job=self.target, minute=minute, hour="8")
+
+        with self.assertRaises(ValidationError):
+            bulk.shift_minutes(
+                JobSchedule.objects.filter(job=self.target, minute="0"), 20
+            )
+
+        self.assertEqual(
+            sorted(self.target.schedules.values_list("minute", flat=True)),
+            ["0", "20"],
+        )
+
+    def test_shift_minute_wraps_around_the_hour(self):
+        self.assertEqual(bulk.shift_minute("50,10", 15), "5,25")
+        self.assertEqual(bulk.shift_minute("5", -10), "55")
+        self.assertEqual(bulk.shift_minute("*", 10), "*")
+
+    def test_set_enabled_is_a_single_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            updated = bulk.set_enabled(JobSchedule.objects.filter(minute="0"), False)
+
+        updates = [query for query in queries if query["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(updated, 24)
+        self.assertEqual(JobSchedule.objects.filter(enabled=False).count(), 24)
+
+    def test_clone_schedules_to_another_job(self):
+        cloned = bulk.clone_schedules(
+            JobSchedule.objects.filter(job=self.job), self.target
+        )
+
+        self.assertEqual(cloned, 72)
+        self.assertEqual(self.target.schedules.count(), 72)
+
+    def test_clone_schedules_skips_the_existing_ones(self):
+        bulk.clone_schedules(JobSchedule.objects.filter(job=self.job), self.target)
+        cloned = bulk.clone_schedules(
+            JobSchedule.objects.filter(job=self.job), self.target
+        )
+
+        self.assertEqual(cloned, 0)
+        self.assertEqual(self.target.schedules.count(), 72)
+
+    def test_shift_minutes_keeps_the_expression_hash_up_to_date(self):
+        bulk.shift_minutes(JobSchedule.objects.all(), 30)
+
+        for schedule in JobSchedule.objects.all():
+            expected = schedule.expression_hash
+            schedule.normalize_fields()
+            self.assertEqual(schedule.expression_hash, expected)
+
+    def test_reassign_owner_validates_the_owner_once(self):
+        with self.assertRaises(ValidationError):
+            bulk.reassign_owner(Job.objects.all(), "x" * 256)
+
+        bulk.reassign_owner(Job.objects.all(), "Laura")
+        self.assertEqual(set(Job.objects.values_list("owner", flat=True)), {"Laura"})
+
+
+class BulkActionsAdminTestCase(TestCase):
+    """Test class for the bulk actions of the admin."""
+
+    def setUp(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(user)
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.schedule = JobSchedule.objects.create(job=self.job, minute="10")
+
+    def test_shift_minutes_action(self):
+        self.client.post(
+            reverse("admin:cron_jobschedule_changelist"),
+            {
+                "action": "shift_minutes",
+                "_selected_action": [self.schedule.pk],
+                "minutes": "-15",
+            },
+        )
+
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.minute, "55")
+
+    def test_clone_action_requires_an_existing_job(self):
+        self.client.post(
+            reverse("admin:cron_jobschedule_changelist"),
+            {
+                "action": "clone_to_job",
+                "_selected_action": [self.schedule.pk],
+                "target_job": "Missing job",
+            },
+        )
+
+        self.assertEqual(JobSchedule.objects.count(), 1)
+
+    def test_disable_jobs_action(self):
+        self.client.post(
+            reverse("admin:cron_job_changelist"),
+            {"action": "disable", "_selected_action": [self.job.pk]},
+        )
+
+        self.job.refresh_from_db()
+        self.assertFalse(self.job.enabled)
@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from cron.models import Job, JobSchedule
+
+
+class JobScheduleFormTestCase(TestCase):
+    """Test class for the validation of the schedules in the admin."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        JobSchedule.objects.create(job=self.job, minute="1,2", hour="8")
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+    def post(self, **fields):
+        return self.client.post(
+            reverse("admin:cron_jobschedule_add"),
+            {
+                "job": self.job.pk,
+                "description": "",
+                "minute": "*",
+                "hour": "*",
+                "day_of_month": "*",
+                "month": "*",
+                "day_of_week": "*",
+                "year": "*",
+                "time_zone": "America/Bogota",
+                "enabled": "on",
+                **fields,
+            },
+        )
+
+    def test_equivalent_schedule_is_a_form_error(self):
+        response = self.post(minute="2,1", hour="8")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["adminform"].form.non_field_errors())
+        self.assertEqual(JobSchedule.objects.count(), 1)
+
+    def test_different_schedule_is_saved(self):
+        response = self.post(minute="2,3", hour="8")
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(JobSchedule.objects.count(), 2)
+
+    def test_invalid_field_is_reported_on_the_field(self):
+        response = self.post(minute="61")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context["adminform"].form.errors)
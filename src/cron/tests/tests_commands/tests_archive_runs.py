@@ -0,0 +1,128 @@
+import tempfile
+import zipfile
+from datetime import datetime, timezone
+from io import StringIO
+from pathlib import Path
+
+import numpy as np
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from cron.archive import as_uuid, map_column, read_runs
+from cron.models import Job, JobRun
+
+
+class ArchiveRunsTestCase(TestCase):
+    """Test class for the columnar archive of the old runs."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+        override = override_settings(RUN_ARCHIVE_DIR=self.directory)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.jobs = [
+            Job.objects.create(
+                name=f"Job {index}", owner="Sergio", script=f"{index}.py"
+            )
+            for index in range(2)
+        ]
+
+    def create_run(self, job, month, day, status=JobRun.Status.SUCCEEDED, **fields):
+        return JobRun.objects.create(
+            job=job,
+            scheduled_for=datetime(2030, month, day, 8, 30, 0, 15, tzinfo=timezone.utc),
+            status=status,
+            worker="worker-1",
+            **fields,
+        )
+
+    def archive(self, before="2030-03-01", **options):
+        output = StringIO()
+        call_command("archive_runs", f"--before={before}", stdout=output, **options)
+        return output.getvalue()
+
+    def test_old_finished_runs_are_moved_to_monthly_partitions(self):
+        old = self.create_run(self.jobs[0], 1, 5, exit_code=0)
+        self.create_run(self.jobs[1], 2, 10, status=JobRun.Status.FAILED, exit_code=2)
+        running = self.create_run(self.jobs[0], 2, 11, status=JobRun.Status.RUNNING)
+        recent = self.create_run(self.jobs[0], 3, 1)
+
+        self.assertIn("2 runs before 2030-03-01 archived", self.archive())
+
+        self.assertEqual(
+            set(JobRun.objects.values_list("pk", flat=True)), {running.pk, recent.pk}
+        )
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            ["runs-2030-01.npz", "runs-2030-02.npz"],
+        )
+
+        runs = read_runs()
+        self.assertEqual(as_uuid(runs["id"][0]), old.pk)
+        self.assertEqual(
+            runs["scheduled_for"][0],
+            np.datetime64(old.scheduled_for.replace(tzinfo=None), "us"),
+        )
+        self.assertEqual(list(runs["status"]), ["succeeded", "failed"])
+        self.assertEqual(list(runs["exit_code"]), [0, 2])
+        self.assertIsNone(as_uuid(runs["schedule_id"][0]))
+
+    def test_reader_filters_by_job_and_time_range(self):
+        for month, day in ((1, 5), (1, 20), (2, 10)):
+            for job in self.jobs:
+                self.create_run(job, month, day)
+        self.archive()
+
+        runs = read_runs(
+            job_id=self.jobs[1].pk,
+            start=datetime(2030, 1, 10, tzinfo=timezone.utc),
+            end=datetime(2030, 3, 1, tzinfo=timezone.utc),
+            columns=["job_id", "scheduled_for"],
+        )
+
+        self.assertEqual(set(runs), {"job_id", "scheduled_for"})
+        self.assertEqual(len(runs["job_id"]), 2)
+        self.assertTrue(
+            all(as_uuid(job_id) == self.jobs[1].pk for job_id in runs["job_id"])
+        )
+
+    def test_archiving_the_same_month_again_appends_to_its_partition(self):
+        self.create_run(self.jobs[0], 1, 5)
+        self.archive(before="2030-01-10")
+        self.create_run(self.jobs[0], 1, 20)
+        self.archive(before="2030-02-01")
+
+        self.assertEqual(len(read_runs()["id"]), 2)
+
+    def test_partition_maps_the_stored_columns(self):
+        run = self.create_run(self.jobs[0], 1, 5)
+        self.archive()
+        path = self.directory / "runs-2030-01.npz"
+
+        with zipfile.ZipFile(path) as partition:
+            compression = {
+                member.filename: member.compress_type for member in partition.infolist()
+            }
+        job_ids = map_column(path, "job_id")
+
+        self.assertEqual(compression.pop("job_id.npy"), zipfile.ZIP_STORED)
+        self.assertEqual(compression.pop("scheduled_for.npy"), zipfile.ZIP_STORED)
+        self.assertEqual(set(compression.values()), {zipfile.ZIP_DEFLATED})
+        self.assertIsInstance(job_ids, np.memmap)
+        self.assertEqual([as_uuid(job_id) for job_id in job_ids], [run.job_id])
+        self.assertEqual(
+            map_column(path, "scheduled_for")[0],
+            np.datetime64(run.scheduled_for.replace(tzinfo=None), "us"),
+        )
+
+    def test_dry_run_keeps_the_runs(self):
+        self.create_run(self.jobs[0], 1, 5)
+
+        self.assertIn(
+            "1 runs before 2030-03-01 would be archived", self.archive(dry_run=True)
+        )
+        self.assertEqual(JobRun.objects.count(), 1)
+        self.assertEqual(list(self.directory.iterdir()), [])
@@ -0,0 +1,48 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from cron.management.commands.import_report import (
+    ImportTime,
+    measure_imports,
+    parse_importtime,
+)
+
+IMPORTTIME_OUTPUT = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:       300 |        420 |   io
+import time:      1000 |       1420 | cron.runner
+Traceback lines are ignored
+"""
+
+
+class ImportReportTestCase(SimpleTestCase):
+    """Test class for the import time report of the settings profiles."""
+
+    def test_parse_importtime(self):
+        self.assertEqual(
+            parse_importtime(IMPORTTIME_OUTPUT),
+            [
+                ImportTime("_io", 120, 120, 2),
+                ImportTime("io", 300, 420, 1),
+                ImportTime("cron.runner", 1000, 1420, 0),
+            ],
+        )
+
+    def test_worker_profile_does_not_import_the_admin_nor_numpy(self):
+        imports = measure_imports("scheduler.settings_worker", ["cron.runner"])
+        modules = {item.module for item in imports}
+
+        self.assertIn("cron.runner", modules)
+        self.assertNotIn("django.contrib.admin", modules)
+        self.assertNotIn("numpy", modules)
+
+    def test_report_lists_every_profile(self):
+        output = StringIO()
+
+        call_command(
+            "import_report", profiles=["scheduler.settings_worker"], stdout=output
+        )
+
+        self.assertIn("scheduler.settings_worker:", output.getvalue())
@@ -0,0 +1,112 @@
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from cron.lint import DUPLICATE, NEVER_FIRES, OVERLAP, lint_schedules
+from cron.models import Job, JobMetricsSnapshot, JobSchedule
+
+
+class LintSchedulesTestCase(TestCase):
+    """Test class for the checks of the whole inventory of schedules."""
+
+    today = date(2030, 1, 1)
+
+    def setUp(self):
+        self.job = Job.objects.create(name="Job", owner="Sergio", script="job.py")
+
+    def create_schedule(self, job=None, **fields):
+        return JobSchedule.objects.create(job=job or self.job, **fields)
+
+    def lint(self):
+        return {
+            (finding.kind, finding.schedule_id)
+            for finding in lint_schedules(today=self.today)
+        }
+
+    def test_dates_that_never_come_are_found(self):
+        february_30 = self.create_schedule(minute="0", day_of_month="30", month="2")
+        past_year = self.create_schedule(minute="5", year="2029")
+        # Friday 13 of a month and February 29 come again, only not every year.
+        self.create_schedule(minute="10", day_of_month="13", day_of_week="5")
+        self.create_schedule(minute="15", day_of_month="29", month="2", year="2032")
+        # The only Monday February 29 of the next 400 years at least once.
+        self.create_schedule(minute="20", day_of_month="29", month="2", day_of_week="1")
+
+        self.assertEqual(
+            self.lint(), {(NEVER_FIRES, february_30.pk), (NEVER_FIRES, past_year.pk)}
+        )
+
+    def test_leap_day_in_a_year_that_is_not_leap_never_fires(self):
+        schedule = self.create_schedule(
+            minute="0", day_of_month="29", month="2", year="2031"
+        )
+
+        self.assertEqual(self.lint(), {(NEVER_FIRES, schedule.pk)})
+
+    def test_schedules_with_the_same_instants_are_duplicates(self):
+        original = self.create_schedule(minute="0", hour="8", time_zone="UTC")
+        copy = self.create_schedule(minute="0", hour="8", time_zone="Etc/UTC")
+        self.create_schedule(minute="0", hour="8", time_zone="America/Bogota")
+        other_job = Job.objects.create(name="Otro", owner="Sergio", script="otro.py")
+        self.create_schedule(job=other_job, minute="0", hour="8", time_zone="UTC")
+
+        # The one of the pair that comes last in the inventory is reported.
+        self.assertEqual(self.lint(), {(DUPLICATE, max(original.pk, copy.pk))})
+
+    def test_schedules_starting_within_the_runtime_overlap(self):
+        first = self.create_schedule(minute="0", hour="8")
+        second = self.create_schedule(minute="5", hour="8")
+        self.create_schedule(minute="30", hour="8")
+
+        self.assertEqual(self.lint(), set())
+
+        JobMetricsSnapshot.objects.create(
+            job=self.job,
+            worker="worker-1",
+            taken_at=timezone.now(),
+            samples=10,
+            duration_p95=6 * 60,
+        )
+
+        # The one of the pair that comes last in the inventory is reported.
+        self.assertEqual(self.lint(), {(OVERLAP, max(first.pk, second.pk))})
+
+    def test_schedules_on_different_days_do_not_overlap(self):
+        self.create_schedule(minute="0", hour="8", day_of_week="1")
+        self.create_schedule(minute="0", hour="8", day_of_week="2")
+        other_job = Job.objects.create(name="Otro", owner="Sergio", script="otro.py")
+        self.create_schedule(job=other_job, minute="0", hour="8", year="2030")
+        self.create_schedule(job=other_job, minute="0", hour="8", year="2031")
+
+        self.assertEqual(self.lint(), set())
+
+    def test_command_reports_and_fails(self):
+        schedule = self.create_schedule(minute="0", day_of_month="31", month="4")
+        output = StringIO()
+
+        call_command("lint_schedules", stdout=output)
+
+        self.assertIn("Schedules that never fire: 1", output.getvalue())
+        self.assertIn(str(schedule.pk), output.getvalue())
+        with self.assertRaises(CommandError):
+            call_command("lint_schedules", "--fail", stdout=StringIO())
+
+    def test_admin_shows_the_findings(self):
+        schedule = self.create_schedule(minute="0", day_of_month="31", month="4")
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+        response = self.client.get(reverse("admin:cron_jobschedule_lint"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, str(schedule.pk))
+        self.assertContains(
+            self.client.get(reverse("admin:cron_jobschedule_changelist")),
+            reverse("admin:cron_jobschedule_lint"),
+        )
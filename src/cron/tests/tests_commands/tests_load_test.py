@@ -0,0 +1,56 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+
+from cron.loadtest import generate_population, replay
+from cron.models import Job, JobSchedule
+
+
+class GenerateJobsTestCase(TestCase):
+    """Test class for the synthetic populations of jobs and schedules."""
+
+    def test_command_creates_the_jobs_with_their_schedules(self):
+        output = StringIO()
+
+        call_command("generate_jobs", jobs=50, seed=1, batch_size=20, stdout=output)
+
+        self.assertEqual(Job.objects.count(), 50)
+        self.assertIn("50 jobs", output.getvalue())
+        self.assertFalse(JobSchedule.objects.filter(expression_hash="").exists())
+
+    def test_population_is_clustered_at_the_top_of_the_hour(self):
+        generate_population(200, owners=20, seed=1)
+
+        top_of_hour = JobSchedule.objects.filter(minute="0").count()
+        self.assertGreater(top_of_hour, JobSchedule.objects.count() / 2)
+
+        owners = Job.objects.values("owner").annotate(jobs=Count("id"))
+        largest = max(owner["jobs"] for owner in owners)
+        self.assertGreater(largest, 200 / 20 * 2)
+
+    def test_population_can_be_grown(self):
+        generate_population(10, seed=1)
+        generate_population(10, seed=1)
+
+        self.assertEqual(Job.objects.count(), 20)
+
+
+class ReplayTestCase(TestCase):
+    """Test class for the replayed admin and API traffic."""
+
+    def test_replay_measures_every_request(self):
+        generate_population(20, seed=1)
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+        report = replay(self.client, 30, rate=1000, seed=1)
+
+        self.assertGreater(report.pop("rate"), 0)
+        self.assertEqual(sum(stats["requests"] for stats in report.values()), 30)
+        for label, stats in report.items():
+            self.assertEqual(stats["errors"], 0, label)
+            self.assertGreater(stats["queries_max"], 0, label)
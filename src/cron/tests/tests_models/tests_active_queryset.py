@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.test import TestCase
+
+from cron.models import Job, JobSchedule
+from cron.runner import Runner
+
+
+class ActiveQuerySetTestCase(TestCase):
+    """Test class for the active() filter of the jobs and schedules."""
+
+    def setUp(self):
+        self.now = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.schedule = JobSchedule.objects.create(job=self.job, minute="*")
+
+    def test_enabled_schedule_is_active(self):
+        self.assertQuerySetEqual(JobSchedule.objects.active(self.now), [self.schedule])
+
+    def test_disabled_schedule_is_not_active(self):
+        JobSchedule.objects.update(enabled=False)
+
+        self.assertFalse(JobSchedule.objects.active(self.now).exists())
+
+    def test_schedule_of_a_disabled_job_is_not_active(self):
+        Job.objects.update(enabled=False)
+
+        self.assertFalse(Job.objects.active(self.now).exists())
+        self.assertFalse(JobSchedule.objects.active(self.now).exists())
+
+    def test_paused_schedule_is_active_after_the_pause(self):
+        JobSchedule.objects.update(paused_until=self.now + timedelta(hours=1))
+
+        self.assertFalse(JobSchedule.objects.active(self.now).exists())
+        self.assertTrue(
+            JobSchedule.objects.active(self.now + timedelta(hours=1)).exists()
+        )
+
+    def test_schedule_of_a_paused_job_is_not_active(self):
+        Job.objects.update(paused_until=self.now + timedelta(days=1))
+
+        self.assertFalse(JobSchedule.objects.active(self.now).exists())
+
+    @mock.patch.object(Runner, "execute")
+    def test_runner_does_not_dispatch_paused_schedules(self, execute):
+        JobSchedule.objects.update(paused_until=self.now + timedelta(minutes=1))
+        runner = Runner(worker_name="worker-1")
+
+        self.assertEqual(runner.tick(self.now), [])
+        self.assertEqual(len(runner.tick(self.now + timedelta(minutes=1))), 1)
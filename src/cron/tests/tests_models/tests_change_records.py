@@ -0,0 +1,127 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.forms import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from cron import bulk
+from cron.audit import acting_as
+from cron.models import ChangeRecord, Job, JobSchedule
+
+
+class ChangeRecordTestCase(TestCase):
+    """Test class for the change records of the jobs and schedules."""
+
+    def setUp(self):
+        with acting_as("sergio"):
+            self.job = Job.objects.create(
+                name="Test job name", owner="Sergio", script="test_script.py"
+            )
+
+    def test_creation_is_recorded_with_the_actor(self):
+        record = ChangeRecord.objects.get(object_id=self.job.pk)
+
+        self.assertEqual(record.action, ChangeRecord.Action.CREATED)
+        self.assertEqual(record.actor, "sergio")
+        self.assertEqual(record.changes["owner"], [None, "Sergio"])
+
+    def test_only_the_changed_fields_are_recorded(self):
+        job = Job.objects.get(pk=self.job.pk)
+        job.owner = "Laura"
+        job.save()
+
+        record = ChangeRecord.objects.filter(object_id=job.pk).first()
+        self.assertEqual(record.action, ChangeRecord.Action.CHANGED)
+        self.assertEqual(record.changes, {"owner": ["Sergio", "Laura"]})
+
+    def test_saving_without_changes_is_not_recorded(self):
+        Job.objects.get(pk=self.job.pk).save()
+
+        self.assertEqual(ChangeRecord.objects.filter(object_id=self.job.pk).count(), 1)
+
+    def test_schedule_changes_reference_the_job_by_id(self):
+        schedule = JobSchedule.objects.create(job=self.job, minute="5")
+        schedule.minute = "10"
+        schedule.save()
+
+        records = ChangeRecord.objects.filter(object_id=schedule.pk)
+        self.assertEqual(records[0].changes, {"minute": ["5", "10"]})
+        self.assertEqual(records[1].changes["job"], [None, str(self.job.pk)])
+
+    def test_bulk_changes_record_only_the_changed_rows(self):
+        Job.objects.create(name="Other job", owner="Laura", script="other.py")
+
+        bulk.reassign_owner(Job.objects.all(), "Laura")
+
+        changed = ChangeRecord.objects.filter(action=ChangeRecord.Action.CHANGED)
+        self.assertEqual(changed.get().object_id, self.job.pk)
+
+    def test_bulk_deletion_is_recorded(self):
+        bulk.delete_recorded(Job.objects.all())
+
+        self.assertTrue(
+            ChangeRecord.objects.filter(
+                object_id=self.job.pk, action=ChangeRecord.Action.DELETED
+            ).exists()
+        )
+
+    def test_records_are_append_only(self):
+        record = ChangeRecord.objects.get()
+        record.actor = "someone else"
+
+        with self.assertRaises(ValidationError):
+            record.save()
+        with self.assertRaises(ValidationError):
+            record.delete()
+
+
+class ChangeHistoryAdminTestCase(TestCase):
+    """Test class for the history view of the admin."""
+
+    def setUp(self):
+        user = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(user)
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        now = timezone.now()
+        ChangeRecord.objects.bulk_create(
+            ChangeRecord(
+                model="job",
+                object_id=self.job.pk,
+                action=ChangeRecord.Action.CHANGED,
+                changes={"max_instances": [index, index + 1]},
+                changed_at=now + timedelta(minutes=index),
+            )
+            for index in range(60)
+        )
+        self.url = reverse("admin:cron_job_history", args=[self.job.pk])
+
+    def test_history_pages_follow_the_cursor(self):
+        first = self.client.get(self.url)
+        second = self.client.get(self.url, {"before": first.context["next_cursor"]})
+
+        self.assertEqual(len(first.context["records"]), 50)
+        self.assertEqual(len(second.context["records"]), 11)
+        self.assertIsNone(second.context["next_cursor"])
+        self.assertEqual(
+            first.context["records"][0].changes, {"max_instances": [59, 60]}
+        )
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"before": "yesterday"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_admin_changes_are_recorded_with_the_username(self):
+        self.client.post(
+            reverse("admin:cron_job_changelist"),
+            {"action": "disable", "_selected_action": [self.job.pk]},
+        )
+
+        record = ChangeRecord.objects.get(
+            action=ChangeRecord.Action.CHANGED, changes__has_key="enabled"
+        )
+        self.assertEqual(record.actor, "admin")
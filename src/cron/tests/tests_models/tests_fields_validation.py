@@ -33,7 +33,7 @@ class JobScheduleValidateModelFieldsTestCase(TestCase):
             minute=field_value,
         )
 
-        self.assertEquals(self.job_schedule.minute, field_value)
+        self.assertEquals(self.job_schedule.minute, "1,2,3,4,5")
 
     def test_validate_minute_with_asterisk(self):
         field_value = "*"
@@ -335,3 +335,32 @@ class JobScheduleValidateModelFieldsTestCase(TestCase):
                 description="Test description",
                 year=field_value,
             )
+
+    def test_validate_time_zone_with_default(self):
+        self.job_schedule = JobSchedule.objects.create(
+            job=self.job,
+            description="Test description",
+        )
+
+        self.assertEquals(self.job_schedule.time_zone, "America/Bogota")
+
+    def test_validate_time_zone_with_dst_zone(self):
+        field_value = "America/New_York"
+
+        self.job_schedule = JobSchedule.objects.create(
+            job=self.job,
+            description="Test description",
+            time_zone=field_value,
+        )
+
+        self.assertEquals(self.job_schedule.time_zone, field_value)
+
+    def test_validate_time_zone_with_unknown_zone(self):
+        field_value = "America/Atlantis"
+
+        with self.assertRaises(ValidationError):
+            self.job_schedule = JobSchedule.objects.create(
+                job=self.job,
+                description="Test description",
+                time_zone=field_value,
+            )
@@ -0,0 +1,80 @@
+from importlib import import_module
+
+from django.apps import apps
+from django.forms import ValidationError
+from django.test import TestCase
+
+from cron.models import Job, JobSchedule
+from cron.schedules import normalize_field
+
+normalization_migration = import_module(
+    "cron.migrations.0013_jobschedule_expression_hash"
+)
+
+
+class NormalizeFieldTestCase(TestCase):
+    """Test class for the canonical form of the cron fields."""
+
+    def test_values_are_deduplicated_and_sorted(self):
+        self.assertEqual(normalize_field("3,2,1,1", "minute"), "1,2,3")
+
+    def test_empty_items_are_dropped(self):
+        self.assertEqual(normalize_field("1,,5,", "hour"), "1,5")
+
+    def test_every_value_collapses_to_asterisk(self):
+        self.assertEqual(normalize_field("7,6,5,4,3,2,1", "day_of_week"), "*")
+        self.assertEqual(normalize_field(",".join(map(str, range(60))), "minute"), "*")
+
+    def test_field_without_values_stays_empty(self):
+        self.assertEqual(normalize_field("", "month"), "")
+
+
+class ScheduleDeduplicationTestCase(TestCase):
+    """Test class for the rejection of duplicate schedules of a job."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.schedule = JobSchedule.objects.create(
+            job=self.job, minute="1,2,3", hour="8"
+        )
+
+    def test_equivalent_schedule_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "ya existe"):
+            JobSchedule.objects.create(job=self.job, minute="3,2,1,1", hour="8")
+
+    def test_same_expression_in_another_time_zone_is_allowed(self):
+        JobSchedule.objects.create(
+            job=self.job, minute="1,2,3", hour="8", time_zone="Europe/Madrid"
+        )
+
+        self.assertEqual(self.job.schedules.count(), 2)
+
+    def test_identical_schedules_share_the_hash(self):
+        other_job = Job.objects.create(name="Other job", owner="Sergio", script="o.py")
+        other = JobSchedule.objects.create(job=other_job, minute="3,1,2", hour="8")
+
+        self.assertEqual(other.expression_hash, self.schedule.expression_hash)
+
+    def test_migration_normalizes_the_fields(self):
+        JobSchedule.objects.filter(pk=self.schedule.pk).update(
+            minute="3,2,1,1", expression_hash="old"
+        )
+
+        normalization_migration.normalize_schedules(apps, None)
+
+        schedule = JobSchedule.objects.get()
+        self.assertEqual(schedule.minute, "1,2,3")
+        self.assertEqual(schedule.expression_hash, self.schedule.expression_hash)
+
+    def test_migration_lists_the_duplicates_instead_of_deleting_them(self):
+        duplicate = JobSchedule.objects.create(
+            job=self.job, minute="4", hour="8", description="Duplicate"
+        )
+        JobSchedule.objects.filter(pk=duplicate.pk).update(minute="1,2,3,3")
+
+        with self.assertRaisesMessage(RuntimeError, str(duplicate.pk)):
+            normalization_migration.normalize_schedules(apps, None)
+
+        self.assertEqual(JobSchedule.objects.count(), 2)
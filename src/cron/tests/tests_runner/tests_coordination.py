@@ -0,0 +1,128 @@
+import threading
+from datetime import datetime
+from unittest import mock, skipIf, skipUnless
+from zoneinfo import ZoneInfo
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+
+from cron.coordination import COORDINATION_LEADER, LeaderLock, claim_occurrence
+from cron.models import Job, JobRun, JobSchedule
+from cron.runner import Runner
+
+
+class ClaimOccurrenceTestCase(TestCase):
+    """Test class for the exactly once claim of the schedule occurrences."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.job_schedule = JobSchedule.objects.create(job=self.job, minute="*")
+        self.moment = datetime(2030, 1, 1, 8, 0, tzinfo=ZoneInfo("UTC"))
+
+    def test_claim_occurrence_only_once(self):
+        first = claim_occurrence(self.job_schedule, self.moment, "worker-1")
+        second = claim_occurrence(self.job_schedule, self.moment, "worker-2")
+
+        self.assertIsNotNone(first)
+        self.assertIsNone(second)
+        self.assertEqual(JobRun.objects.get().worker, "worker-1")
+
+    @mock.patch.object(Runner, "execute")
+    def test_runners_dispatch_each_occurrence_once(self, execute):
+        runners = [Runner(worker_name=f"worker-{index}") for index in range(3)]
+
+        runs = [run for runner in runners for run in runner.tick(self.moment)]
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(JobRun.objects.count(), 1)
+
+    @mock.patch.object(Runner, "execute")
+    def test_runner_skips_schedules_that_do_not_fire(self, execute):
+        JobSchedule.objects.filter(pk=self.job_schedule.pk).update(minute="30")
+
+        runs = Runner(worker_name="worker-1").tick(self.moment)
+
+        self.assertEqual(runs, [])
+
+
+class LeaderLockTestCase(TransactionTestCase):
+    """Test class for the leader election between runners sharing a database.
+
+    Every runner runs in its own thread, so it has its own database session as
+    if it were another process.
+    """
+
+    def run_in_session(self, function, *args):
+        """Runs a function in a new thread, with its own database session."""
+
+        result = []
+
+        def target():
+            try:
+                result.append(function(*args))
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=target)
+        thread.start()
+        thread.join()
+        return result[0]
+
+    @skipIf(connection.vendor == "postgresql", "PostgreSQL supports the lock")
+    def test_leader_mode_requires_postgresql(self):
+        with self.assertRaises(ImproperlyConfigured):
+            LeaderLock()
+
+    @skipUnless(connection.vendor == "postgresql", "Advisory locks of PostgreSQL")
+    def test_only_one_session_holds_the_lock(self):
+        leader = LeaderLock()
+        self.assertTrue(leader.acquire())
+        self.assertTrue(leader.acquire())
+
+        self.assertFalse(self.run_in_session(lambda: LeaderLock().acquire()))
+
+        leader.release()
+        self.assertTrue(self.run_in_session(lambda: LeaderLock().acquire()))
+
+    @skipUnless(connection.vendor == "postgresql", "Advisory locks of PostgreSQL")
+    def test_lock_is_released_when_the_leader_session_ends(self):
+        leader = LeaderLock()
+        leader.acquire()
+        connection.close()
+
+        self.assertTrue(self.run_in_session(lambda: LeaderLock().acquire()))
+
+    @skipUnless(connection.vendor == "postgresql", "Advisory locks of PostgreSQL")
+    @mock.patch.object(Runner, "execute")
+    def test_only_the_leader_dispatches(self, execute):
+        job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        JobSchedule.objects.create(job=job, minute="*")
+        moment = datetime(2030, 1, 1, 8, 0, tzinfo=ZoneInfo("UTC"))
+        barrier = threading.Barrier(3, timeout=30)
+        results = {}
+
+        def tick(name):
+            runner = Runner(worker_name=name, coordination=COORDINATION_LEADER)
+            try:
+                results[name] = (len(runner.tick(moment)), runner.leader_lock.held)
+                # The sessions stay open until every runner has ticked.
+                barrier.wait()
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=tick, args=(f"worker-{index}",))
+            for index in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results.values()), [(0, False), (0, False), (1, True)])
+        self.assertEqual(JobRun.objects.count(), 1)
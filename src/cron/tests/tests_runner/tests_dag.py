@@ -0,0 +1,95 @@
+import tempfile
+from datetime import datetime, timezone
+
+from django.forms import ValidationError
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from cron.dag import DagRun
+from cron.models import Job, JobDependency, JobRun, JobSchedule
+from cron.runner import Runner
+
+
+class DagRunTestCase(SimpleTestCase):
+    """Test class for the incremental readiness of the dependent jobs."""
+
+    def setUp(self):
+        # a -> b -> d and a -> c -> d
+        self.edges = {"a": ["b", "c"], "b": ["d"], "c": ["d"]}
+
+    def test_dependent_runs_after_every_upstream_succeeds(self):
+        dag_run = DagRun(self.edges, "a")
+
+        self.assertEqual(dag_run.complete("a", True), ["b", "c"])
+        self.assertEqual(dag_run.complete("b", True), [])
+        self.assertEqual(dag_run.complete("c", True), ["d"])
+
+    def test_failed_job_skips_its_dependents(self):
+        dag_run = DagRun(self.edges, "a")
+        dag_run.complete("a", True)
+
+        self.assertEqual(dag_run.complete("b", False), [])
+        self.assertEqual(dag_run.complete("c", True), [])
+
+    def test_upstreams_outside_the_dag_run_are_not_waited_for(self):
+        dag_run = DagRun(self.edges, "c")
+
+        self.assertEqual(dag_run.complete("c", True), ["d"])
+
+
+class JobDependencyValidationTestCase(TestCase):
+    """Test class for the cycle detection of the job dependencies."""
+
+    def setUp(self):
+        self.jobs = [
+            Job.objects.create(
+                name=f"Job {index}", owner="Sergio", script=f"{index}.py"
+            )
+            for index in range(3)
+        ]
+        JobDependency.objects.create(upstream=self.jobs[0], downstream=self.jobs[1])
+        JobDependency.objects.create(upstream=self.jobs[1], downstream=self.jobs[2])
+
+    def test_dependency_closing_a_cycle_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "creates a cycle"):
+            JobDependency.objects.create(upstream=self.jobs[2], downstream=self.jobs[0])
+
+    def test_dependency_on_itself_is_rejected(self):
+        with self.assertRaisesMessage(ValidationError, "creates a cycle"):
+            JobDependency.objects.create(upstream=self.jobs[0], downstream=self.jobs[0])
+
+    def test_dependency_of_an_unsaved_job_is_not_a_cycle(self):
+        JobDependency(upstream=self.jobs[2]).validate_acyclic()
+        JobDependency(downstream=self.jobs[0]).validate_acyclic()
+        JobDependency().validate_acyclic()
+
+
+class ImmediatePool:
+    def submit(self, function, *args):
+        function(*args)
+
+
+class SucceedingExecutor:
+    def run(self, script, output=None, compiled=None):
+        return 0
+
+
+@override_settings(JOB_LOGS_DIR=tempfile.gettempdir())
+class RunnerDependenciesTestCase(TestCase):
+    """Test class for the dispatch of the dependent jobs by the runner."""
+
+    def test_dependents_run_after_the_scheduled_run(self):
+        upstream = Job.objects.create(name="Upstream", owner="Sergio", script="a.py")
+        downstream = Job.objects.create(
+            name="Downstream", owner="Sergio", script="b.py"
+        )
+        JobDependency.objects.create(upstream=upstream, downstream=downstream)
+        JobSchedule.objects.create(job=upstream, minute="*")
+
+        runner = Runner(worker_name="worker-1")
+        runner.pool = ImmediatePool()
+        runner.executor = SucceedingExecutor()
+        runner.tick(datetime(2030, 1, 1, 8, tzinfo=timezone.utc))
+
+        dependent = JobRun.objects.get(job=downstream)
+        self.assertEqual(dependent.triggered_by.job, upstream)
+        self.assertEqual(dependent.status, JobRun.Status.SUCCEEDED)
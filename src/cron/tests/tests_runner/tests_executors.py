@@ -0,0 +1,75 @@
+import io
+import tempfile
+from pathlib import Path
+
+from django.test import SimpleTestCase
+
+from cron.executors import ForkserverExecutor, SubprocessExecutor
+from cron.scripts import inspect_script
+
+
+class ExecutorsTestCase(SimpleTestCase):
+    """Test class for the executors of the job scripts."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # The forkserver is shared by the whole process, so every test uses the
+        # same preload modules.
+        cls.forkserver_executor = ForkserverExecutor(preload_modules=["colorsys"])
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_script(self, content) -> Path:
+        script = Path(self.directory.name) / "script.py"
+        script.write_text(content)
+        return script
+
+    def test_subprocess_executor_returns_exit_code(self):
+        script = self.write_script("import sys\nsys.exit(3)\n")
+
+        self.assertEqual(SubprocessExecutor().run(script), 3)
+
+    def test_forkserver_executor_returns_exit_code(self):
+        executor = self.forkserver_executor
+
+        self.assertEqual(executor.run(self.write_script("x = 1\n")), 0)
+        self.assertEqual(executor.run(self.write_script("raise ValueError\n")), 1)
+
+    def test_forkserver_executor_inherits_preloaded_modules(self):
+        executor = self.forkserver_executor
+        script = self.write_script(
+            "import sys\nsys.exit(0 if 'colorsys' in sys.modules else 5)\n"
+        )
+
+        self.assertEqual(executor.run(script), 0)
+
+    def test_forkserver_executor_with_missing_script(self):
+        with self.assertRaises(FileNotFoundError):
+            self.forkserver_executor.run(Path(self.directory.name) / "missing.py")
+
+    def test_executors_capture_stdout_and_stderr(self):
+        script = self.write_script(
+            "import sys\nprint('out', flush=True)\nsys.stderr.write('err')\n"
+        )
+
+        for executor in (SubprocessExecutor(), self.forkserver_executor):
+            output = io.BytesIO()
+
+            self.assertEqual(executor.run(script, output), 0)
+            self.assertEqual(output.getvalue(), b"out\nerr")
+
+    def test_executors_run_the_bytecode_as_the_script(self):
+        script = self.write_script(
+            "import os, sys\n"
+            "sys.exit(0 if __file__ == sys.argv[0] == os.path.abspath('script.py') else 4)\n"
+        )
+        directory = Path(self.directory.name)
+        compiled = inspect_script(script.name, directory, directory / "cache").compiled
+        # The source changes after the compilation, so exiting with 0 means the bytecode ran.
+        script.write_text("raise SystemExit(5)\n")
+
+        for executor in (SubprocessExecutor(), self.forkserver_executor):
+            self.assertEqual(executor.run(script, compiled=compiled), 0)
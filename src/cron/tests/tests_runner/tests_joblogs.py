@@ -0,0 +1,103 @@
+import gzip
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.contrib.auth.models import Permission, User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from cron.joblogs import (
+    SegmentWriter,
+    closed_segments,
+    compress_segment,
+    read_tail,
+    run_log_directory,
+)
+from cron.models import Job, JobRun
+
+
+class SegmentWriterTestCase(TestCase):
+    """Test class for the rotated output files of the runs."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_writer_rotates_and_compresses_segments(self):
+        with SegmentWriter(self.directory.name, segment_bytes=10) as writer:
+            writer.write(b"0123456789abcdefghij")
+            writer.write(b"XYZ")
+
+        segments = closed_segments(self.directory.name)
+
+        self.assertEqual(len(segments), 2)
+        self.assertEqual(gzip.open(segments[0]).read(), b"0123456789")
+        self.assertEqual(gzip.open(segments[1]).read(), b"abcdefghij")
+        self.assertEqual(read_tail(self.directory.name, 3), b"XYZ")
+
+    def test_tail_reads_previous_segment_when_needed(self):
+        with SegmentWriter(self.directory.name, segment_bytes=10) as writer:
+            writer.write(b"0123456789abc")
+
+        self.assertEqual(read_tail(self.directory.name, 6), b"789abc")
+
+    def test_compression_only_lists_the_complete_segment(self):
+        path = Path(self.directory.name) / "output.1.log"
+        path.write_bytes(b"0123456789")
+
+        compress_segment(path)
+
+        self.assertEqual(
+            sorted(child.name for child in Path(self.directory.name).iterdir()),
+            ["output.1.log.gz"],
+        )
+
+
+@override_settings(JOB_LOGS_DIR=tempfile.gettempdir())
+class RunOutputAdminTestCase(TestCase):
+    """Test class for the admin view of the output of a run."""
+
+    def setUp(self):
+        job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.run = JobRun.objects.create(
+            job=job,
+            scheduled_for=datetime(2030, 1, 1, tzinfo=timezone.utc),
+            worker="worker-1",
+        )
+        with SegmentWriter(run_log_directory(self.run)) as writer:
+            writer.write(b"line 1\nline 2\nline 3\n")
+
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        self.url = reverse("admin:cron_jobrun_output", args=[self.run.pk])
+
+    def test_output_without_range_returns_tail(self):
+        response = self.client.get(self.url, {"kb": 1})
+
+        self.assertEqual(response.content, b"line 1\nline 2\nline 3\n")
+
+    def test_output_with_suffix_range(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.content, b"line 3\n")
+        self.assertEqual(response["Content-Range"], "bytes 14-20/21")
+
+    def test_output_with_range_past_the_end(self):
+        response = self.client.get(self.url, HTTP_RANGE="bytes=50-")
+
+        self.assertEqual(response.status_code, 416)
+
+    def test_output_needs_the_view_permission(self):
+        staff = User.objects.create_user("staff", password="password", is_staff=True)
+        self.client.force_login(staff)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+        staff.user_permissions.add(Permission.objects.get(codename="view_jobrun"))
+
+        self.assertEqual(self.client.get(self.url).status_code, 200)
@@ -0,0 +1,101 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from cron.limits import LocalLimiter, SharedLimiter, TokenBucket
+from cron.models import Job, JobRun, JobSchedule, OwnerRateLimit
+from cron.runner import Runner
+
+
+class TokenBucketTestCase(SimpleTestCase):
+    """Test class for the in memory token bucket."""
+
+    def test_bucket_allows_a_burst_and_then_refills(self):
+        bucket = TokenBucket(rate=60, burst=2)
+        bucket.refilled_at = 0
+
+        self.assertTrue(bucket.take(now=0))
+        self.assertTrue(bucket.take(now=0))
+        self.assertFalse(bucket.take(now=0))
+        self.assertTrue(bucket.take(now=1))
+
+    def test_bucket_does_not_exceed_the_burst(self):
+        bucket = TokenBucket(rate=60, burst=1)
+        bucket.refilled_at = 0
+
+        self.assertTrue(bucket.take(now=3600))
+        self.assertFalse(bucket.take(now=3600))
+
+
+class LimiterTestCase(TestCase):
+    """Test class for the local and shared limiters."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+
+    def test_local_limiter_respects_max_instances(self):
+        limiter = LocalLimiter()
+        limiter.refresh()
+
+        self.assertTrue(limiter.acquire(self.job))
+        self.assertFalse(limiter.acquire(self.job))
+
+        limiter.release(self.job)
+        self.assertTrue(limiter.acquire(self.job))
+
+    def test_local_limiter_respects_the_owner_rate(self):
+        OwnerRateLimit.objects.create(owner="Sergio", rate=1, burst=1)
+        limiter = LocalLimiter()
+        limiter.refresh()
+
+        self.assertTrue(limiter.acquire(self.job))
+        limiter.release(self.job)
+        self.assertFalse(limiter.acquire(self.job))
+
+    def test_shared_limiter_counts_instances_in_the_database(self):
+        Job.objects.filter(pk=self.job.pk).update(max_instances=2)
+        self.job.refresh_from_db()
+        runners = [SharedLimiter(), SharedLimiter(), SharedLimiter()]
+
+        acquired = [limiter.acquire(self.job) for limiter in runners]
+
+        self.assertEqual(acquired, [True, True, False])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.running_instances, 2)
+
+        runners[0].release(self.job)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.running_instances, 1)
+
+    def test_shared_limiter_returns_the_slot_when_there_are_no_tokens(self):
+        OwnerRateLimit.objects.create(owner="Sergio", rate=1, burst=1)
+        Job.objects.filter(pk=self.job.pk).update(max_instances=5)
+        self.job.refresh_from_db()
+
+        self.assertTrue(SharedLimiter().acquire(self.job))
+        self.assertFalse(SharedLimiter().acquire(self.job))
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.running_instances, 1)
+
+
+class RunnerLimitsTestCase(TestCase):
+    """Test class for the runs skipped by the limits of the runner."""
+
+    @mock.patch.object(Runner, "execute")
+    def test_runner_skips_runs_over_max_instances(self, execute):
+        job = Job.objects.create(name="Test job name", owner="Sergio", script="a.py")
+        JobSchedule.objects.create(job=job, minute="*")
+        runner = Runner(worker_name="worker-1")
+
+        runner.tick(datetime(2030, 1, 1, 8, tzinfo=timezone.utc))
+        runner.tick(datetime(2030, 1, 1, 8, 1, tzinfo=timezone.utc))
+
+        statuses = list(
+            JobRun.objects.order_by("scheduled_for").values_list("status", flat=True)
+        )
+        self.assertEqual(statuses, [JobRun.Status.RUNNING, JobRun.Status.SKIPPED])
+        self.assertEqual(execute.call_count, 1)
@@ -0,0 +1,154 @@
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from cron.metrics import MetricsRegistry, RingBuffer
+from cron.models import Job, JobMetricsSnapshot, JobRun
+from cron.runner import Runner
+
+
+class RingBufferTestCase(SimpleTestCase):
+    """Test class for the array backed ring buffers of the metrics."""
+
+    def test_percentiles_use_the_nearest_rank(self):
+        buffer = RingBuffer(100)
+        for value in range(1, 101):
+            buffer.append(value)
+
+        self.assertEqual(buffer.percentiles(), {50: 50, 95: 95, 99: 99})
+
+    def test_buffer_keeps_only_the_last_samples(self):
+        buffer = RingBuffer(3)
+        for value in (100, 200, 1, 2, 3):
+            buffer.append(value)
+
+        self.assertEqual(sorted(buffer.values()), [1, 2, 3])
+        self.assertEqual(buffer.count, 5)
+
+    def test_empty_buffer_has_no_percentiles(self):
+        self.assertEqual(RingBuffer(3).percentiles(), {50: None, 95: None, 99: None})
+
+
+class MetricsRegistryTestCase(TestCase):
+    """Test class for the snapshots of the metrics of the runner."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.registry = MetricsRegistry(size=10, flush_seconds=60)
+
+    def test_flush_stores_the_percentiles_of_the_observed_jobs(self):
+        for value in (1, 2, 3, 4):
+            self.registry.observe(self.job.pk, drift=value, wait=0, duration=value * 10)
+
+        self.registry.flush("worker-1")
+
+        snapshot = JobMetricsSnapshot.objects.get()
+        self.assertEqual(snapshot.samples, 4)
+        self.assertEqual(snapshot.drift_p50, 2)
+        self.assertEqual(snapshot.drift_p99, 4)
+        self.assertEqual(snapshot.duration_p95, 40)
+
+    def test_flush_skips_the_jobs_without_new_samples(self):
+        self.registry.observe(self.job.pk, drift=1, wait=0, duration=1)
+        self.registry.flush("worker-1")
+
+        self.assertEqual(self.registry.flush("worker-1"), [])
+        self.assertEqual(JobMetricsSnapshot.objects.count(), 1)
+
+    def test_flush_deletes_the_expired_snapshots_of_the_flushed_jobs(self):
+        other = Job.objects.create(name="Other job", owner="Sergio", script="b.py")
+        now = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        for job in (self.job, other):
+            JobMetricsSnapshot.objects.create(
+                job=job, worker="worker-1", taken_at=now - timedelta(days=31)
+            )
+
+        self.registry.observe(self.job.pk, drift=1, wait=0, duration=1)
+        self.registry.flush("worker-1", now=now)
+
+        self.assertEqual(
+            sorted(JobMetricsSnapshot.objects.values_list("job_id", "taken_at")),
+            sorted([(self.job.pk, now), (other.pk, now - timedelta(days=31))]),
+        )
+
+    def test_flush_if_due_waits_for_the_interval(self):
+        self.registry.observe(self.job.pk, drift=1, wait=0, duration=1)
+
+        self.assertEqual(self.registry.flush_if_due("worker-1"), [])
+        with mock.patch(
+            "cron.metrics.time.monotonic", return_value=self.registry.flushed_at + 60
+        ):
+            self.assertEqual(len(self.registry.flush_if_due("worker-1")), 1)
+
+    @mock.patch("cron.runner.SegmentWriter")
+    def test_runner_measures_the_drift_of_its_runs(self, segment_writer):
+        runner = Runner(worker_name="worker-1")
+        runner.executor = mock.Mock(**{"run.return_value": 0})
+        scheduled_for = datetime.now(timezone.utc) - timedelta(seconds=30)
+        run = JobRun.objects.create(
+            job=self.job, scheduled_for=scheduled_for, worker="worker-1"
+        )
+
+        runner.execute(run)
+
+        drift = runner.metrics.summary(self.job.pk)["drift"]
+        self.assertEqual(drift["count"], 1)
+        self.assertGreaterEqual(drift["p50"], 30)
+
+
+class MetricsViewTestCase(TestCase):
+    """Test class for the metrics endpoint."""
+
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+    def test_endpoint_needs_the_view_permission(self):
+        self.client.force_login(
+            User.objects.create_user("staff", password="password", is_staff=True)
+        )
+
+        self.assertEqual(self.client.get(reverse("cron:metrics")).status_code, 403)
+
+    def test_endpoint_returns_the_latest_snapshot_of_every_job(self):
+        job = Job.objects.create(name="Test job name", owner="Sergio", script="a.py")
+        taken_at = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        for minutes, drift in ((0, 5.0), (1, 1.5)):
+            JobMetricsSnapshot.objects.create(
+                job=job,
+                worker="worker-1",
+                taken_at=taken_at + timedelta(minutes=minutes),
+                samples=3,
+                drift_p95=drift,
+            )
+
+        response = self.client.get(reverse("cron:metrics"))
+
+        jobs = response.json()["jobs"]
+        self.assertEqual(len(jobs), 1)
+        self.assertEqual(jobs[0]["job"], "Test job name")
+        self.assertEqual(jobs[0]["drift"]["p95"], 1.5)
+        self.assertIsNone(jobs[0]["wait"]["p50"])
+
+    def test_admin_shows_the_runner_of_the_latest_snapshot(self):
+        job = Job.objects.create(name="Test job name", owner="Sergio", script="a.py")
+        taken_at = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        for minutes, worker in ((0, "worker-1"), (1, "worker-2")):
+            JobMetricsSnapshot.objects.create(
+                job=job,
+                worker=worker,
+                taken_at=taken_at + timedelta(minutes=minutes),
+                drift_p95=1.5,
+            )
+
+        response = self.client.get(reverse("admin:cron_job_changelist"))
+
+        self.assertContains(response, "Runner de las métricas")
+        self.assertContains(response, "worker-2")
+        self.assertNotContains(response, "worker-1")
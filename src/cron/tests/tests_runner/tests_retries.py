@@ -0,0 +1,215 @@
+import random
+import tempfile
+import threading
+from datetime import datetime, timedelta, timezone
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+
+from cron.models import Job, JobRun, JobSchedule
+from cron.retries import RetryQueue, claim_retry, retry_delay, schedule_retry
+from cron.runner import Runner
+
+NOW = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+
+
+class ImmediatePool:
+    def submit(self, function, *args):
+        function(*args)
+
+
+class FailingExecutor:
+    def run(self, script, output=None, compiled=None):
+        return 1
+
+
+class RetriesTestCase(TestCase):
+    """Test class for the pending retries of the failed runs."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name",
+            owner="Sergio",
+            script="test_script.py",
+            max_attempts=3,
+            retry_backoff=60,
+            retry_jitter=0,
+        )
+        self.schedule = JobSchedule.objects.create(job=self.job, minute="0")
+        self.run = JobRun.objects.create(
+            job=self.job,
+            schedule=self.schedule,
+            scheduled_for=NOW,
+            status=JobRun.Status.FAILED,
+            worker="worker-1",
+        )
+
+    def test_delay_doubles_with_every_attempt(self):
+        self.assertEqual(retry_delay(self.job, 1), 60)
+        self.assertEqual(retry_delay(self.job, 3), 240)
+
+    def test_jitter_spreads_the_delay(self):
+        self.job.retry_jitter = 0.5
+        delays = {retry_delay(self.job, 1, random.Random(seed)) for seed in range(5)}
+
+        self.assertEqual(len(delays), 5)
+        self.assertTrue(all(30 <= delay <= 90 for delay in delays))
+
+    def test_failed_run_schedules_the_next_attempt_once(self):
+        retry = schedule_retry(self.run, now=NOW)
+
+        self.assertEqual(retry.attempt, 2)
+        self.assertEqual(retry.status, JobRun.Status.PENDING)
+        self.assertEqual(retry.next_attempt_at, NOW + timedelta(seconds=60))
+        self.assertIsNone(schedule_retry(self.run, now=NOW))
+
+    def test_last_attempt_is_not_retried(self):
+        self.run.attempt = 3
+
+        self.assertIsNone(schedule_retry(self.run, now=NOW))
+
+    def test_retry_is_claimed_by_a_single_runner(self):
+        retry = schedule_retry(self.run, now=NOW)
+
+        self.assertTrue(claim_retry(retry, "worker-1"))
+        self.assertFalse(claim_retry(retry, "worker-2"))
+        retry.refresh_from_db()
+        self.assertEqual(retry.worker, "worker-1")
+
+    def test_queue_loads_the_due_retries_in_order(self):
+        later = schedule_retry(self.run, now=NOW + timedelta(minutes=5))
+        sooner = schedule_retry(
+            JobRun.objects.create(
+                job=self.job,
+                schedule=self.schedule,
+                scheduled_for=NOW - timedelta(hours=1),
+                status=JobRun.Status.FAILED,
+            ),
+            now=NOW,
+        )
+        queue = RetryQueue()
+
+        queue.load(NOW + timedelta(minutes=10))
+        queue.load(NOW + timedelta(minutes=10))
+
+        self.assertEqual(len(queue), 2)
+        self.assertEqual(queue.pop_due(NOW), [])
+        self.assertEqual(
+            queue.pop_due(NOW + timedelta(minutes=10)), [sooner.pk, later.pk]
+        )
+
+    def test_queue_skips_the_retries_of_inactive_jobs(self):
+        schedule_retry(self.run, now=NOW)
+        Job.objects.filter(pk=self.job.pk).update(enabled=False)
+        queue = RetryQueue()
+
+        queue.load(NOW + timedelta(minutes=10))
+
+        self.assertEqual(len(queue), 0)
+
+    def test_queue_is_safe_to_push_from_other_threads(self):
+        queue = RetryQueue()
+        popped = []
+
+        def push(first):
+            for index in range(first, first + 1000):
+                queue.push(index, NOW)
+
+        threads = [threading.Thread(target=push, args=(n * 1000,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            popped.extend(queue.pop_due(NOW))
+        for thread in threads:
+            thread.join()
+        popped.extend(queue.pop_due(NOW))
+
+        self.assertEqual(sorted(popped), list(range(4000)))
+
+
+@override_settings(JOB_LOGS_DIR=tempfile.gettempdir())
+class RunnerRetriesTestCase(TestCase):
+    """Test class for the dispatch of the retries by the runner."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name",
+            owner="Sergio",
+            script="a.py",
+            max_attempts=2,
+            retry_jitter=0,
+        )
+        JobSchedule.objects.create(job=self.job, minute="0")
+        self.runner = Runner(worker_name="worker-1")
+        self.runner.pool = ImmediatePool()
+        self.runner.executor = FailingExecutor()
+
+    def test_failed_run_is_retried_until_the_last_attempt(self):
+        self.runner.tick(NOW)
+
+        retry = JobRun.objects.get(status=JobRun.Status.PENDING)
+        self.assertEqual(self.runner.retries.next_at(), retry.next_attempt_at)
+
+        claimed = self.runner.dispatch_retries(retry.next_attempt_at)
+
+        self.assertEqual(claimed, [retry])
+        self.assertEqual(
+            list(JobRun.objects.order_by("attempt").values_list("attempt", "status")),
+            [(1, JobRun.Status.FAILED), (2, JobRun.Status.FAILED)],
+        )
+
+    def test_retry_not_allowed_by_the_limits_stays_pending(self):
+        self.runner.tick(NOW)
+        retry = JobRun.objects.get(status=JobRun.Status.PENDING)
+        self.runner.limiter.acquire(self.job)
+
+        self.assertEqual(self.runner.dispatch_retries(retry.next_attempt_at), [])
+
+        retry.refresh_from_db()
+        self.assertEqual(retry.status, JobRun.Status.PENDING)
+        self.assertGreater(self.runner.retries.next_at(), retry.next_attempt_at)
+
+    def test_pending_retries_are_loaded_after_a_restart(self):
+        self.runner.tick(NOW)
+        retry = JobRun.objects.get(status=JobRun.Status.PENDING)
+
+        restarted = Runner(worker_name="worker-2")
+        restarted.pool = ImmediatePool()
+        restarted.executor = FailingExecutor()
+        restarted.tick(NOW + timedelta(minutes=1))
+
+        retry.refresh_from_db()
+        self.assertEqual(retry.status, JobRun.Status.FAILED)
+        self.assertEqual(retry.worker, "worker-2")
+
+    def test_retries_of_a_job_disabled_after_the_failure_stay_pending(self):
+        self.runner.tick(NOW)
+        retry = JobRun.objects.get(status=JobRun.Status.PENDING)
+        Job.objects.filter(pk=self.job.pk).update(enabled=False)
+
+        self.assertEqual(self.runner.dispatch_retries(retry.next_attempt_at), [])
+
+        retry.refresh_from_db()
+        self.assertEqual(retry.status, JobRun.Status.PENDING)
+
+    def test_database_error_of_the_script_cache_fails_the_run(self):
+        with mock.patch.object(
+            self.runner.scripts, "get", side_effect=DatabaseError("gone")
+        ), self.assertLogs("cron.runner", "ERROR"):
+            self.runner.tick(NOW)
+
+        self.assertEqual(
+            list(JobRun.objects.order_by("attempt").values_list("status", "exit_code")),
+            [(JobRun.Status.FAILED, -1), (JobRun.Status.PENDING, None)],
+        )
+
+    def test_error_storing_the_result_fails_the_run(self):
+        with mock.patch.object(
+            self.runner.metrics, "observe", side_effect=DatabaseError("gone")
+        ), self.assertLogs("cron.runner", "ERROR"):
+            self.runner.tick(NOW)
+
+        run = JobRun.objects.get()
+        self.assertEqual(run.status, JobRun.Status.FAILED)
+        self.assertIsNotNone(run.finished_at)
@@ -0,0 +1,137 @@
+import os
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from cron.models import Job, JobRun
+from cron.runner import Runner
+from cron.scripts import ScriptCache
+
+
+class ScriptCacheTestCase(TestCase):
+    """Test class for the cache of the scripts checked ahead of their runs."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.scripts_dir = Path(directory.name) / "scripts"
+        self.cache_dir = Path(directory.name) / "cache"
+        self.scripts_dir.mkdir()
+        override = override_settings(
+            SCRIPTS_DIR=self.scripts_dir,
+            SCRIPT_CACHE_DIR=self.cache_dir,
+            JOB_LOGS_DIR=directory.name,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.job = Job.objects.create(name="Job", owner="Sergio", script="job.py")
+        self.cache = ScriptCache()
+
+    def write_script(self, content, mtime_ns=None):
+        path = self.scripts_dir / "job.py"
+        path.write_text(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_script_is_hashed_and_compiled_once(self):
+        self.write_script("x = 1\n", mtime_ns=1)
+
+        [script] = self.cache.refresh(["job.py"])
+
+        self.assertEqual(script.status, Job.ScriptStatus.OK)
+        self.assertTrue(script.compiled.is_file())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script_status, Job.ScriptStatus.OK)
+        self.assertEqual(self.job.script_hash, script.sha256)
+
+        with mock.patch.object(Path, "read_bytes") as read_bytes:
+            self.assertEqual(self.cache.refresh(["job.py"]), [])
+            self.assertIs(self.cache.get("job.py"), script)
+        read_bytes.assert_not_called()
+
+    def test_changed_script_is_hashed_again(self):
+        self.write_script("x = 1\n", mtime_ns=1)
+        [first] = self.cache.refresh(["job.py"])
+        self.write_script("x = 2\n", mtime_ns=2)
+
+        [second] = self.cache.refresh(["job.py"])
+
+        self.assertNotEqual(second.sha256, first.sha256)
+        self.assertNotEqual(second.compiled, first.compiled)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script_hash, second.sha256)
+
+    def test_missing_and_invalid_scripts_are_stored_in_the_job(self):
+        self.cache.refresh(["job.py"])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script_status, Job.ScriptStatus.MISSING)
+
+        self.write_script("def broken(:\n")
+        [script] = self.cache.refresh(["job.py"])
+
+        self.assertIsNone(script.compiled)
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script_status, Job.ScriptStatus.INVALID)
+        self.assertIn("invalid syntax", self.job.script_error)
+        self.assertIsNotNone(self.job.script_changed_at)
+
+    def test_admin_leaves_the_check_of_a_new_script_to_the_runners(self):
+        self.write_script("x = 1\n")
+        self.cache.refresh(["job.py"])
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+        with mock.patch("cron.scripts.inspect_script") as inspect_script:
+            self.client.post(
+                reverse("admin:cron_job_change", args=[self.job.pk]),
+                {
+                    "name": "Job",
+                    "owner": "Sergio",
+                    "script": "other.py",
+                    "enabled": "on",
+                    "max_instances": 1,
+                    "max_attempts": 1,
+                    "retry_backoff": 60,
+                    "retry_jitter": 0.1,
+                    "upstream_dependencies-TOTAL_FORMS": 0,
+                    "upstream_dependencies-INITIAL_FORMS": 0,
+                },
+            )
+        inspect_script.assert_not_called()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script, "other.py")
+        self.assertEqual(self.job.script_status, Job.ScriptStatus.UNCHECKED)
+
+        # Back to a script this runner already knows, before its next check.
+        Job.objects.filter(pk=self.job.pk).update(script="job.py")
+        self.assertEqual(self.cache.refresh(["job.py"]), [])
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.script_status, Job.ScriptStatus.OK)
+
+    @mock.patch("cron.runner.SegmentWriter")
+    def test_runner_executes_the_cached_bytecode(self, segment_writer):
+        self.write_script("x = 1\n")
+        runner = Runner(worker_name="worker-1")
+        runner.executor = mock.Mock(**{"run.return_value": 0})
+        runner.scripts.refresh(runner.active_scripts())
+        run = JobRun.objects.create(
+            job=self.job,
+            scheduled_for=datetime(2030, 1, 1, tzinfo=timezone.utc),
+            worker="worker-1",
+        )
+
+        with mock.patch("cron.scripts.inspect_script") as inspect_script:
+            runner.execute(run)
+
+        inspect_script.assert_not_called()
+        script = runner.scripts.get("job.py")
+        runner.executor.run.assert_called_once_with(
+            self.scripts_dir / "job.py", mock.ANY, compiled=script.compiled
+        )
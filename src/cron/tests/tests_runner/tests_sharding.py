@@ -0,0 +1,110 @@
+import uuid
+from datetime import timedelta
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from cron.models import Job
+from cron.runner import Runner
+from cron.sharding import HashRing
+from cron.workers import heartbeat
+
+
+class HashRingTestCase(TestCase):
+    """Test class for the consistent hashing of the jobs across runners."""
+
+    def setUp(self):
+        self.workers = ["worker-1", "worker-2", "worker-3"]
+        self.ring = HashRing(self.workers)
+        self.job_ids = [uuid.uuid4() for _ in range(3000)]
+
+    def test_every_job_has_one_worker(self):
+        shards = {worker: 0 for worker in self.workers}
+        for job_id in self.job_ids:
+            shards[self.ring.worker_for(job_id)] += 1
+
+        self.assertEqual(sum(shards.values()), len(self.job_ids))
+        self.assertTrue(all(count > 0 for count in shards.values()))
+
+    def test_joining_worker_moves_a_fraction_of_the_jobs(self):
+        bigger_ring = HashRing([*self.workers, "worker-4"])
+
+        moved = [
+            job_id
+            for job_id in self.job_ids
+            if self.ring.worker_for(job_id) != bigger_ring.worker_for(job_id)
+        ]
+
+        self.assertLess(len(moved), len(self.job_ids) * 0.4)
+        self.assertTrue(
+            all(bigger_ring.worker_for(job_id) == "worker-4" for job_id in moved)
+        )
+
+    def test_shard_filter_matches_worker_for(self):
+        for index in range(50):
+            Job.objects.create(
+                name=f"Job {index}", owner="Sergio", script=f"script_{index}.py"
+            )
+
+        for worker in self.workers:
+            shard = Job.objects.filter(self.ring.shard_filter(worker))
+            expected = {
+                job.id
+                for job in Job.objects.all()
+                if self.ring.worker_for(job.id) == worker
+            }
+
+            self.assertEqual(set(shard.values_list("id", flat=True)), expected)
+
+
+class RunnerRingTestCase(TestCase):
+    """Test class for the ring of the live runners rebuilt on every tick."""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.runner = Runner(
+            worker_name="worker-1",
+            max_workers=1,
+            ring=HashRing(["worker-1", "worker-2", "worker-3"]),
+        )
+
+    def beat(self, name, seconds_ago=0):
+        heartbeat(
+            name,
+            capacity=4,
+            running=0,
+            started_at=self.now - timedelta(hours=1),
+            now=self.now - timedelta(seconds=seconds_ago),
+        )
+
+    def test_ring_only_has_the_runners_that_beat(self):
+        self.beat("worker-2")
+        self.beat("worker-3", seconds_ago=600)
+
+        with self.assertLogs("cron.runner", "ERROR") as logs:
+            self.runner.refresh_ring(self.now)
+
+        self.assertEqual(self.runner.ring.workers, ["worker-1", "worker-2"])
+        self.assertIn("worker-3", logs.output[0])
+
+    def test_runner_that_beats_again_gets_its_jobs_back(self):
+        self.beat("worker-2")
+        with self.assertLogs("cron.runner", "ERROR"):
+            self.runner.refresh_ring(self.now)
+
+        self.beat("worker-3")
+        with self.assertNoLogs("cron.runner", "ERROR"):
+            self.runner.refresh_ring(self.now)
+
+        self.assertEqual(self.runner.ring.workers, ["worker-1", "worker-2", "worker-3"])
+
+    def test_ring_cannot_be_used_with_a_leader(self):
+        with self.assertRaisesMessage(CommandError, "leader coordination"):
+            call_command(
+                "run_scheduler",
+                "--once",
+                "--coordination=leader",
+                "--worker-name=worker-1",
+                "--workers=worker-1,worker-2",
+            )
@@ -0,0 +1,117 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from cron.models import Job, JobRun, JobSchedule, Worker
+from cron.workers import heartbeat, reap_stale_workers
+
+
+class WorkerRegistryTestCase(TestCase):
+    """Test class for the heartbeats of the runners and the reaping of the dead ones."""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.job = Job.objects.create(
+            name="Test job name",
+            owner="Sergio",
+            script="test_script.py",
+            max_instances=3,
+            max_attempts=2,
+        )
+        self.schedule = JobSchedule.objects.create(job=self.job, minute="0")
+
+    def beat(self, name, seconds_ago=0, running=0):
+        heartbeat(
+            name,
+            capacity=4,
+            running=running,
+            started_at=self.now - timedelta(hours=1),
+            now=self.now - timedelta(seconds=seconds_ago),
+        )
+
+    def running_run(self, worker, minutes_ago=0):
+        return JobRun.objects.create(
+            job=self.job,
+            schedule=self.schedule,
+            scheduled_for=self.now - timedelta(minutes=minutes_ago),
+            worker=worker,
+        )
+
+    def test_heartbeat_is_a_single_upsert(self):
+        self.beat("worker-1", seconds_ago=30)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.beat("worker-1", running=2)
+
+        self.assertEqual(len(queries), 1)
+        worker = Worker.objects.get()
+        self.assertEqual(worker.running, 2)
+        self.assertEqual(worker.last_heartbeat, self.now)
+
+    def test_runs_of_stale_workers_are_lost_and_retried(self):
+        self.beat("worker-1", seconds_ago=600)
+        self.beat("worker-2")
+        lost = self.running_run("worker-1")
+        alive = self.running_run("worker-2", minutes_ago=1)
+        Job.objects.filter(pk=self.job.pk).update(running_instances=2)
+
+        self.assertEqual(reap_stale_workers(self.now), [lost])
+
+        lost.refresh_from_db()
+        alive.refresh_from_db()
+        self.job.refresh_from_db()
+        self.assertEqual(lost.status, JobRun.Status.LOST)
+        self.assertEqual(alive.status, JobRun.Status.RUNNING)
+        self.assertEqual(self.job.running_instances, 1)
+        self.assertTrue(
+            JobRun.objects.filter(status=JobRun.Status.PENDING, attempt=2).exists()
+        )
+        self.assertEqual(
+            list(Worker.objects.values_list("name", flat=True)), ["worker-2"]
+        )
+
+    def test_live_workers_are_not_reaped(self):
+        self.beat("worker-1", seconds_ago=10)
+        self.running_run("worker-1")
+
+        self.assertEqual(reap_stale_workers(self.now), [])
+        self.assertEqual(Worker.objects.count(), 1)
+
+    def test_admin_shows_the_live_fleet(self):
+        self.beat("worker-1", running=2)
+        self.beat("worker-2", running=1)
+        self.beat("worker-3", seconds_ago=600, running=4)
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+
+        response = self.client.get(reverse("admin:cron_worker_changelist"))
+
+        self.assertEqual(
+            response.context["fleet"],
+            {"workers": 2, "capacity": 8, "running": 3, "load": 3 / 8},
+        )
+        self.assertContains(response, "worker-3")
+
+    @mock.patch("cron.workers.Heartbeat.stop")
+    @mock.patch("cron.workers.Heartbeat.start")
+    def test_single_tick_registers_the_runner(self, start, stop):
+        Job.objects.update(enabled=False)
+        output = StringIO()
+
+        call_command("run_scheduler", "--once", "--worker-name=once-1", stdout=output)
+
+        start.assert_called_once_with()
+        stop.assert_called_once_with()
+        self.assertEqual(
+            list(Worker.objects.values_list("name", flat=True)), ["once-1"]
+        )
+        self.assertIn("runs dispatched by once-1", output.getvalue())
@@ -0,0 +1,132 @@
+from datetime import date, datetime
+
+from django.test import TestCase
+
+from cron.models import Job, JobSchedule
+from cron.schedules import FIELD_NAMES, CronFields
+from cron.simulation import simulate
+
+
+class SimulateTestCase(TestCase):
+    """Test class for the vectorized simulation of the schedules."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        JobSchedule.objects.create(
+            job=self.job,
+            description="Weekdays",
+            minute="0,30",
+            hour="8",
+            day_of_week="1,2,3,4,5",
+        )
+        JobSchedule.objects.create(
+            job=self.job,
+            description="Leap day",
+            minute="0",
+            hour="0",
+            day_of_month="29",
+            month="2",
+        )
+        JobSchedule.objects.create(
+            job=self.job,
+            description="Every hour",
+            minute="0",
+            hour="*",
+        )
+        self.schedules = list(
+            JobSchedule.objects.values("id", "time_zone", *FIELD_NAMES)
+        )
+
+    def test_counts_match_the_iteration_of_each_schedule(self):
+        result = simulate(
+            self.schedules, date(2023, 1, 1), date(2025, 1, 1), "America/Bogota"
+        )
+
+        for schedule in JobSchedule.objects.all():
+            expected = len(
+                list(
+                    CronFields.from_schedule(schedule).iter_datetimes(
+                        datetime(2023, 1, 1), datetime(2025, 1, 1)
+                    )
+                )
+            )
+            count = result.counts[result.schedule_ids.index(schedule.id)]
+
+            self.assertEqual(count, expected)
+
+    def test_per_minute_adds_up_to_the_total(self):
+        result = simulate(
+            self.schedules, date(2024, 1, 1), date(2024, 3, 1), "America/Bogota"
+        )
+
+        self.assertEqual(result.per_minute.sum(), result.total)
+        self.assertEqual(result.per_hour()[1].sum(), result.total)
+
+    def test_peak_concurrency_at_shared_minute(self):
+        result = simulate(
+            self.schedules, date(2024, 1, 1), date(2024, 1, 2), "America/Bogota"
+        )
+        concurrency = result.concurrency()
+
+        # 2024-01-01 was a Monday, both the weekday and hourly schedules fire at 8:00.
+        self.assertEqual(concurrency.max(), 2)
+        self.assertEqual(
+            str(result.minute_at(concurrency.argmax())), "2024-01-01T08:00"
+        )
+
+    def test_never_firing_schedules_in_window(self):
+        result = simulate(
+            self.schedules, date(2023, 1, 1), date(2024, 1, 1), "America/Bogota"
+        )
+        leap_day = JobSchedule.objects.get(description="Leap day")
+
+        self.assertEqual(result.never_firing(), [leap_day.id])
+
+    def test_schedules_fire_in_their_time_zone(self):
+        JobSchedule.objects.all().delete()
+        for time_zone in ("America/Bogota", "America/New_York"):
+            JobSchedule.objects.create(
+                job=self.job,
+                description=time_zone,
+                minute="0",
+                hour="8",
+                time_zone=time_zone,
+            )
+        schedules = list(JobSchedule.objects.values("id", "time_zone", *FIELD_NAMES))
+
+        # New York is on daylight saving time in July, an hour ahead of Bogota.
+        result = simulate(
+            schedules, date(2024, 7, 1), date(2024, 7, 2), "America/Bogota"
+        )
+        hours, counts = result.per_hour()
+
+        self.assertEqual(
+            {str(hour): count for hour, count in zip(hours, counts) if count},
+            {"2024-07-01T07": 1, "2024-07-01T08": 1},
+        )
+
+    def test_skipped_minutes_fire_once_at_the_transition(self):
+        every_minute = {name: "*" for name in FIELD_NAMES}
+        schedules = [
+            {"id": 1, "time_zone": "America/New_York", **every_minute},
+            {
+                "id": 2,
+                "time_zone": "America/New_York",
+                **every_minute,
+                "minute": "30",
+                "hour": "2",
+            },
+        ]
+
+        result = simulate(
+            schedules, date(2027, 3, 14), date(2027, 3, 15), "America/New_York"
+        )
+
+        # 23 hours of minutes, 02:00 to 02:59 run with 03:00 at the transition.
+        self.assertEqual(list(result.counts), [1380, 1])
+        self.assertEqual(result.per_minute.max(), 2)
+        self.assertEqual(
+            str(result.minute_at(result.per_minute.argmax())), "2027-03-14T03:00"
+        )
@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase
+
+from cron.models import Job, JobSchedule
+from cron.runner import Runner
+from cron.timezones import local_datetime, transition_table
+
+
+def epoch(*args) -> int:
+    return int(datetime(*args, tzinfo=timezone.utc).timestamp())
+
+
+class TransitionTableTestCase(SimpleTestCase):
+    """Test class for the conversions of the transition tables."""
+
+    def setUp(self):
+        self.table = transition_table("America/New_York")
+
+    def test_to_local_matches_zoneinfo(self):
+        # 2024-07-01 12:00 UTC is 08:00 EDT.
+        self.assertEqual(
+            int(self.table.to_local(epoch(2024, 7, 1, 12))), epoch(2024, 7, 1, 8)
+        )
+
+    def test_to_utc_of_skipped_time_is_the_transition(self):
+        # 02:30 does not exist on 2024-03-10, the clock jumps at 07:00 UTC.
+        self.assertEqual(
+            int(self.table.to_utc(epoch(2024, 3, 10, 2, 30))), epoch(2024, 3, 10, 7)
+        )
+
+    def test_to_utc_of_repeated_time_is_the_first_occurrence(self):
+        # 01:30 happens twice on 2024-11-03, first at 05:30 UTC (EDT).
+        self.assertEqual(
+            int(self.table.to_utc(epoch(2024, 11, 3, 1, 30))), epoch(2024, 11, 3, 5, 30)
+        )
+
+    def test_local_times_at_forward_transition_include_skipped_times(self):
+        local_times = self.table.local_times_at(epoch(2024, 3, 10, 7))
+
+        self.assertEqual(local_datetime(local_times[0]), datetime(2024, 3, 10, 2, 0))
+        self.assertEqual(local_datetime(local_times[-1]), datetime(2024, 3, 10, 3, 0))
+
+    def test_local_times_at_second_pass_of_repeated_hour_are_empty(self):
+        self.assertEqual(self.table.local_times_at(epoch(2024, 11, 3, 6, 30)), [])
+
+    def test_zone_without_transitions(self):
+        table = transition_table("UTC")
+
+        self.assertEqual(int(table.to_utc(epoch(2024, 1, 1))), epoch(2024, 1, 1))
+
+
+class RunnerTimeZoneTestCase(TestCase):
+    """Test class for the dispatch of schedules in their own time zone."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+
+    @mock.patch.object(Runner, "execute")
+    def test_skipped_local_time_runs_at_the_transition(self, execute):
+        JobSchedule.objects.create(
+            job=self.job, minute="30", hour="2", time_zone="America/New_York"
+        )
+        moment = datetime(2024, 3, 10, 7, tzinfo=timezone.utc)
+
+        runs = Runner(worker_name="worker-1").tick(moment)
+
+        self.assertEqual(len(runs), 1)
+        self.assertEqual(runs[0].scheduled_for, moment)
+
+    @mock.patch.object(Runner, "execute")
+    def test_repeated_local_time_runs_once(self, execute):
+        JobSchedule.objects.create(
+            job=self.job, minute="30", hour="1", time_zone="America/New_York"
+        )
+        runner = Runner(worker_name="worker-1")
+
+        first = runner.tick(datetime(2024, 11, 3, 5, 30, tzinfo=timezone.utc))
+        second = runner.tick(datetime(2024, 11, 3, 6, 30, tzinfo=timezone.utc))
+
+        self.assertEqual((len(first), len(second)), (1, 0))
@@ -0,0 +1,136 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from cron.ics import calendar_url
+from cron.models import Job, JobSchedule
+
+
+class CalendarFeedTestCase(TestCase):
+    """Test class for the iCalendar feed of the job schedules."""
+
+    def setUp(self):
+        self.job = Job.objects.create(
+            name="Test job name", owner="Sergio", script="test_script.py"
+        )
+        self.other_job = Job.objects.create(
+            name="Other job", owner="Ana", script="other_script.py"
+        )
+
+        JobSchedule.objects.create(
+            job=self.job,
+            description="Weekdays",
+            minute="0,30",
+            hour="8",
+            day_of_week="1,2,3,4,5",
+        )
+        JobSchedule.objects.create(job=self.other_job, minute="15", hour="*")
+
+    def get_content(self, response):
+        return b"".join(response.streaming_content).decode()
+
+    def test_calendar_contains_rrule_per_schedule(self):
+        response = self.client.get(calendar_url())
+        content = self.get_content(response)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(content.count("BEGIN:VEVENT"), 2)
+        self.assertIn(
+            "RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR;BYHOUR=8;BYMINUTE=0,30", content
+        )
+
+    def test_owner_calendar_only_contains_owner_jobs(self):
+        response = self.client.get(calendar_url("Ana"))
+        content = self.get_content(response)
+
+        self.assertEqual(content.count("BEGIN:VEVENT"), 1)
+        self.assertIn("SUMMARY:Other job", content)
+
+    def test_calendar_not_modified_with_same_etag(self):
+        response = self.client.get(calendar_url())
+        etag = response["ETag"]
+
+        response = self.client.get(calendar_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_calendar_etag_changes_after_schedule_change(self):
+        etag = self.client.get(calendar_url())["ETag"]
+        JobSchedule.objects.create(job=self.job, minute="45")
+
+        response = self.client.get(calendar_url(), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_calendar_expands_non_consecutive_years(self):
+        JobSchedule.objects.create(
+            job=self.job,
+            minute="0",
+            hour="0",
+            day_of_month="1",
+            month="1",
+            year="2030,2032",
+        )
+
+        content = self.get_content(self.client.get(calendar_url()))
+
+        self.assertIn("DTSTART;TZID=America/Bogota:20300101T000000", content)
+        self.assertIn("DTSTART;TZID=America/Bogota:20320101T000000", content)
+        self.assertNotIn("RDATE;TZID", content)
+
+    def test_every_block_of_years_has_its_own_rule(self):
+        schedule = JobSchedule.objects.create(
+            job=self.job, minute="0", year="2027,2029,2030"
+        )
+
+        content = self.get_content(self.client.get(calendar_url()))
+
+        self.assertIn(f"UID:{schedule.pk}-2027@scheduler", content)
+        self.assertIn(f"UID:{schedule.pk}-2029@scheduler", content)
+        self.assertIn("UNTIL=20280101T045959Z", content)
+        self.assertIn("UNTIL=20310101T045959Z", content)
+
+    def test_every_time_zone_used_has_a_vtimezone(self):
+        JobSchedule.objects.create(job=self.job, minute="5", time_zone="Europe/Madrid")
+
+        content = self.get_content(self.client.get(calendar_url()))
+
+        self.assertEqual(content.count("BEGIN:VTIMEZONE"), 2)
+        self.assertIn("TZID:America/Bogota", content)
+        self.assertIn("TZID:Europe/Madrid", content)
+        self.assertIn("TZOFFSETFROM:+0100\r\nTZOFFSETTO:+0200", content)
+        self.assertLess(content.index("END:VEVENT"), content.index("BEGIN:VTIMEZONE"))
+
+    def test_feeds_require_their_token(self):
+        self.assertEqual(self.client.get(reverse("cron:calendar")).status_code, 403)
+
+        other_token = calendar_url("Ana").split("?")[1]
+        response = self.client.get(
+            reverse("cron:owner_calendar", kwargs={"owner": "Sergio"})
+            + "?"
+            + other_token
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    def test_last_possible_year_has_no_until(self):
+        schedule = JobSchedule.objects.create(job=self.job, minute="0", year="9999")
+
+        content = self.get_content(self.client.get(calendar_url()))
+
+        self.assertIn(f"UID:{schedule.pk}@scheduler", content)
+        self.assertEqual(content.count("UNTIL="), 0)
+        self.assertTrue(content.endswith("END:VCALENDAR\r\n"))
+
+    def test_skipped_times_run_at_the_transition(self):
+        JobSchedule.objects.create(
+            job=self.job,
+            minute="30",
+            hour="2",
+            year="2030",
+            time_zone="America/New_York",
+        )
+
+        content = self.get_content(self.client.get(calendar_url()))
+
+        self.assertIn("EXDATE;TZID=America/New_York:20300310T023000", content)
+        self.assertIn("RDATE;TZID=America/New_York:20300310T030000", content)
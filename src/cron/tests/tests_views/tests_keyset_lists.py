@@ -0,0 +1,170 @@
+import json
+from datetime import datetime, timezone
+from unittest import mock
+
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cron.models import Job, JobRun, JobSchedule
+from scheduler import settings_worker
+
+
+class KeysetListTestCase(TestCase):
+    """Test class for the list endpoints paginated by keyset."""
+
+    def setUp(self):
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "password")
+        )
+        self.jobs = [
+            Job.objects.create(
+                name=f"Job {index}", owner="Sergio", script=f"{index}.py"
+            )
+            for index in (3, 1, 4, 0, 2)
+        ]
+
+    def get_lines(self, name, **params):
+        response = self.client.get(reverse(f"cron:{name}"), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+
+    def get_all_pages(self, name, limit):
+        rows, after = [], None
+        while True:
+            params = {"limit": limit, **({"after": after} if after else {})}
+            page = self.get_lines(name, **params)
+            rows.extend(page)
+            if len(page) < limit:
+                return rows
+            after = page[-1]["cursor"]
+
+    @mock.patch("cron.keyset.CHUNK_SIZE", 2)
+    def test_jobs_are_streamed_by_name_without_offset(self):
+        with CaptureQueriesContext(connection) as queries:
+            names = [row["name"] for row in self.get_lines("job_list")]
+
+        self.assertEqual(names, [f"Job {index}" for index in range(5)])
+        self.assertFalse(any("OFFSET" in query["sql"] for query in queries))
+
+    def test_pages_follow_the_cursors(self):
+        names = [row["name"] for row in self.get_all_pages("job_list", limit=2)]
+
+        self.assertEqual(names, [f"Job {index}" for index in range(5)])
+
+    @mock.patch("cron.keyset.CHUNK_SIZE", 2)
+    def test_schedules_without_description_are_last_of_their_job(self):
+        job = self.jobs[0]
+        for minute, description in (
+            ("0", None),
+            ("10", "b"),
+            ("20", None),
+            ("30", "a"),
+        ):
+            JobSchedule.objects.create(job=job, minute=minute, description=description)
+
+        rows = self.get_all_pages("schedule_list", limit=3)
+
+        self.assertEqual([row["description"] for row in rows], ["a", "b", None, None])
+        self.assertEqual(len({row["id"] for row in rows}), 4)
+
+    def test_runs_are_streamed_from_the_newest(self):
+        scheduled_for = datetime(2030, 1, 1, 8, tzinfo=timezone.utc)
+        for job in self.jobs:
+            JobRun.objects.create(job=job, scheduled_for=scheduled_for, worker="w")
+        newest = JobRun.objects.create(
+            job=self.jobs[0],
+            scheduled_for=scheduled_for.replace(hour=9, microsecond=5),
+            worker="w",
+        )
+
+        rows = self.get_all_pages("run_list", limit=2)
+
+        self.assertEqual(rows[0]["id"], str(newest.pk))
+        self.assertEqual(len({row["id"] for row in rows}), 6)
+
+    def test_pages_start_with_an_index_range(self):
+        JobSchedule.objects.create(job=self.jobs[0], minute="0")
+        cursors = {
+            name: self.get_lines(name, limit=1)[0]["cursor"]
+            for name in ("job_list", "schedule_list")
+        }
+
+        with CaptureQueriesContext(connection) as queries:
+            self.get_lines("job_list", after=cursors["job_list"])
+            self.get_lines("schedule_list", after=cursors["schedule_list"])
+
+        job_sql, schedule_sql = (
+            query["sql"]
+            for query in queries
+            if 'FROM "cron_job"' in query["sql"]
+            or 'FROM "cron_jobschedule"' in query["sql"]
+        )
+        # One row value comparison when the key has a single direction.
+        self.assertIn('("cron_job"."name", "cron_job"."id") >', job_sql)
+        # A leading bound on the first column when it has nullable columns.
+        self.assertIn('WHERE ("cron_jobschedule"."job_id" >=', schedule_sql)
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse("cron:job_list"), {"after": "not-a-cursor"})
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_lists_require_a_staff_user_with_the_view_permission(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("cron:job_list")).status_code, 403)
+
+        user = User.objects.create_user("staff", password="password", is_staff=True)
+        self.client.force_login(user)
+        self.assertEqual(self.client.get(reverse("cron:job_list")).status_code, 403)
+
+        user.user_permissions.add(Permission.objects.get(codename="view_job"))
+        self.assertEqual(self.client.get(reverse("cron:job_list")).status_code, 200)
+        self.assertEqual(self.client.get(reverse("cron:run_list")).status_code, 403)
+
+
+@override_settings(
+    API_TOKEN="secret",
+    MIDDLEWARE=settings_worker.MIDDLEWARE,
+    ROOT_URLCONF=settings_worker.ROOT_URLCONF,
+)
+class WorkerApiTestCase(TestCase):
+    """Test class for the JSON endpoints served by the worker profile, without sessions."""
+
+    def setUp(self):
+        Job.objects.create(name="Test job name", owner="Sergio", script="a.py")
+        self.urls = [
+            reverse(f"cron:{name}")
+            for name in ("job_list", "schedule_list", "run_list", "metrics")
+        ]
+
+    def test_endpoints_reject_the_requests_without_the_token(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_AUTHORIZATION="Bearer wrong")
+                self.assertEqual(response.status_code, 403)
+                self.assertEqual(self.client.get(url).status_code, 403)
+
+    def test_endpoints_accept_the_token(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url, HTTP_AUTHORIZATION="Bearer secret")
+                self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(self.urls[0], HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content).splitlines()[0])["name"],
+            "Test job name",
+        )
+
+    @override_settings(API_TOKEN="")
+    def test_empty_token_is_never_accepted(self):
+        response = self.client.get(self.urls[0], HTTP_AUTHORIZATION="Bearer ")
+
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,63 @@
+from unittest import mock
+
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+
+from cron.models import Job
+from scheduler.middleware import PRIMARY_COOKIE, ReplicaRoutingMiddleware
+
+
+class ReplicaRoutingTestCase(SimpleTestCase):
+    """Test class for the routing of the reads to the read replica."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.databases_used = []
+
+        def view(request):
+            self.databases_used.append(router.db_for_read(Job))
+            if request.GET.get("write"):
+                router.db_for_write(Job)
+                self.databases_used.append(router.db_for_read(Job))
+            return HttpResponse()
+
+        self.middleware = ReplicaRoutingMiddleware(view)
+        patcher = mock.patch("scheduler.routers.replica_configured", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.middleware(self.factory.get("/cron/calendar.ics"))
+
+        self.assertEqual(self.databases_used, ["replica"])
+
+    def test_reads_stick_to_the_primary_after_a_write(self):
+        self.middleware(self.factory.get("/", {"write": "1"}))
+
+        self.assertEqual(self.databases_used, ["replica", "default"])
+
+    def test_writing_requests_read_from_the_primary_and_set_the_cookie(self):
+        response = self.middleware(self.factory.post("/"))
+
+        self.assertEqual(self.databases_used, ["default"])
+        self.assertIn(PRIMARY_COOKIE, response.cookies)
+
+    def test_requests_after_a_write_read_from_the_primary(self):
+        request = self.factory.get("/")
+        request.COOKIES[PRIMARY_COOKIE] = "1"
+
+        self.middleware(request)
+
+        self.assertEqual(self.databases_used, ["default"])
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(router.db_for_read(Job), "default")
+
+    def test_without_replica_everything_uses_the_primary(self):
+        with mock.patch("scheduler.routers.replica_configured", return_value=False):
+            response = self.middleware(self.factory.post("/"))
+            self.middleware(self.factory.get("/"))
+
+        self.assertEqual(self.databases_used, ["default", "default"])
+        self.assertNotIn(PRIMARY_COOKIE, response.cookies)
@@ -0,0 +1,165 @@
+"""UTC offset transition tables of the time zones of the schedules.
+
+Converting every occurrence with zoneinfo means a Python call per instant. A
+zone is instead described once by the sorted UTC instants where its offset
+changes and the offset in effect after each of them, so whole arrays of
+occurrences are converted with a binary search (numpy.searchsorted).
+
+Local times that do not exist (the clock jumps forward) are executed at the
+instant the jump happens. Local times that happen twice (the clock goes back)
+are executed only the first time.
+
+The runner only converts one instant per tick, which is a bisect of the plain
+lists, so numpy is imported the first time an array conversion is needed and
+the worker processes start without it.
+"""
+
+from bisect import bisect_right
+from datetime import datetime, timezone
+from functools import cached_property, lru_cache
+from zoneinfo import ZoneInfo
+
+# Years covered by the tables. Outside of them the first and last offsets apply.
+FIRST_YEAR = 1970
+LAST_YEAR = 2100
+
+# Offsets are sampled once per day and every change is then located to the
+# second with a bisection. Zones do not change their offset twice in a day.
+SAMPLE_STEP = 24 * 60 * 60
+
+
+class TransitionTable:
+    """UTC offset transitions of a zone.
+
+    Attributes:
+        transition_list (list[int]): Sorted UTC instants, in epoch seconds,
+            where the offset changes.
+        offset_list (list[int]): Offsets in seconds. offset_list[k] is in effect
+            after the k-th transition, offset_list[0] before the first one.
+        transitions, offsets (np.ndarray): The same values as arrays.
+    """
+
+    def __init__(self, zone_name, first_year=FIRST_YEAR, last_year=LAST_YEAR):
+        self.zone_name = zone_name
+        zone = ZoneInfo(zone_name)
+
+        def offset_at(second):
+            moment = datetime.fromtimestamp(second, zone)
+            return int(moment.utcoffset().total_seconds())
+
+        start = int(datetime(first_year, 1, 1, tzinfo=timezone.utc).timestamp())
+        end = int(datetime(last_year + 1, 1, 1, tzinfo=timezone.utc).timestamp())
+
+        transitions = []
+        offsets = [offset_at(start)]
+        previous = start
+
+        for second in range(start + SAMPLE_STEP, end + 1, SAMPLE_STEP):
+            offset = offset_at(second)
+            if offset != offsets[-1]:
+                low, high = previous, second
+                while high - low > 1:
+                    middle = (low + high) // 2
+                    if offset_at(middle) == offsets[-1]:
+                        low = middle
+                    else:
+                        high = middle
+                transitions.append(high)
+                offsets.append(offset)
+            previous = second
+
+        self.transition_list = transitions
+        self.offset_list = offsets
+
+    @cached_property
+    def transitions(self):
+        import numpy as np
+
+        return np.array(self.transition_list, dtype=np.int64)
+
+    @cached_property
+    def offsets(self):
+        import numpy as np
+
+        return np.array(self.offset_list, dtype=np.int64)
+
+    @cached_property
+    def local_transitions(self):
+        """Local wall time at which each transition happens, with the old offset."""
+
+        return self.transitions + self.offsets[:-1]
+
+    def to_local(self, utc_seconds):
+        """Converts UTC epoch seconds to local wall time epoch seconds."""
+
+        import numpy as np
+
+        utc_seconds = np.asarray(utc_seconds, dtype=np.int64)
+        index = np.searchsorted(self.transitions, utc_seconds, side="right")
+        return utc_seconds + self.offsets[index]
+
+    def to_utc(self, local_seconds):
+        """Converts local wall time epoch seconds to UTC epoch seconds.
+
+        Repeated local times resolve to their first occurrence and skipped local
+        times to the instant of the transition that skipped them.
+        """
+
+        import numpy as np
+
+        local_seconds = np.asarray(local_seconds, dtype=np.int64)
+        index = np.searchsorted(self.local_transitions, local_seconds, side="right")
+        utc_seconds = local_seconds - self.offsets[index]
+
+        if len(self.transitions):
+            transition = self.transitions[np.maximum(index - 1, 0)]
+            skipped = (index > 0) & (utc_seconds < transition)
+            utc_seconds = np.where(skipped, transition, utc_seconds)
+
+        return utc_seconds
+
+    def local_times_at(self, utc_second) -> list:
+        """Returns the local wall times that are executed at a UTC instant.
+
+        Usually this is the local time of the instant, but at a forward
+        transition it also includes every skipped local time, and during the
+        second pass of a repeated hour it is empty.
+
+        Args:
+            utc_second (int): UTC epoch seconds.
+
+        Returns:
+            list[int]: Local wall time epoch seconds, one per minute.
+        """
+
+        index = bisect_right(self.transition_list, utc_second)
+        offset = self.offset_list[index]
+        local_second = utc_second + offset
+
+        if index == 0:
+            return [local_second]
+
+        previous_offset = self.offset_list[index - 1]
+        transition = self.transition_list[index - 1]
+
+        if offset < previous_offset and local_second < transition + previous_offset:
+            return []
+
+        if offset > previous_offset and utc_second == transition:
+            skipped = range(transition + previous_offset, local_second, 60)
+            return [*skipped, local_second]
+
+        return [local_second]
+
+
+@lru_cache(maxsize=None)
+def transition_table(zone_name) -> TransitionTable:
+    """Returns the cached transition table of a zone."""
+
+    return TransitionTable(zone_name)
+
+
+def local_datetime(local_second) -> datetime:
+    """Returns the naive datetime of a local wall time in epoch seconds."""
+
+    return datetime.fromtimestamp(int(local_second), timezone.utc).replace(tzinfo=None)
@@ -0,0 +1,14 @@
+from django.urls import path
+
+from cron import views
+
+app_name = "cron"
+
+urlpatterns = [
+    path("calendar.ics", views.calendar_feed, name="calendar"),
+    path("calendar/<str:owner>.ics", views.calendar_feed, name="owner_calendar"),
+    path("metrics.json", views.metrics, name="metrics"),
+    path("jobs.jsonl", views.job_list, name="job_list"),
+    path("schedules.jsonl", views.schedule_list, name="schedule_list"),
+    path("runs.jsonl", views.run_list, name="run_list"),
+]
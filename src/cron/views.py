@@ -1,3 +1,246 @@
-from django.shortcuts import render
+import hashlib
+import json
+from functools import wraps
 
-# Create your views here.
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Max
+from django.http import (
+    HttpResponseBadRequest,
+    HttpResponseForbidden,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import condition, require_GET
+
+from cron.ics import calendar_token, iter_calendar
+from cron.keyset import InvalidCursor, Key, decode_cursor, encode_cursor, iter_keyset
+from cron.metrics import METRICS, PERCENTILES, latest_snapshots
+from cron.models import Job, JobRun, JobSchedule
+from cron.schedules import FIELD_NAMES
+
+JOB_KEYS = [Key("name"), Key("id")]
+JOB_FIELDS = [
+    "id",
+    "name",
+    "owner",
+    "script",
+    "enabled",
+    "paused_until",
+    "max_instances",
+    "max_attempts",
+    "updated_at",
+]
+
+SCHEDULE_KEYS = [Key("job_id"), Key("description", nullable=True), Key("id")]
+SCHEDULE_FIELDS = [
+    "id",
+    "job_id",
+    "description",
+    *FIELD_NAMES,
+    "time_zone",
+    "enabled",
+    "paused_until",
+    "expression_hash",
+    "updated_at",
+]
+
+RUN_KEYS = [Key("scheduled_for", descending=True), Key("id", descending=True)]
+RUN_FIELDS = [
+    "id",
+    "job_id",
+    "schedule_id",
+    "scheduled_for",
+    "status",
+    "attempt",
+    "worker",
+    "started_at",
+    "finished_at",
+    "exit_code",
+]
+
+
+def has_api_token(request) -> bool:
+    """Whether the request carries the API_TOKEN as a bearer token."""
+
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return (
+        bool(settings.API_TOKEN)
+        and scheme.lower() == "bearer"
+        and constant_time_compare(token.strip(), settings.API_TOKEN)
+    )
+
+
+def api_permission_required(permission):
+    """Restricts a JSON view to the API_TOKEN or to the staff users with a permission.
+
+    The processes of scheduler.settings_worker have no sessions nor
+    request.user, so there only the token is accepted. The rejected requests
+    get a 403 instead of the login page, which a sync tool cannot follow.
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            user = getattr(request, "user", None)
+            if has_api_token(request) or (
+                user is not None
+                and user.is_active
+                and user.is_staff
+                and user.has_perm(permission)
+            ):
+                return view(request, *args, **kwargs)
+            return HttpResponseForbidden("Invalid token or permission")
+
+        return wrapper
+
+    return decorator
+
+
+def calendar_token_required(view):
+    """Rejects the requests of a calendar feed without its token."""
+
+    @wraps(view)
+    def wrapper(request, owner=None):
+        token = request.GET.get("token", "")
+        if not constant_time_compare(token, calendar_token(owner)):
+            return HttpResponseForbidden("Invalid token")
+        return view(request, owner)
+
+    return wrapper
+
+
+def get_calendar_schedules(owner=None):
+    """Returns the active schedules included in the calendar feed of an owner (or of every job)."""
+
+    schedules = JobSchedule.objects.active().select_related("job")
+    if owner is not None:
+        schedules = schedules.filter(job__owner=owner)
+
+    return schedules
+
+
+def calendar_etag(request, owner=None) -> str:
+    """Computes the ETag of a calendar feed with a single aggregate query.
+
+    The feed only changes when a schedule or its job is created, modified or
+    deleted, which is reflected by the number of schedules and the latest
+    modification dates.
+    """
+
+    state = get_calendar_schedules(owner).aggregate(
+        count=Count("id"),
+        schedules_updated_at=Max("updated_at"),
+        jobs_updated_at=Max("job__updated_at"),
+    )
+    key = "|".join(str(state[name]) for name in sorted(state))
+    return hashlib.sha1(f"{owner}|{key}".encode()).hexdigest()
+
+
+@require_GET
+@calendar_token_required
+@condition(etag_func=calendar_etag)
+def calendar_feed(request, owner=None):
+    """Streams the iCalendar feed with the schedules of an owner or of every job."""
+
+    schedules = get_calendar_schedules(owner)
+    # The feed is read while streaming, after the request has left the
+    # middleware, so the database chosen by the router is fixed now.
+    schedules = schedules.using(schedules.db).iterator(chunk_size=500)
+    calendar_name = f"Jobs de {owner}" if owner is not None else "Jobs"
+
+    response = StreamingHttpResponse(
+        iter_calendar(schedules, calendar_name),
+        content_type="text/calendar; charset=utf-8",
+    )
+    response["Content-Disposition"] = 'inline; filename="jobs.ics"'
+    return response
+
+
+@require_GET
+@api_permission_required("cron.view_jobmetricssnapshot")
+def metrics(request):
+    """Returns the latest timing percentiles of every job, in seconds.
+
+    They are the percentiles of the runs of the runner given as "worker", see
+    cron.metrics.
+    """
+
+    jobs = [
+        {
+            "job": snapshot.job.name,
+            "job_id": snapshot.job_id,
+            "worker": snapshot.worker,
+            "taken_at": snapshot.taken_at,
+            "samples": snapshot.samples,
+            **{
+                metric: {
+                    f"p{percent}": getattr(snapshot, f"{metric}_p{percent}")
+                    for percent in PERCENTILES
+                }
+                for metric in METRICS
+            },
+        }
+        for snapshot in latest_snapshots().order_by("job__name")
+    ]
+    return JsonResponse({"jobs": jobs})
+
+
+def iter_json_lines(rows, keys):
+    """Yields every row as a line of JSON with the cursor to resume after it."""
+
+    for row in rows:
+        row["cursor"] = encode_cursor([row[key.field] for key in keys])
+        yield json.dumps(row, cls=DjangoJSONEncoder) + "\n"
+
+
+def keyset_list(request, queryset, keys, fields):
+    """Streams the rows of a queryset as JSON lines, paginated by keyset.
+
+    The rows start after the ``after`` cursor of the request, if any, and are
+    ``limit`` at most, every remaining row by default.
+    """
+
+    try:
+        after = request.GET.get("after")
+        after = decode_cursor(after, keys) if after else None
+        limit = int(request.GET["limit"]) if "limit" in request.GET else None
+    except (InvalidCursor, ValueError):
+        return HttpResponseBadRequest("Invalid after or limit")
+
+    if limit is not None and limit < 1:
+        return HttpResponseBadRequest("Invalid after or limit")
+
+    # The rows are read while streaming, after the request has left the
+    # middleware, so the database chosen by the router is fixed now.
+    rows = iter_keyset(queryset.using(queryset.db), keys, fields, after, limit)
+    return StreamingHttpResponse(
+        iter_json_lines(rows, keys), content_type="application/x-ndjson"
+    )
+
+
+@require_GET
+@api_permission_required("cron.view_job")
+def job_list(request):
+    """Streams the jobs ordered by name."""
+
+    return keyset_list(request, Job.objects.all(), JOB_KEYS, JOB_FIELDS)
+
+
+@require_GET
+@api_permission_required("cron.view_jobschedule")
+def schedule_list(request):
+    """Streams the schedules ordered by job id and description."""
+
+    return keyset_list(
+        request, JobSchedule.objects.all(), SCHEDULE_KEYS, SCHEDULE_FIELDS
+    )
+
+
+@require_GET
+@api_permission_required("cron.view_jobrun")
+def run_list(request):
+    """Streams the runs from the newest."""
+
+    return keyset_list(request, JobRun.objects.all(), RUN_KEYS, RUN_FIELDS)
@@ -0,0 +1,156 @@
+"""Registry of the live runners.
+
+Every runner upserts its row of Worker every WORKER_HEARTBEAT_SECONDS with a
+single INSERT ... ON CONFLICT DO UPDATE, from a background thread, so a long
+tick does not delay it. The row holds the capacity and the current load of the
+runner.
+
+A runner that has not beaten for WORKER_STALE_SECONDS is considered dead. Any
+runner reaps the dead ones after its heartbeat: the runs they left RUNNING are
+marked LOST, the slots they held in Job.running_instances are returned, the
+lost runs with attempts left are retried by the live runners (see
+cron.retries) and the dead rows are deleted.
+"""
+
+import logging
+import socket
+import threading
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from cron.models import Job, JobRun, Worker
+from cron.retries import schedule_retry
+
+logger = logging.getLogger(__name__)
+
+
+def heartbeat(name, capacity, running, started_at, now=None):
+    """Registers a runner or refreshes its row with one upsert."""
+
+    now = now or timezone.now()
+    Worker.objects.bulk_create(
+        [
+            Worker(
+                name=name,
+                hostname=socket.gethostname(),
+                capacity=capacity,
+                running=running,
+                started_at=started_at,
+                last_heartbeat=now,
+            )
+        ],
+        update_conflicts=True,
+        unique_fields=["name"],
+        update_fields=[
+            "hostname",
+            "capacity",
+            "running",
+            "started_at",
+            "last_heartbeat",
+        ],
+    )
+
+
+def reap_stale_workers(now=None) -> list:
+    """Releases the runs of the runners whose heartbeat is older than WORKER_STALE_SECONDS.
+
+    Returns:
+        list[JobRun]: The runs marked as LOST.
+    """
+
+    now = now or timezone.now()
+    cutoff = now - timedelta(seconds=settings.WORKER_STALE_SECONDS)
+
+    with transaction.atomic():
+        stale = list(
+            Worker.objects.select_for_update(skip_locked=True)
+            .filter(last_heartbeat__lt=cutoff)
+            .values_list("name", flat=True)
+        )
+        if not stale:
+            return []
+
+        lost = list(
+            JobRun.objects.select_for_update()
+            .filter(worker__in=stale, status=JobRun.Status.RUNNING)
+            .select_related("job")
+        )
+        JobRun.objects.filter(pk__in=[run.pk for run in lost]).update(
+            status=JobRun.Status.LOST, finished_at=now
+        )
+
+        slots = Counter(run.job_id for run in lost)
+        if slots:
+            Job.objects.filter(pk__in=slots).update(
+                running_instances=Greatest(
+                    F("running_instances")
+                    - Case(
+                        *(
+                            When(pk=job_id, then=Value(count))
+                            for job_id, count in slots.items()
+                        ),
+                        default=Value(0),
+                    ),
+                    Value(0),
+                )
+            )
+
+        for run in lost:
+            schedule_retry(run, now)
+
+        Worker.objects.filter(name__in=stale).delete()
+
+    for name in stale:
+        logger.warning("Runner %s stopped beating, its runs were released", name)
+
+    return lost
+
+
+class Heartbeat(threading.Thread):
+    """Thread that beats for a runner and reaps the dead ones until stopped.
+
+    Args:
+        runner (Runner): The runner, its worker_name, capacity and in_flight
+            are reported on every beat.
+        interval (int): Seconds between beats, WORKER_HEARTBEAT_SECONDS by default.
+    """
+
+    def __init__(self, runner, interval=None):
+        super().__init__(name=f"heartbeat-{runner.worker_name}", daemon=True)
+        self.runner = runner
+        self.interval = interval or settings.WORKER_HEARTBEAT_SECONDS
+        self.started_at = timezone.now()
+        self.stopped = threading.Event()
+
+    def beat(self):
+        heartbeat(
+            self.runner.worker_name,
+            self.runner.capacity,
+            self.runner.in_flight,
+            self.started_at,
+        )
+        reap_stale_workers()
+
+    def run(self):
+        try:
+            while not self.stopped.is_set():
+                try:
+                    self.beat()
+                except Exception:
+                    logger.exception("Heartbeat of %s failed", self.runner.worker_name)
+                self.stopped.wait(self.interval)
+        finally:
+            connection.close()
+
+    def stop(self):
+        """Stops beating and removes the runner from the registry."""
+
+        self.stopped.set()
+        self.join()
+        Worker.objects.filter(name=self.runner.worker_name).delete()
@@ -0,0 +1,45 @@
+"""
+Middleware of the scheduler project.
+"""
+from django.conf import settings
+
+from scheduler import routers
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+# Cookie that keeps the reads of a client on the primary after a write.
+PRIMARY_COOKIE = "use_primary"
+
+
+class ReplicaRoutingMiddleware:
+    """Lets the safe requests read from the replica.
+
+    Requests that may write (POST, PUT, ...) read from the primary, and set a
+    cookie that keeps the following requests of the same client on the primary
+    for REPLICA_STICKY_SECONDS, which covers the redirect after saving a form.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        safe = request.method in SAFE_METHODS
+        token = routers.read_from_replica.set(
+            safe and PRIMARY_COOKIE not in request.COOKIES
+        )
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.read_from_replica.reset(token)
+
+        if not safe and routers.replica_configured():
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+
+        return response
@@ -0,0 +1,44 @@
+"""
+Database routing between the primary database and its read replica.
+
+Reads go to the replica only while read_from_replica is set, which
+scheduler.middleware.ReplicaRoutingMiddleware does for the safe requests.
+Everything else (the runner, the management commands, the requests that write)
+reads from the primary.
+
+As soon as a request asks for the database to write, it sticks to the primary
+for the rest of the request, so it never reads data older than what it wrote.
+
+Migrations are allowed on both databases, so locally the replica can be a
+second database migrated with ``migrate --database replica``.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+REPLICA = "replica"
+
+read_from_replica = ContextVar("read_from_replica", default=False)
+
+
+def replica_configured() -> bool:
+    """Whether a replica is defined in DATABASES."""
+    return REPLICA in settings.DATABASES
+
+
+class ReplicaRouter:
+    """Sends the reads to the replica when allowed and everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if read_from_replica.get() and replica_configured():
+            return REPLICA
+        return "default"
+
+    def db_for_write(self, model, **hints):
+        read_from_replica.set(False)
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return True
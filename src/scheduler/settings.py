@@ -55,10 +55,12 @@ INSTALLED_APPS = [*DJANGO_APPS, *PROJECT_APPS, *THIRD_PARTY_APPS]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'scheduler.middleware.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'cron.audit.AuditActorMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -98,6 +100,26 @@ DATABASES = {
     }
 }
 
+# Optional read replica of the default database. The reads of the safe requests
+# go to it, see scheduler.routers. Unset values are taken from the primary, so
+# locally it can be a second database in the same server.
+if getenv("DB_REPLICA_HOST") or getenv("DB_REPLICA_NAME"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"]),
+        "USER": getenv("DB_REPLICA_USER", DATABASES["default"]["USER"]),
+        "PASSWORD": getenv("DB_REPLICA_PASSWORD", DATABASES["default"]["PASSWORD"]),
+        "HOST": getenv("DB_REPLICA_HOST", DATABASES["default"]["HOST"]),
+        "PORT": getenv("DB_REPLICA_PORT", DATABASES["default"]["PORT"]),
+        "TEST": {"MIRROR": "default"},
+    }
+
+DATABASE_ROUTERS = ["scheduler.routers.ReplicaRouter"]
+
+# Seconds the reads of a client stay on the primary after it sends a write, so
+# it does not see stale data while the replica catches up.
+REPLICA_STICKY_SECONDS = int(getenv("REPLICA_STICKY_SECONDS", "5"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -142,6 +164,77 @@ if DEBUG:
 else:
     STATIC_ROOT = BASE_DIR / "static"
 
+# Runner
+# Directory that contains the scripts of the jobs.
+SCRIPTS_DIR = Path(getenv("SCRIPTS_DIR", BASE_DIR / "scripts"))
+
+# Where the bytecode of the scripts is written, and seconds between the checks
+# of the scripts for changes, see cron.scripts.
+SCRIPT_CACHE_DIR = Path(getenv("SCRIPT_CACHE_DIR", BASE_DIR / "script_cache"))
+
+SCRIPT_CHECK_SECONDS = int(getenv("SCRIPT_CHECK_SECONDS", "30"))
+
+RUNNER_MAX_WORKERS = int(getenv("RUNNER_MAX_WORKERS", "4"))
+
+# "claim" or "leader", see cron.coordination.
+RUNNER_COORDINATION = getenv("RUNNER_COORDINATION", "claim")
+
+# "subprocess" or "forkserver", see cron.executors.
+RUNNER_EXECUTOR = getenv("RUNNER_EXECUTOR", "subprocess")
+
+# Whether max_instances and the owner rate limits are shared by all the runners
+# through the database instead of applied by each runner, see cron.limits.
+RUNNER_SHARED_LIMITS = getenv("RUNNER_SHARED_LIMITS", "False").lower() == "true"
+
+# Comma separated modules imported once by the forkserver executor.
+RUNNER_PRELOAD_MODULES = [
+    module.strip()
+    for module in getenv("RUNNER_PRELOAD_MODULES", "").split(",")
+    if module.strip()
+]
+
+# Output of the job executions, see cron.joblogs.
+JOB_LOGS_DIR = Path(getenv("JOB_LOGS_DIR", BASE_DIR / "logs"))
+
+JOB_LOG_SEGMENT_BYTES = int(getenv("JOB_LOG_SEGMENT_BYTES", str(64 * 1024 * 1024)))
+
+# Kilobytes shown by default by the tail of the output in the admin.
+JOB_LOG_TAIL_KB = int(getenv("JOB_LOG_TAIL_KB", "64"))
+
+# Archive of the old runs moved out of the database, see cron.archive.
+RUN_ARCHIVE_DIR = Path(getenv("RUN_ARCHIVE_DIR", BASE_DIR / "archive"))
+
+# Runs older than these days are archived by archive_runs by default.
+RUN_ARCHIVE_DAYS = int(getenv("RUN_ARCHIVE_DAYS", "180"))
+
+# Timing samples kept in memory per job and metric, and seconds between the
+# snapshots of their percentiles, see cron.metrics.
+METRICS_BUFFER_SIZE = int(getenv("METRICS_BUFFER_SIZE", "1024"))
+
+METRICS_FLUSH_SECONDS = int(getenv("METRICS_FLUSH_SECONDS", "60"))
+
+# Days the snapshots of the metrics are kept. Older ones are deleted when the
+# job gets a new snapshot, so the latest one of every job is always kept.
+METRICS_RETENTION_DAYS = int(getenv("METRICS_RETENTION_DAYS", "30"))
+
+# Seconds a due retry waits when the limits of its job do not allow it yet.
+RETRY_POSTPONE_SECONDS = int(getenv("RETRY_POSTPONE_SECONDS", "30"))
+
+# Seconds between the heartbeats of a runner, and seconds without a heartbeat
+# after which its running jobs are considered lost, see cron.workers.
+WORKER_HEARTBEAT_SECONDS = int(getenv("WORKER_HEARTBEAT_SECONDS", "15"))
+
+WORKER_STALE_SECONDS = int(getenv("WORKER_STALE_SECONDS", "60"))
+
+# Expected runtime of the jobs without duration metrics when looking for
+# overlapping schedules, see cron.lint.
+LINT_DEFAULT_RUNTIME_MINUTES = int(getenv("LINT_DEFAULT_RUNTIME_MINUTES", "1"))
+
+# Token of the JSON endpoints, sent as "Authorization: Bearer <token>" by the
+# tools that sync with them. They have no sessions under settings_worker, so
+# there the token is the only access. Empty disables it.
+API_TOKEN = getenv("API_TOKEN", "")
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
@@ -0,0 +1,30 @@
+"""
+Django settings for the runner and JSON API processes.
+
+They only need the models and views of the project apps, so the admin, auth,
+sessions, messages and staticfiles apps, their middleware and the template
+engine are left out. That makes django.setup() import a fraction of the
+modules the full settings import, and new workers start faster.
+
+Use it with DJANGO_SETTINGS_MODULE=scheduler.settings_worker, which worker.py
+and scheduler.wsgi_worker set by default.
+"""
+from scheduler.settings import *  # noqa: F401,F403
+from scheduler.settings import PROJECT_APPS, THIRD_PARTY_APPS
+
+
+INSTALLED_APPS = [*PROJECT_APPS, *THIRD_PARTY_APPS]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'scheduler.middleware.ReplicaRoutingMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+ROOT_URLCONF = 'scheduler.urls_worker'
+
+TEMPLATES = []
+
+AUTH_PASSWORD_VALIDATORS = []
+
+WSGI_APPLICATION = 'scheduler.wsgi_worker.application'
@@ -0,0 +1,12 @@
+"""
+URL configuration for the worker and JSON API processes.
+
+Only the views of the project apps are routed, the admin is served by the
+processes that use scheduler.settings.
+"""
+from django.urls import include, path
+
+
+urlpatterns = [
+    path('cron/', include('cron.urls')),
+]
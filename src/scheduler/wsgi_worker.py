@@ -0,0 +1,13 @@
+"""
+WSGI config for the JSON API processes of the scheduler project.
+
+It uses the lean settings of scheduler.settings_worker.
+"""
+
+import os
+
+from django.core.wsgi import get_wsgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scheduler.settings_worker')
+
+application = get_wsgi_application()
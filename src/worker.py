@@ -0,0 +1,24 @@
+#!/usr/bin/env python
+"""Entry point of the runner processes, with the lean worker settings.
+
+Runs the run_scheduler command by default, any other command can be given as
+with manage.py, for example ``python worker.py import_report``.
+"""
+import os
+import sys
+
+
+def main():
+    """Run the scheduler or another command with the worker settings."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'scheduler.settings_worker')
+    from django.core.management import execute_from_command_line
+
+    argv = sys.argv
+    if len(argv) == 1 or argv[1].startswith('-'):
+        argv = [argv[0], 'run_scheduler', *argv[1:]]
+
+    execute_from_command_line(argv)
+
+
+if __name__ == '__main__':
+    main()